@@ -0,0 +1,438 @@
+"""Benchmark jalur-jalur kritis aplikasi pengolahan data kompetensi.
+
+Contoh:
+    python benchmark.py suite --sizes 1000 10000 100000 1000000 --output benchmark_results.json
+    python benchmark.py text-cleaning --rows 100000
+    python benchmark.py text-cleaning --rows 100000 --distinct 5000
+    python benchmark.py importtime
+    python benchmark.py session-memory --rows 100000 --sessions 10
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import main
+from synthetic_data import generate_competency_data, generate_pemetaan_data, synthetic_answers
+
+
+def best_time(func, repeat=3):
+    """Return the best wall-clock time of func() over repeat runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def baseline_clean_text_for_wordcloud(text):
+    """Original per-row cleaner from before the optimization work, kept as the benchmark baseline"""
+    # Salinan apa adanya (cabang tanpa Sastrawi): stopword dicocokkan ke set mentah per kata
+    if pd.isna(text) or text == '':
+        return ""
+    text = str(text).lower()
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    text = ' '.join(text.split())
+    words = text.split()
+    return ' '.join([word for word in words if word not in main.INDONESIAN_STOPWORDS])
+
+
+def bench_text_cleaning(n_rows, repeat, distinct=None):
+    """Compare the original per-row cleaner with the vectorized clean_text_series"""
+    answers = synthetic_answers(n_rows, distinct=distinct)
+    stopword_tokens = main.get_stopword_tokens()
+
+    def clean_baseline():
+        return answers.map(baseline_clean_text_for_wordcloud)
+
+    def clean_per_row():
+        return answers.map(lambda text: main.clean_text_for_wordcloud(text, stopword_tokens))
+
+    vectorized = main.clean_text_series(answers)
+    if not clean_per_row().equals(vectorized):
+        raise AssertionError("clean_text_series berbeda dari clean_text_for_wordcloud")
+    # Baseline memakai stopword mentah ('berkali-kali' tidak pernah cocok), jadi bisa sedikit berbeda
+    differing = int((clean_baseline() != vectorized).sum())
+
+    baseline = best_time(clean_baseline, repeat)
+    per_row = best_time(clean_per_row, repeat)
+    after = best_time(lambda: main.clean_text_series(answers), repeat)
+
+    variasi = "semua berbeda" if distinct is None else f"{distinct:,} jawaban berbeda"
+    print(f"Pembersihan teks, {n_rows:,} jawaban sintetis ({variasi}, best of {repeat}):")
+    print(f"  baseline per baris (kode awal)      : {baseline:8.3f} s  {n_rows / baseline:12,.0f} rows/s")
+    print(f"  per baris (clean_text_for_wordcloud): {per_row:8.3f} s  {n_rows / per_row:12,.0f} rows/s")
+    print(f"  vektor (clean_text_series)          : {after:8.3f} s  {n_rows / after:12,.0f} rows/s")
+    print(f"  speedup vs baseline: {baseline / after:.1f}x  (hasil berbeda dari baseline: {differing:,} baris)")
+
+
+# Ukuran default suite (jumlah pegawai) dan batas baris pemetaan.xlsx: menulis
+# dan membaca xlsx lewat openpyxl jauh lebih lambat dari CSV
+SUITE_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+PEMETAAN_MAX_ROWS = 100_000
+# Jumlah pemanggilan untuk jalur per-pegawai (lookup NIP, tabel, spider chart)
+PER_CALL_SAMPLES = 200
+SPIDER_CHART_SAMPLES = 20
+# Refresh inkremental diukur dengan menambahkan 1/APPEND_FRACTION baris ke CSV
+APPEND_FRACTION = 100
+
+
+def mean_call_time(func, args_list):
+    """Return the mean wall-clock time of func(*args) over args_list"""
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list)
+
+
+def bench_size(n_rows, repeat, workdir, pemetaan_max_rows):
+    """Time every hot path on synthetic data with n_rows employees"""
+    n_pemetaan = min(n_rows, pemetaan_max_rows)
+    generate_competency_data(n_rows).to_csv(os.path.join(workdir, main.COMPETENCY_CSV_PATH), index=False)
+    generate_pemetaan_data(n_pemetaan).to_excel(os.path.join(workdir, main.PEMETAAN_XLSX_PATH), index=False)
+    rng = np.random.default_rng(1)
+    results = []
+    
+    def record(name, seconds, rows, calls=1):
+        results.append({
+            'size': n_rows, 'benchmark': name, 'rows': rows, 'calls': calls,
+            'seconds': seconds, 'rows_per_s': rows / seconds if seconds > 0 else None,
+        })
+        print(f"  {name:<34} {seconds * 1000:12.3f} ms" + (" per panggilan" if calls > 1 else ""))
+    
+    def cold(loader):
+        # Hapus sidecar kolumnar agar sumber diparsing ulang
+        def run():
+            shutil.rmtree(main.COLUMNAR_CACHE_DIR, ignore_errors=True)
+            return loader()
+        return run
+    
+    # Fungsi ber-cache Streamlit dipanggil lewat __wrapped__ agar yang diukur adalah komputasinya
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        load_dataset = lambda: main.refresh_competency_dataset(main.new_source_store())
+        record('load_data (cold)', best_time(cold(load_dataset), repeat), n_rows)
+        record('load_data (warm)', best_time(load_dataset, repeat), n_rows)
+        record('load_pemetaan_data (cold)', best_time(cold(main.load_pemetaan_data.__wrapped__), repeat), n_pemetaan)
+        record('load_pemetaan_data (warm)', best_time(main.load_pemetaan_data.__wrapped__, repeat), n_pemetaan)
+        df_pemetaan = main.load_pemetaan_data.__wrapped__()
+        
+        # Refresh: mtime berubah tanpa perubahan isi (hanya hashing), lalu penambahan baris di akhir
+        store = main.new_source_store()
+        dataset = main.refresh_competency_dataset(store)
+        for name in main.DATASET_PART_MERGERS:
+            main.dataset_part(dataset, name)
+        df = dataset['df']
+        
+        def touched():
+            os.utime(main.COMPETENCY_CSV_PATH)
+            return main.refresh_competency_dataset(store)
+        record('refresh (unchanged)', best_time(touched, repeat), n_rows)
+        
+        n_append = max(1, n_rows // APPEND_FRACTION)
+        base_state = store['current']
+        generate_competency_data(n_append, seed=n_rows).to_csv(
+            main.COMPETENCY_CSV_PATH, mode='a', header=False, index=False)
+        
+        def appended():
+            append_store = main.new_source_store()
+            append_store['current'] = base_state
+            return main.refresh_competency_dataset(append_store)
+        record('refresh (append)', best_time(appended, repeat), n_append)
+    finally:
+        os.chdir(cwd)
+    
+    # Tampilan tabel: skor, indeks filter, filter, dan kubus statistik
+    record('compute_competency_scores', best_time(lambda: main.compute_competency_scores(df), repeat), n_rows)
+    df_processed = main.compute_competency_scores(df)
+    record('compute_filter_index', best_time(lambda: main.compute_filter_index(df_processed), repeat), n_rows)
+    filter_index = main.compute_filter_index(df_processed)
+    selections = [
+        (level, wilayah, kategori_m, kategori_t)
+        for level in filter_index['options']['Level']
+        for wilayah in filter_index['options']['Nama Wilayah']
+        for kategori_m in (main.FILTER_ALL, 'Kurang Optimal')
+        for kategori_t in (main.FILTER_ALL, 'Cukup Optimal')
+    ]
+    record('filter + take', mean_call_time(
+        lambda *selection: df_processed.take(main.filter_positions(filter_index, *selection)),
+        selections), n_rows, len(selections))
+    record('compute_stats_cube', best_time(lambda: main.compute_stats_cube(df_processed), repeat), n_rows)
+    stats_cube = main.compute_stats_cube(df_processed)
+    record('get_cube_stats', mean_call_time(
+        lambda *selection: main.get_cube_stats(stats_cube, *selection), selections), n_rows, len(selections))
+    
+    # Lookup NIP: pembangunan indeks, pencocokan persis, dan saran prefiks
+    record('compute_nip_index', best_time(lambda: main.compute_nip_index(df), repeat), n_rows)
+    nip_index = main.compute_nip_index(df)
+    sample_nips = df['NIP'].astype(str).to_numpy()[rng.integers(0, n_rows, PER_CALL_SAMPLES)]
+    record('lookup_nip (exact)', mean_call_time(
+        lambda nip: main.lookup_nip(nip_index, nip), [(nip,) for nip in sample_nips]), n_rows, PER_CALL_SAMPLES)
+    record('find_nip_prefix', mean_call_time(
+        lambda nip: main.find_nip_prefix(nip_index, nip[:8], limit=5),
+        [(nip,) for nip in sample_nips]), n_rows, PER_CALL_SAMPLES)
+    
+    # Tampilan per pegawai: skor diambil sebagai irisan baris matriks skor
+    record('compute_score_matrix', best_time(lambda: main.compute_score_matrix(df_processed), repeat), n_rows)
+    score_matrix = main.compute_score_matrix(df_processed)
+    sample_rows = [(df_processed.iloc[pos], score_matrix[pos]) for pos in rng.integers(0, n_rows, PER_CALL_SAMPLES)]
+    record('create_competency_table', mean_call_time(
+        lambda row, scores: (main.create_competency_table(row, 'manajerial', scores),
+                             main.create_competency_table(row, 'teknis', scores)),
+        sample_rows), 1, PER_CALL_SAMPLES)
+    main.create_spider_chart(*sample_rows[0])  # pemanasan template dan import plotly
+    record('create_spider_chart', mean_call_time(
+        main.create_spider_chart, sample_rows[:SPIDER_CHART_SAMPLES]), 1, SPIDER_CHART_SAMPLES)
+    
+    # Persentil rekan: array terurut per Level/Wilayah, lalu searchsorted per pencarian
+    record('compute_peer_index', best_time(lambda: main.compute_peer_index(df_processed), repeat), n_rows)
+    peer_index = main.compute_peer_index(df_processed)
+    record('peer_percentiles', mean_call_time(
+        lambda row, scores: main.peer_percentiles(peer_index, row), sample_rows), n_rows, PER_CALL_SAMPLES)
+    
+    # Backend SQL: filter, statistik, halaman tabel, dan lookup NIP sebagai kueri berindeks
+    sql_path = os.path.join(workdir, 'asesmen.sqlite')
+    record('build_sql_backend', best_time(
+        lambda: main.build_sql_backend(df_processed, df_pemetaan, sql_path), 1), n_rows)
+    backend = main.open_sql_backend(sql_path)
+    record('sql_count', mean_call_time(
+        lambda *selection: main.sql_count(backend, *selection), selections), n_rows, len(selections))
+    record('sql_stats_cube', best_time(lambda: main.sql_stats_cube.__wrapped__(backend), repeat), n_rows)
+    record('sql_table_page (sorted)', mean_call_time(
+        lambda *selection: main.sql_table_page(backend, selection, main.TABLE_DISPLAY_COLUMNS, 'percent_T'),
+        selections), n_rows, len(selections))
+    record('sql_lookup_nip (exact)', mean_call_time(
+        lambda nip: main.sql_lookup_nip(backend, nip), [(nip,) for nip in sample_nips]), n_rows, PER_CALL_SAMPLES)
+    record('sql_peer_percentiles', mean_call_time(
+        lambda row, scores: main.sql_peer_percentiles(backend, row), sample_rows[:SPIDER_CHART_SAMPLES]),
+        n_rows, SPIDER_CHART_SAMPLES)
+    record('sql_value_counts', mean_call_time(
+        lambda col: main.sql_value_counts(backend, col), [(col,) for col in main.WORDCLOUD_TEXT_GROUPS]),
+        n_pemetaan, len(main.WORDCLOUD_TEXT_GROUPS))
+    
+    # Wordcloud dari jawaban pemetaan
+    answers = df_pemetaan['Q06_Alasan Pilihan Jalur Karir']
+    stopword_tokens = main.get_stopword_tokens()
+    record('clean_text_for_wordcloud', best_time(
+        lambda: answers.map(lambda text: main.clean_text_for_wordcloud(text, stopword_tokens)), repeat), n_pemetaan)
+    record('clean_text_series', best_time(lambda: main.clean_text_series(answers), repeat), n_pemetaan)
+    # Jalur yang dipakai aplikasi: indeks token sekali per dataset, lalu render dari frekuensi
+    build_token_index = lambda: main.build_pemetaan_token_index.__wrapped__(df_pemetaan, None)
+    record('build_pemetaan_token_index', best_time(build_token_index, repeat), n_pemetaan)
+    group_col = 'Q01_JALUR PENGEMBANGAN KARIR'
+    value, group = max(build_token_index()['groups'][group_col].items(), key=lambda item: item[1]['n_texts'])
+    frequencies = group['frequencies']
+    plt = main.lazy_import('matplotlib.pyplot')
+    record('create_wordcloud_from_frequencies', best_time(
+        lambda: plt.close(main.create_wordcloud_from_frequencies(frequencies, "Benchmark")), repeat), group['n_texts'])
+    
+    def render_wordcloud_cold():
+        main.get_wordcloud_cache().clear()
+        return main.render_wordcloud_image(frequencies, "Benchmark", (group_col, value))
+    render_wordcloud_warm = lambda: main.render_wordcloud_image(frequencies, "Benchmark", (group_col, value))
+    record('render_wordcloud_image (cold)', best_time(render_wordcloud_cold, repeat), group['n_texts'])
+    record('render_wordcloud_image (warm)', best_time(render_wordcloud_warm, repeat), group['n_texts'])
+    
+    return results
+
+
+def run_suite(sizes, repeat, output, pemetaan_max_rows):
+    """Run bench_size for every size and write machine-readable results to JSON"""
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'pyarrow_available': main.PYARROW_AVAILABLE,
+            'repeat': repeat,
+            'pemetaan_max_rows': pemetaan_max_rows,
+        },
+        'sizes': [],
+        'results': [],
+    }
+    
+    for n_rows in sizes:
+        print(f"Suite {n_rows:,} pegawai:")
+        entry = {'size': n_rows}
+        start = time.perf_counter()
+        try:
+            with tempfile.TemporaryDirectory() as workdir:
+                report['results'].extend(bench_size(n_rows, repeat, workdir, pemetaan_max_rows))
+        except Exception as e:
+            # Catat titik gagal lalu lanjut; hasil ukuran sebelumnya tetap tersimpan
+            entry['error'] = f"{type(e).__name__}: {e}"
+            print(f"  GAGAL: {entry['error']}")
+        entry['wall_seconds'] = time.perf_counter() - start
+        # ru_maxrss dalam KiB di Linux (byte di macOS); nilainya puncak seluruh proses
+        entry['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        report['sizes'].append(entry)
+        
+        # Tulis setelah setiap ukuran agar hasil parsial tidak hilang bila proses mati
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(f"Hasil ditulis ke {output}")
+
+
+# Modul berat yang seharusnya baru dimuat saat menu yang membutuhkannya dibuka
+LAZY_MODULES = ['wordcloud', 'matplotlib', 'plotly', 'Sastrawi', 'pyarrow']
+
+
+def bench_importtime(module_name, top):
+    """Summarize `python -X importtime -c 'import <module>'` for cold-start regressions"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+        capture_output=True, text=True, check=True
+    )
+
+    # Format baris: "import time: self [us] | cumulative | imported package",
+    # nama paket diawali satu spasi ditambah dua spasi per tingkat kedalaman
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(cumulative_us)))
+
+    imported = {name.split('.')[0] for name, _, _ in entries}
+    # importtime mencetak anak sebelum induknya: import langsung modul target adalah
+    # entri tingkat 1 tepat sebelum baris tingkat 0 milik modul target
+    target = next(i for i, (name, depth, _) in enumerate(entries) if name == module_name and depth == 0)
+    total_us = entries[target][2]
+    children = []
+    for name, depth, cumulative in reversed(entries[:target]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((name, depth, cumulative))
+
+    print(f"Waktu import '{module_name}': {total_us / 1000:.1f} ms (kumulatif)")
+    print(f"  {top} import langsung teratas (kumulatif):")
+    for name, _, cumulative in sorted(children, key=lambda e: e[2], reverse=True)[:top]:
+        print(f"    {cumulative / 1000:9.1f} ms  {name}")
+    print("  Modul berat yang ikut dimuat saat startup:")
+    for name in LAZY_MODULES:
+        print(f"    {name:<12} {'YA' if name in imported else 'tidak'}")
+
+
+def _allocated_bytes():
+    """Bytes currently allocated by Python/NumPy (tracemalloc) plus the Arrow memory pool"""
+    allocated = tracemalloc.get_traced_memory()[0]
+    if main.PYARROW_AVAILABLE:
+        allocated += main.lazy_import('pyarrow').total_allocated_bytes()
+    return allocated
+
+
+def bench_session_memory(n_rows, n_sessions, pemetaan_rows):
+    """Per-session memory: cache_data copies per session vs one shared read-only dataset"""
+    st = main.st
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, main.COMPETENCY_CSV_PATH)
+        generate_competency_data(n_rows).to_csv(csv_path, index=False)
+        raw_df = main._read_competency_csv(csv_path)
+    raw_pemetaan = generate_pemetaan_data(pemetaan_rows)
+    
+    # Sebelum: setiap pemanggilan st.cache_data mengembalikan salinan hasil unpickle
+    @st.cache_data
+    def copied_data():
+        return raw_df
+    
+    @st.cache_data
+    def copied_pemetaan():
+        return raw_pemetaan
+    
+    @st.cache_data
+    def copied_processed(df):
+        return main.compute_competency_scores(df)
+    
+    def session_before():
+        df = copied_data()
+        df_processed = copied_processed(df)
+        # Tabel lama menyalin seluruh baris terfilter (filter "Semua" = semua baris)
+        filtered_df = df_processed[np.ones(len(df_processed), dtype=bool)]
+        return df, copied_pemetaan(), df_processed, filtered_df
+    
+    # Sesudah: dataset read-only dipegang sekali per proses, sesi hanya menyalin satu halaman tabel
+    shared = {}
+    
+    def session_after():
+        if not shared:
+            shared['dataset'] = main.new_dataset(raw_df)
+            shared['pemetaan'] = main.freeze_frame(raw_pemetaan)
+        dataset = shared['dataset']
+        positions = main.filter_positions(main.dataset_part(dataset, 'filter_index'))
+        page = dataset['df_processed'].take(positions[:25])[main.TABLE_DISPLAY_COLUMNS]
+        return dataset, shared['pemetaan'], page
+    
+    print(f"Memori per sesi ({n_rows:,} pegawai, {pemetaan_rows:,} baris pemetaan, {n_sessions} sesi):")
+    tracemalloc.start()
+    try:
+        for label, session in (("sebelum (st.cache_data, salinan per sesi)", session_before),
+                               ("sesudah (dataset read-only bersama)", session_after)):
+            # Sesi pertama mengisi cache; yang diukur adalah tambahan memori sesi berikutnya
+            start = _allocated_bytes()
+            sessions = [session()]
+            warm = _allocated_bytes()
+            sessions.extend(session() for _ in range(n_sessions - 1))
+            per_session = (_allocated_bytes() - warm) / max(n_sessions - 1, 1)
+            print(f"  {label:<44} {per_session / 2**20:10.2f} MB/sesi "
+                  f"(sesi pertama + cache {(warm - start) / 2**20:.2f} MB)")
+            del sessions
+    finally:
+        tracemalloc.stop()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    suite_parser = subparsers.add_parser('suite', help="Ukur semua jalur kritis pada beberapa ukuran data")
+    suite_parser.add_argument('--sizes', type=int, nargs='+', default=SUITE_SIZES)
+    suite_parser.add_argument('--repeat', type=int, default=3)
+    suite_parser.add_argument('--output', default='benchmark_results.json')
+    suite_parser.add_argument('--pemetaan-max-rows', type=int, default=PEMETAAN_MAX_ROWS)
+
+    text_parser = subparsers.add_parser('text-cleaning', help="Pembersihan teks wordcloud per baris vs batch")
+    text_parser.add_argument('--rows', type=int, default=100_000)
+    text_parser.add_argument('--repeat', type=int, default=3)
+    text_parser.add_argument('--distinct', type=int, default=None,
+                             help="Ambil jawaban dari kumpulan N jawaban berbeda (default: semua berbeda)")
+
+    importtime_parser = subparsers.add_parser('importtime', help="Ringkasan -X importtime saat startup")
+    importtime_parser.add_argument('--module', default='main')
+    importtime_parser.add_argument('--top', type=int, default=10)
+
+    memory_parser = subparsers.add_parser('session-memory', help="Memori per sesi: salinan cache_data vs data bersama")
+    memory_parser.add_argument('--rows', type=int, default=100_000)
+    memory_parser.add_argument('--sessions', type=int, default=10)
+    memory_parser.add_argument('--pemetaan-rows', type=int, default=10_000)
+
+    args = parser.parse_args()
+    if args.command == 'suite':
+        run_suite(args.sizes, args.repeat, args.output, args.pemetaan_max_rows)
+    elif args.command == 'text-cleaning':
+        bench_text_cleaning(args.rows, args.repeat, args.distinct)
+    elif args.command == 'importtime':
+        bench_importtime(args.module, args.top)
+    elif args.command == 'session-memory':
+        bench_session_memory(args.rows, args.sessions, args.pemetaan_rows)
+
+
+if __name__ == "__main__":
+    main_cli()
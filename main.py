@@ -1,38 +1,154 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 import numpy as np
-from plotly.subplots import make_subplots
-import plotly.express as px
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from collections import Counter
+from collections import Counter, OrderedDict
 import re
+import os
+import io
+import hashlib
+import importlib
+import importlib.util
+import threading
+import sys
+import time
+import argparse
+import html
+import zipfile
+import tempfile
+import shutil
+import sqlite3
+import urllib.parse
+import multiprocessing
+import warnings
+import json
+import uuid
+from contextlib import contextmanager, nullcontext
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from itertools import islice, product
 
-# Import untuk stopwords bahasa Indonesia
-try:
-    from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
-    stopword_factory = StopWordRemoverFactory()
-    stopword_remover = stopword_factory.create_stop_word_remover()
-    SASTRAWI_AVAILABLE = True
-except ImportError:
-    SASTRAWI_AVAILABLE = False
-    # Fallback stopwords Indonesia
-    INDONESIAN_STOPWORDS = {
-        'yang', 'untuk', 'pada', 'dalam', 'dengan', 'ini', 'itu', 'dan', 'di', 'ke', 'dari', 
-        'oleh', 'saya', 'akan', 'adalah', 'atau', 'juga', 'dapat', 'karena', 'sebagai',
-        'ada', 'tidak', 'sudah', 'lebih', 'bisa', 'telah', 'harus', 'sebuah', 'sangat',
-        'bps', 'kabupaten', 'kota', 'provinsi', 'lampung',
-        "ada","adalah","adanya","adapun","agak","agaknya","agar","akan","akankah","akhir","akhiri","akhirnya","aku","akulah","amat","amatlah","anda","andalah","antar","antara","antaranya","apa","apaan","apabila","apakah","apalagi","apatah","artinya","asal","asalkan","atas","atau","ataukah","ataupun","awal","awalnya","bagai","bagaikan","bagaimana","bagaimanakah","bagaimanapun","bagi","bagian","bahkan","bahwa","bahwasanya","baik","bakal","bakalan","balik","banyak","bapak","baru","bawah","beberapa","begini","beginian","beginikah","beginilah","begitu","begitukah","begitulah","begitupun","bekerja","belakang","belakangan","belum","belumlah","benar","benarkah","benarlah","berada","berakhir","berakhirlah","berakhirnya","berapa","berapakah","berapalah","berapapun","berarti","berawal","berbagai","berdatangan","beri","berikan","berikut","berikutnya","berjumlah","berkali-kali","berkata","berkehendak","berkeinginan","berkenaan","berlainan","berlalu","berlangsung","berlebihan","bermacam","bermacam-macam","bermaksud","bermula","bersama","bersama-sama","bersiap","bersiap-siap","bertanya","bertanya-tanya","berturut","berturut-turut","bertutur","berujar","berupa","besar","betul","betulkah","biasa","biasanya","bila","bilakah","bisa","bisakah","boleh","bolehkah","bolehlah","buat","bukan","bukankah","bukanlah","bukannya","bulan","bung","cara","caranya","cukup","cukupkah","cukuplah","cuma","dahulu","dalam","dan","dapat","dari","daripada","datang","dekat","demi","demikian","demikianlah","dengan","depan","di","dia","diakhiri","diakhirinya","dialah","diantara","diantaranya","diberi","diberikan","diberikannya","dibuat","dibuatnya","didapat","didatangkan","digunakan","diibaratkan","diibaratkannya","diingat","diingatkan","diinginkan","dijawab","dijelaskan","dijelaskannya","dikarenakan","dikatakan","dikatakannya","dikerjakan","diketahui","diketahuinya","dikira","dilakukan","dilalui","dilihat","dimaksud","dimaksudkan","dimaksudkannya","dimaksudnya","diminta","dimintai","dimisalkan","dimulai","dimulailah","dimulainya","dimungkinkan","dini","dipastikan","diperbuat","diperbuatnya","dipergunakan","diperkirakan","diperlihatkan","diperlukan","diperlukannya","dipersoalkan","dipertanyakan","dipunyai","diri","dirinya","disampaikan","disebut","disebutkan","disebutkannya","disini","disinilah","ditambahkan","ditandaskan","ditanya","ditanyai","ditanyakan","ditegaskan","ditujukan","ditunjuk","ditunjuki","ditunjukkan","ditunjukkannya","ditunjuknya","dituturkan","dituturkannya","diucapkan","diucapkannya","diungkapkan","dong","dua","dulu","empat","enggak","enggaknya","entah","entahlah","guna","gunakan","hal","hampir","hanya","hanyalah","hari","harus","haruslah","harusnya","hendak","hendaklah","hendaknya","hingga","ia","ialah","ibarat","ibaratkan","ibaratnya","ibu","ikut","ingat","ingat-ingat","ingin","inginkah","inginkan","ini","inikah","inilah","itu","itukah","itulah","jadi","jadilah","jadinya","jangan","jangankan","janganlah","jauh","jawab","jawaban","jawabnya","jelas","jelaskan","jelaslah","jelasnya","jika","jikalau","juga","jumlah","jumlahnya","justru","kala","kalau","kalaulah","kalaupun","kalian","kami","kamilah","kamu","kamulah","kan","kapan","kapankah","kapanpun","karena","karenanya","kasus","kata","katakan","katakanlah","katanya","ke","keadaan","kebetulan","kecil","kedua","keduanya","keinginan","kelamaan","kelihatan","kelihatannya","kelima","keluar","kembali","kemudian","kemungkinan","kemungkinannya","kenapa","kepada","kepadanya","kesampaian","keseluruhan","keseluruhannya","keterlaluan","ketika","khususnya","kini","kinilah","kira","kira-kira","kiranya","kita","kitalah","kok","kurang","lagi","lagian","lah","lain","lainnya","lalu","lama","lamanya","lanjut","lanjutnya","lebih","lewat","lima","luar","macam","maka","makanya","makin","malah","malahan","mampu","mampukah","mana","manakala","manalagi","masa","masalah","masalahnya","masih","masihkah","masing","masing-masing","mau","maupun","melainkan","melakukan","melalui","melihat","melihatnya","memang","memastikan","memberi","memberikan","membuat","memerlukan","memihak","meminta","memintakan","memisalkan","memperbuat","mempergunakan","memperkirakan","memperlihatkan","mempersiapkan","mempersoalkan","mempertanyakan","mempunyai","memulai","memungkinkan","menaiki","menambahkan","menandaskan","menanti","menanti-nanti","menantikan","menanya","menanyai","menanyakan","mendapat","mendapatkan","mendatang","mendatangi","mendatangkan","menegaskan","mengakhiri","mengapa","mengatakan","mengatakannya","mengenai","mengerjakan","mengetahui","menggunakan","menghendaki","mengibaratkan","mengibaratkannya","mengingat","mengingatkan","menginginkan","mengira","mengucapkan","mengucapkannya","mengungkapkan","menjadi","menjawab","menjelaskan","menuju","menunjuk","menunjuki","menunjukkan","menunjuknya","menurut","menuturkan","menyampaikan","menyangkut","menyatakan","menyebutkan","menyeluruh","menyiapkan","merasa","mereka","merekalah","merupakan","meski","meskipun","meyakini","meyakinkan","minta","mirip","misal","misalkan","misalnya","mula","mulai","mulailah","mulanya","mungkin","mungkinkah","nah","naik","namun","nanti","nantinya","nyaris","nyatanya","oleh","olehnya","pada","padahal","padanya","pak","paling","panjang","pantas","para","pasti","pastilah","penting","pentingnya","per","percuma","perlu","perlukah","perlunya","pernah","persoalan","pertama","pertama-tama","pertanyaan","pertanyakan","pihak","pihaknya","pukul","pula","pun","punya","rasa","rasanya","rata","rupanya","saat","saatnya","saja","sajalah","saling","sama","sama-sama","sambil","sampai","sampai-sampai","sampaikan","sana","sangat","sangatlah","satu","saya","sayalah","se","sebab","sebabnya","sebagai","sebagaimana","sebagainya","sebagian","sebaik","sebaik-baiknya","sebaiknya","sebaliknya","sebanyak","sebegini","sebegitu","sebelum","sebelumnya","sebenarnya","seberapa","sebesar","sebetulnya","sebisanya","sebuah","sebut","sebutlah","sebutnya","secara","secukupnya","sedang","sedangkan","sedemikian","sedikit","sedikitnya","seenaknya","segala","segalanya","segera","seharusnya","sehingga","seingat","sejak","sejauh","sejenak","sejumlah","sekadar","sekadarnya","sekali","sekali-kali","sekalian","sekaligus","sekalipun","sekarang","sekecil","seketika","sekiranya","sekitar","sekitarnya","sekurang-kurangnya","sekurangnya","sela","selagi","selain","selaku","selalu","selama","selama-lamanya","selamanya","selanjutnya","seluruh","seluruhnya","semacam","semakin","semampu","semampunya","semasa","semasih","semata","semata-mata","semaunya","sementara","semisal","semisalnya","sempat","semua","semuanya","semula","sendiri","sendirian","sendirinya","seolah","seolah-olah","seorang","sepanjang","sepantasnya","sepantasnyalah","seperlunya","seperti","sepertinya","sepihak","sering","seringnya","serta","serupa","sesaat","sesama","sesampai","sesegera","sesekali","seseorang","sesuatu","sesuatunya","sesudah","sesudahnya","setelah","setempat","setengah","seterusnya","setiap","setiba","setibanya","setidak-tidaknya","setidaknya","setinggi","seusai","sewaktu","siap","siapa","siapakah","siapapun","sini","sinilah","soal","soalnya","suatu","sudah","sudahkah","sudahlah","supaya","tadi","tadinya","tahu","tahun","tak","tambah","tambahnya","tampak","tampaknya","tandas","tandasnya","tanpa","tanya","tanyakan","tanyanya","tapi","tegas","tegasnya","telah","tempat","tengah","tentang","tentu","tentulah","tentunya","tepat","terakhir","terasa","terbanyak","terdahulu","terdapat","terdiri","terhadap","terhadapnya","teringat","teringat-ingat","terjadi","terjadilah","terjadinya","terkira","terlalu","terlebih","terlihat","termasuk","ternyata","tersampaikan","tersebut","tersebutlah","tertentu","tertuju","terus","terutama","tetap","tetapi","tiap","tiba","tiba-tiba","tidak","tidakkah","tidaklah","tiga","tinggi","toh","tunjuk","turut","tutur","tuturnya","ucap","ucapnya","ujar","ujarnya","umum","umumnya","ungkap","ungkapnya","untuk","usah","usai","waduh","wah","wahai","waktu","waktunya","walau","walaupun","wong","yaitu","yakin","yakni","yang", 'yuk', 'ayo', 'ayo yuk', 'ayo aja', 'ayo dong', 'ayo yuk dong', 'ayo aja yuk', 'ayo dong yuk', 'ayo dong aja', 'ayo yuk aja', 'ayo yuk dong aja'
-    }
+def lazy_import(module_name):
+    """Import a heavy module on first use (plotly, matplotlib, wordcloud, Sastrawi, pyarrow)"""
+    # importlib menyimpan modul di sys.modules, jadi pemanggilan berikutnya hanya lookup dict
+    return importlib.import_module(module_name)
 
-# Konfigurasi halaman (kode CSS dan fungsi lainnya tetap sama)
-st.set_page_config(
-    page_title="Aplikasi Pengolahan Data Kompetensi",
-    page_icon="📊",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+def _module_available(module_name):
+    """Check whether an optional module is installed without importing it"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except ImportError:
+        return False
+
+# PyArrow (opsional) untuk cache kolumnar berformat Feather
+PYARROW_AVAILABLE = _module_available('pyarrow')
+
+# Instrumentasi waktu per rerun: span hanya dicatat saat panel debug aktif
+TIMING_LOG_PATH = "timing_log.jsonl"
+TIMING_DEBUG_KEY = "timing_debug"
+_timing_local = threading.local()
+_timing_log_lock = threading.Lock()
+_NO_SPAN = nullcontext()
+
+@contextmanager
+def _recorded_span(spans, name):
+    """Append the duration of the wrapped block to spans"""
+    depth = _timing_local.depth
+    _timing_local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timing_local.depth = depth
+        spans.append({
+            'name': name,
+            'depth': depth,
+            'start_ms': (start - _timing_local.origin) * 1000,
+            'ms': (time.perf_counter() - start) * 1000,
+        })
+
+def timing_span(name):
+    """Time a block during an instrumented rerun (a shared no-op context otherwise)"""
+    # Setiap sesi Streamlit berjalan di thread sendiri, jadi state span per thread
+    spans = getattr(_timing_local, 'spans', None)
+    if spans is None:
+        return _NO_SPAN
+    return _recorded_span(spans, name)
+
+def append_timing_log(record, path=TIMING_LOG_PATH):
+    """Append one rerun's timing record as a JSON line"""
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    with _timing_log_lock, open(path, 'a', encoding='utf-8') as f:
+        f.write(line)
+
+def display_timing_panel(spans, total_ms):
+    """Show a rerun's spans in the sidebar, nested spans indented under their parent"""
+    rows = [
+        {'Span': '\u2003' * span['depth'] + span['name'], 'Waktu (ms)': round(span['ms'], 2)}
+        for span in sorted(spans, key=lambda span: span['start_ms'])
+    ]
+    with st.expander(f"⏱️ Rerun terakhir: {total_ms:,.1f} ms", expanded=True):
+        st.dataframe(pd.DataFrame(rows, columns=['Span', 'Waktu (ms)']), hide_index=True, use_container_width=True)
+        st.caption(f"Dicatat ke {TIMING_LOG_PATH}")
+
+@contextmanager
+def timing_session():
+    """Collect spans for one rerun, then show them in the sidebar and append them to the JSONL log"""
+    enabled = st.session_state.get(TIMING_DEBUG_KEY, False)
+    _timing_local.spans = [] if enabled else None
+    _timing_local.depth = 0
+    _timing_local.origin = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans, _timing_local.spans = _timing_local.spans, None
+    total_ms = (time.perf_counter() - _timing_local.origin) * 1000
+    
+    with st.sidebar:
+        st.checkbox("⏱️ Panel Debug Waktu", key=TIMING_DEBUG_KEY,
+                    help="Tampilkan waktu tiap tahap rerun dan catat ke log JSONL")
+        if spans is not None:
+            session_id = st.session_state.setdefault('timing_session_id', uuid.uuid4().hex)
+            display_timing_panel(spans, total_ms)
+            append_timing_log({
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'session_id': session_id,
+                'menu': st.session_state.get('menu'),
+                'total_ms': round(total_ms, 3),
+                'spans': [{key: round(value, 3) if isinstance(value, float) else value
+                           for key, value in span.items()} for span in spans],
+            })
+
+# Stopwords Indonesia dan istilah khas BPS
+INDONESIAN_STOPWORDS = {
+    'yang', 'untuk', 'pada', 'dalam', 'dengan', 'ini', 'itu', 'dan', 'di', 'ke', 'dari', 
+    'oleh', 'saya', 'akan', 'adalah', 'atau', 'juga', 'dapat', 'karena', 'sebagai',
+    'ada', 'tidak', 'sudah', 'lebih', 'bisa', 'telah', 'harus', 'sebuah', 'sangat',
+    'bps', 'kabupaten', 'kota', 'provinsi', 'lampung',
+    "ada","adalah","adanya","adapun","agak","agaknya","agar","akan","akankah","akhir","akhiri","akhirnya","aku","akulah","amat","amatlah","anda","andalah","antar","antara","antaranya","apa","apaan","apabila","apakah","apalagi","apatah","artinya","asal","asalkan","atas","atau","ataukah","ataupun","awal","awalnya","bagai","bagaikan","bagaimana","bagaimanakah","bagaimanapun","bagi","bagian","bahkan","bahwa","bahwasanya","baik","bakal","bakalan","balik","banyak","bapak","baru","bawah","beberapa","begini","beginian","beginikah","beginilah","begitu","begitukah","begitulah","begitupun","bekerja","belakang","belakangan","belum","belumlah","benar","benarkah","benarlah","berada","berakhir","berakhirlah","berakhirnya","berapa","berapakah","berapalah","berapapun","berarti","berawal","berbagai","berdatangan","beri","berikan","berikut","berikutnya","berjumlah","berkali-kali","berkata","berkehendak","berkeinginan","berkenaan","berlainan","berlalu","berlangsung","berlebihan","bermacam","bermacam-macam","bermaksud","bermula","bersama","bersama-sama","bersiap","bersiap-siap","bertanya","bertanya-tanya","berturut","berturut-turut","bertutur","berujar","berupa","besar","betul","betulkah","biasa","biasanya","bila","bilakah","bisa","bisakah","boleh","bolehkah","bolehlah","buat","bukan","bukankah","bukanlah","bukannya","bulan","bung","cara","caranya","cukup","cukupkah","cukuplah","cuma","dahulu","dalam","dan","dapat","dari","daripada","datang","dekat","demi","demikian","demikianlah","dengan","depan","di","dia","diakhiri","diakhirinya","dialah","diantara","diantaranya","diberi","diberikan","diberikannya","dibuat","dibuatnya","didapat","didatangkan","digunakan","diibaratkan","diibaratkannya","diingat","diingatkan","diinginkan","dijawab","dijelaskan","dijelaskannya","dikarenakan","dikatakan","dikatakannya","dikerjakan","diketahui","diketahuinya","dikira","dilakukan","dilalui","dilihat","dimaksud","dimaksudkan","dimaksudkannya","dimaksudnya","diminta","dimintai","dimisalkan","dimulai","dimulailah","dimulainya","dimungkinkan","dini","dipastikan","diperbuat","diperbuatnya","dipergunakan","diperkirakan","diperlihatkan","diperlukan","diperlukannya","dipersoalkan","dipertanyakan","dipunyai","diri","dirinya","disampaikan","disebut","disebutkan","disebutkannya","disini","disinilah","ditambahkan","ditandaskan","ditanya","ditanyai","ditanyakan","ditegaskan","ditujukan","ditunjuk","ditunjuki","ditunjukkan","ditunjukkannya","ditunjuknya","dituturkan","dituturkannya","diucapkan","diucapkannya","diungkapkan","dong","dua","dulu","empat","enggak","enggaknya","entah","entahlah","guna","gunakan","hal","hampir","hanya","hanyalah","hari","harus","haruslah","harusnya","hendak","hendaklah","hendaknya","hingga","ia","ialah","ibarat","ibaratkan","ibaratnya","ibu","ikut","ingat","ingat-ingat","ingin","inginkah","inginkan","ini","inikah","inilah","itu","itukah","itulah","jadi","jadilah","jadinya","jangan","jangankan","janganlah","jauh","jawab","jawaban","jawabnya","jelas","jelaskan","jelaslah","jelasnya","jika","jikalau","juga","jumlah","jumlahnya","justru","kala","kalau","kalaulah","kalaupun","kalian","kami","kamilah","kamu","kamulah","kan","kapan","kapankah","kapanpun","karena","karenanya","kasus","kata","katakan","katakanlah","katanya","ke","keadaan","kebetulan","kecil","kedua","keduanya","keinginan","kelamaan","kelihatan","kelihatannya","kelima","keluar","kembali","kemudian","kemungkinan","kemungkinannya","kenapa","kepada","kepadanya","kesampaian","keseluruhan","keseluruhannya","keterlaluan","ketika","khususnya","kini","kinilah","kira","kira-kira","kiranya","kita","kitalah","kok","kurang","lagi","lagian","lah","lain","lainnya","lalu","lama","lamanya","lanjut","lanjutnya","lebih","lewat","lima","luar","macam","maka","makanya","makin","malah","malahan","mampu","mampukah","mana","manakala","manalagi","masa","masalah","masalahnya","masih","masihkah","masing","masing-masing","mau","maupun","melainkan","melakukan","melalui","melihat","melihatnya","memang","memastikan","memberi","memberikan","membuat","memerlukan","memihak","meminta","memintakan","memisalkan","memperbuat","mempergunakan","memperkirakan","memperlihatkan","mempersiapkan","mempersoalkan","mempertanyakan","mempunyai","memulai","memungkinkan","menaiki","menambahkan","menandaskan","menanti","menanti-nanti","menantikan","menanya","menanyai","menanyakan","mendapat","mendapatkan","mendatang","mendatangi","mendatangkan","menegaskan","mengakhiri","mengapa","mengatakan","mengatakannya","mengenai","mengerjakan","mengetahui","menggunakan","menghendaki","mengibaratkan","mengibaratkannya","mengingat","mengingatkan","menginginkan","mengira","mengucapkan","mengucapkannya","mengungkapkan","menjadi","menjawab","menjelaskan","menuju","menunjuk","menunjuki","menunjukkan","menunjuknya","menurut","menuturkan","menyampaikan","menyangkut","menyatakan","menyebutkan","menyeluruh","menyiapkan","merasa","mereka","merekalah","merupakan","meski","meskipun","meyakini","meyakinkan","minta","mirip","misal","misalkan","misalnya","mula","mulai","mulailah","mulanya","mungkin","mungkinkah","nah","naik","namun","nanti","nantinya","nyaris","nyatanya","oleh","olehnya","pada","padahal","padanya","pak","paling","panjang","pantas","para","pasti","pastilah","penting","pentingnya","per","percuma","perlu","perlukah","perlunya","pernah","persoalan","pertama","pertama-tama","pertanyaan","pertanyakan","pihak","pihaknya","pukul","pula","pun","punya","rasa","rasanya","rata","rupanya","saat","saatnya","saja","sajalah","saling","sama","sama-sama","sambil","sampai","sampai-sampai","sampaikan","sana","sangat","sangatlah","satu","saya","sayalah","se","sebab","sebabnya","sebagai","sebagaimana","sebagainya","sebagian","sebaik","sebaik-baiknya","sebaiknya","sebaliknya","sebanyak","sebegini","sebegitu","sebelum","sebelumnya","sebenarnya","seberapa","sebesar","sebetulnya","sebisanya","sebuah","sebut","sebutlah","sebutnya","secara","secukupnya","sedang","sedangkan","sedemikian","sedikit","sedikitnya","seenaknya","segala","segalanya","segera","seharusnya","sehingga","seingat","sejak","sejauh","sejenak","sejumlah","sekadar","sekadarnya","sekali","sekali-kali","sekalian","sekaligus","sekalipun","sekarang","sekecil","seketika","sekiranya","sekitar","sekitarnya","sekurang-kurangnya","sekurangnya","sela","selagi","selain","selaku","selalu","selama","selama-lamanya","selamanya","selanjutnya","seluruh","seluruhnya","semacam","semakin","semampu","semampunya","semasa","semasih","semata","semata-mata","semaunya","sementara","semisal","semisalnya","sempat","semua","semuanya","semula","sendiri","sendirian","sendirinya","seolah","seolah-olah","seorang","sepanjang","sepantasnya","sepantasnyalah","seperlunya","seperti","sepertinya","sepihak","sering","seringnya","serta","serupa","sesaat","sesama","sesampai","sesegera","sesekali","seseorang","sesuatu","sesuatunya","sesudah","sesudahnya","setelah","setempat","setengah","seterusnya","setiap","setiba","setibanya","setidak-tidaknya","setidaknya","setinggi","seusai","sewaktu","siap","siapa","siapakah","siapapun","sini","sinilah","soal","soalnya","suatu","sudah","sudahkah","sudahlah","supaya","tadi","tadinya","tahu","tahun","tak","tambah","tambahnya","tampak","tampaknya","tandas","tandasnya","tanpa","tanya","tanyakan","tanyanya","tapi","tegas","tegasnya","telah","tempat","tengah","tentang","tentu","tentulah","tentunya","tepat","terakhir","terasa","terbanyak","terdahulu","terdapat","terdiri","terhadap","terhadapnya","teringat","teringat-ingat","terjadi","terjadilah","terjadinya","terkira","terlalu","terlebih","terlihat","termasuk","ternyata","tersampaikan","tersebut","tersebutlah","tertentu","tertuju","terus","terutama","tetap","tetapi","tiap","tiba","tiba-tiba","tidak","tidakkah","tidaklah","tiga","tinggi","toh","tunjuk","turut","tutur","tuturnya","ucap","ucapnya","ujar","ujarnya","umum","umumnya","ungkap","ungkapnya","untuk","usah","usai","waduh","wah","wahai","waktu","waktunya","walau","walaupun","wong","yaitu","yakin","yakni","yang", 'yuk', 'ayo', 'ayo yuk', 'ayo aja', 'ayo dong', 'ayo yuk dong', 'ayo aja yuk', 'ayo dong yuk', 'ayo dong aja', 'ayo yuk aja', 'ayo yuk dong aja'
+}
+
+# Sastrawi (opsional) untuk daftar stopwords bahasa Indonesia
+SASTRAWI_AVAILABLE = _module_available('Sastrawi')
+
+_NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+# Padanan untuk teks yang sudah lowercase. \s pada RE2 (mesin regex Arrow) hanya mencakup
+# spasi ASCII, jadi semua karakter str.isspace() ditulis eksplisit agar hasilnya sama dengan re
+_NON_ALPHA_LOWER_PATTERN = '[^a-z\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]'
+
+@st.cache_resource
+def get_stopword_tokens():
+    """Merge Sastrawi and BPS stopwords into a frozen token-level set, built once on demand"""
+    entries = set(INDONESIAN_STOPWORDS)
+    if SASTRAWI_AVAILABLE:
+        factory_module = lazy_import('Sastrawi.StopWordRemover.StopWordRemoverFactory')
+        entries.update(factory_module.StopWordRemoverFactory().get_stop_words())
+    # Entri dinormalisasi seperti teks jawaban: 'berkali-kali' -> 'berkalikali',
+    # entri multi-kata (mis. 'ayo yuk dong') dipecah menjadi token tunggal
+    return frozenset(
+        token
+        for entry in entries
+        for token in _NON_ALPHA_PATTERN.sub('', entry.lower()).split()
+    )
 
 # [Semua fungsi CSS dan helper functions yang sudah ada tetap sama...]
 # Custom CSS untuk styling yang lebih menarik
@@ -226,87 +342,1451 @@ def load_css():
     </style>
     """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_data():
-    """Load data from CSV file"""
+# Lokasi file sumber data dan direktori cache kolumnar (sidecar)
+COMPETENCY_CSV_PATH = "hasil-manajerial-teknis.csv"
+PEMETAAN_XLSX_PATH = "pemetaan.xlsx"
+COLUMNAR_CACHE_DIR = ".columnar_cache"
+# Naikkan bila skema/tipe hasil ingest berubah agar sidecar lama tidak dipakai
+COLUMNAR_CACHE_VERSION = 3
+
+def _columnar_source_prefix(source_path):
+    """Return sidecar name prefix unique to one source file path"""
+    # Hash path lengkap: sumber bernama sama di direktori lain tidak berbagi prefix
+    source_key = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()[:8]
+    return f"{os.path.basename(source_path)}.{source_key}."
+
+def _columnar_sidecar_path(source_path):
+    """Return sidecar path keyed on source path, mtime and size"""
+    stat = os.stat(source_path)
+    key = f"{os.path.abspath(source_path)}|{stat.st_mtime_ns}|{stat.st_size}|v{COLUMNAR_CACHE_VERSION}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(COLUMNAR_CACHE_DIR, f"{_columnar_source_prefix(source_path)}{digest}.feather")
+
+def _write_columnar_sidecar(df, source_path):
+    """Write Feather sidecar atomically and remove stale sidecars of the same source"""
+    os.makedirs(COLUMNAR_CACHE_DIR, exist_ok=True)
+    sidecar_path = _columnar_sidecar_path(source_path)
+    # File sementara unik per penulis agar worker/proses paralel tidak saling menimpa
+    fd, tmp_path = tempfile.mkstemp(dir=COLUMNAR_CACHE_DIR, prefix='.tmp-', suffix='.feather')
+    os.close(fd)
     try:
-        # Ganti dengan path file CSV Anda
-        df = pd.read_csv("hasil-manajerial-teknis.csv", encoding='utf-8')
-        return df
-    except Exception as e:
+        # Tanpa kompresi agar sidecar bisa di-memory-map saat dibaca
+        feather = lazy_import('pyarrow.feather')
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, sidecar_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    
+    prefix = _columnar_source_prefix(source_path)
+    for name in os.listdir(COLUMNAR_CACHE_DIR):
+        stale_path = os.path.join(COLUMNAR_CACHE_DIR, name)
+        if name.startswith(prefix) and stale_path != sidecar_path:
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                # Sudah dihapus proses lain
+                pass
+
+def read_with_columnar_cache(source_path, reader):
+    """Read source through a typed Feather sidecar, parsing with reader only when stale"""
+    if not PYARROW_AVAILABLE:
+        return reader(source_path)
+    
+    sidecar_path = _columnar_sidecar_path(source_path)
+    if os.path.exists(sidecar_path):
         try:
-            # Coba dengan encoding alternatif
-            df = pd.read_csv("hasil-manajerial-teknis.csv", encoding='latin-1')
-            return df
-        except Exception as e2:
-            st.error(f"Error loading data: {e2}")
-            return None
+            return lazy_import('pyarrow.feather').read_table(sidecar_path, memory_map=True).to_pandas()
+        except Exception:
+            # Sidecar rusak: parsing ulang dari sumber
+            pass
+    
+    df = reader(source_path)
+    try:
+        _write_columnar_sidecar(df, source_path)
+    except Exception:
+        # Kolom bertipe campuran tidak bisa disimpan ke Arrow; tetap pakai hasil parsing
+        pass
+    return df
 
-@st.cache_data
-def load_pemetaan_data():
-    """Load data pemetaan from Excel file"""
+def _read_typed_csv(path, encoding):
+    """Read only the schema's columns with compact dtypes"""
+    def read(dtype):
+        # Isi file unggahan (bytes) dibungkus ulang agar setiap percobaan membaca dari awal
+        source = io.BytesIO(path) if isinstance(path, bytes) else path
+        return pd.read_csv(source, encoding=encoding, usecols=lambda col: col in dtype, dtype=dtype)
+    
+    # Skor dibaca sebagai int64 lalu dicek rentangnya: read_csv dengan int8 membungkus nilai
+    # di luar rentang tanpa peringatan (200 menjadi -56)
+    wide_schema = {col: 'int64' if dtype == 'int8' else dtype for col, dtype in COMPETENCY_SCHEMA.items()}
+    try:
+        with warnings.catch_warnings():
+            # Cast integer yang gagal karena NaN memicu RuntimeWarning sebelum ValueError
+            warnings.simplefilter('ignore', RuntimeWarning)
+            df = read(wide_schema)
+    except UnicodeDecodeError:
+        raise
+    except (ValueError, TypeError, OverflowError):
+        # Ada skor kosong/pecahan yang tidak bisa dibaca sebagai integer: skor dibaca sebagai float32 (NaN)
+        return read({col: 'float32' if dtype == 'int8' else dtype for col, dtype in COMPETENCY_SCHEMA.items()})
+    
+    scores = [col for col in SCORE_COLUMNS if col in df.columns]
+    info = np.iinfo(np.int8)
+    fits_int8 = all(df[col].empty or (df[col].min() >= info.min and df[col].max() <= info.max) for col in scores)
+    # Skor di luar rentang int8 tetap dipertahankan nilainya sebagai float32
+    df[scores] = df[scores].astype('int8' if fits_int8 else 'float32')
+    return df
+
+def _read_competency_csv(path):
+    """Parse competency CSV with the typed schema, retrying with latin-1 when UTF-8 fails"""
     try:
-        df = pd.read_excel("pemetaan.xlsx")
+        return _read_typed_csv(path, 'utf-8')
+    except UnicodeDecodeError:
+        # Coba dengan encoding alternatif
+        return _read_typed_csv(path, 'latin-1')
+
+def memory_report(df):
+    """Return each column's dtype and deep memory usage, largest first"""
+    usage = df.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        'Kolom': usage.index,
+        'Tipe': df.dtypes.astype(str).to_numpy(),
+        'Memori (KB)': (usage / 1024).round(1).to_numpy(),
+    })
+    return report.sort_values('Memori (KB)', ascending=False, ignore_index=True)
+
+def _reject_shared_write(*args, **kwargs):
+    """Raise for any attempt to modify process-wide shared data"""
+    raise TypeError("Data bersama bersifat read-only; gunakan .copy() sebelum mengubahnya")
+
+class _ReadOnlyIndexer:
+    """loc/iloc/at/iat of a SharedFrame: reads pass through, writes raise"""
+    
+    def __init__(self, indexer):
+        self._indexer = indexer
+    
+    def __getitem__(self, key):
+        return self._indexer[key]
+    
+    __setitem__ = _reject_shared_write
+    
+    def __call__(self, *args, **kwargs):
+        # df.loc(axis=...) mengembalikan indexer baru yang juga harus read-only
+        return _ReadOnlyIndexer(self._indexer(*args, **kwargs))
+    
+    def __getattr__(self, name):
+        return getattr(self._indexer, name)
+
+def _read_only_indexer(name):
+    """Property returning the DataFrame indexer name wrapped as read-only"""
+    indexer = getattr(pd.DataFrame, name)
+    return property(lambda self: _ReadOnlyIndexer(indexer.fget(self)))
+
+class SharedFrame(pd.DataFrame):
+    """Read-only DataFrame held once per process and shared by all sessions"""
+    
+    # Hasil turunan (take, filter, rename, ...) adalah DataFrame biasa yang boleh diubah
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+    
+    # Flag read-only NumPy tidak melindungi kolom string Arrow (setitem mengganti array-nya),
+    # jadi semua jalur tulis ditolak di tingkat frame
+    __setitem__ = __delitem__ = insert = pop = _update_inplace = _reject_shared_write
+    loc, iloc, at, iat = (_read_only_indexer(name) for name in ('loc', 'iloc', 'at', 'iat'))
+    
+    def __setattr__(self, name, value):
+        if name in ('columns', 'index'):
+            _reject_shared_write()
+        super().__setattr__(name, value)
+
+def _read_only_array(values):
+    """Return values (NumPy array or Categorical) backed by a buffer that rejects writes"""
+    if isinstance(values, pd.Categorical):
+        # codes sudah berupa view read-only dari pandas; view baru menjamin flag tanpa menyalin
+        codes = values.codes.view()
+        codes.flags.writeable = False
+        return pd.Categorical.from_codes(codes, dtype=values.dtype)
+    if isinstance(values, np.ndarray):
+        values = values.view()
+        values.flags.writeable = False
+    # Kolom string Arrow tidak punya flag read-only; penulisannya ditolak oleh SharedFrame
+    return values
+
+def freeze_frame(df, score_matrix=None):
+    """Wrap df as a SharedFrame whose column buffers are read-only, without copying the data"""
+    # Dengan score_matrix, kolom skor diganti view kolom matriks (satu salinan skor per dataset)
+    if isinstance(df, SharedFrame) and score_matrix is None:
         return df
+    columns = {}
+    for col in df.columns:
+        if score_matrix is not None and col in SCORE_COLUMN_INDEX:
+            columns[col] = score_matrix[:, SCORE_COLUMN_INDEX[col]]
+            continue
+        values = df[col].array
+        if isinstance(values, pd.arrays.NumpyExtensionArray):
+            values = values.to_numpy()
+        values = _read_only_array(values)
+        if isinstance(values, np.ndarray) and values.dtype == object:
+            # Array object polos akan diinferensi ulang (dan disalin) sebagai str oleh konstruktor
+            values = pd.Series(values, index=df.index, dtype=object, copy=False)
+        columns[col] = values
+    return SharedFrame(columns, index=df.index, copy=False)
+
+def freeze_part(part):
+    """Make a derived dataset part read-only in place (arrays, frames, and the values of dicts)"""
+    if isinstance(part, np.ndarray):
+        part.flags.writeable = False
+    elif isinstance(part, pd.DataFrame):
+        return freeze_frame(part)
+    elif isinstance(part, dict):
+        for key, value in part.items():
+            part[key] = freeze_part(value)
+    return part
+
+# Batas jumlah dataset unggahan (beserta indeks dan agregatnya) yang disimpan di cache
+UPLOAD_CACHE_MAX_ENTRIES = 4
+
+def uploaded_content_hash(uploaded_file):
+    """Return the SHA-1 of an upload's bytes, computed once per upload in this session"""
+    file_id, content_hash = st.session_state.get('upload_hash', (None, None))
+    if file_id != uploaded_file.file_id:
+        content_hash = hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+        st.session_state.upload_hash = (uploaded_file.file_id, content_hash)
+    return content_hash
+
+@st.cache_resource(max_entries=UPLOAD_CACHE_MAX_ENTRIES, show_spinner="Membaca file unggahan...")
+def load_uploaded_dataset(content_hash, _content):
+    """Parse an uploaded competency CSV with the typed schema into a dataset, cached by content hash"""
+    return new_dataset(_read_competency_csv(_content))
+
+def source_signature(path):
+    """Return (mtime_ns, size) of a source file, or None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+# Signature berkas ikut menjadi kunci cache sehingga perubahan pemetaan.xlsx langsung terbaca;
+# satu salinan read-only per proses dipakai bersama oleh semua sesi
+@st.cache_resource(max_entries=2)
+def load_pemetaan_data(signature=None):
+    """Load data pemetaan from Excel file"""
+    try:
+        return freeze_frame(read_with_columnar_cache(PEMETAAN_XLSX_PATH, pd.read_excel))
     except Exception as e:
         st.error(f"Error loading pemetaan data: {e}")
         return None
 
-def clean_text_for_wordcloud(text):
+# Kode kompetensi manajerial (M1-M9) dan teknis (T1-T6)
+MANAJERIAL_CODES = [f'M{i}' for i in range(1, 10)]
+TEKNIS_CODES = [f'T{i}' for i in range(1, 7)]
+SCORE_COLUMNS = [f'{code}_{i}' for code in MANAJERIAL_CODES + TEKNIS_CODES for i in (0, 1)]
+COMPETENCY_LABELS = {
+    'manajerial': ['Integritas', 'Kerjasama', 'Komunikasi', 'Mengelola Perubahan',
+                   'Orientasi pada Hasil', 'Pelayanan Publik', 'Pengambilan Keputusan',
+                   'Pengembangan Diri', 'Perekat Bangsa'],
+    'teknis': ['Distribusi', 'IPDS', 'Neraca', 'Produksi', 'Sosial', 'Umum'],
+}
+
+# Skema ingest CSV kompetensi: hanya kolom yang dipakai aplikasi dengan tipe ringkas;
+# NIP dibaca sebagai string agar 18 digit tidak menjadi float
+COMPETENCY_SCHEMA = {
+    'NIP': 'str',
+    'Nama Pegawai': 'str',
+    'Nama Wilayah': 'category',
+    'Level': 'category',
+    'Jabatan': 'category',
+    **{col: 'int8' for col in SCORE_COLUMNS},
+    'percent_Manajerial': 'float32',
+    'cat_M': 'category',
+    'percent_T': 'float32',
+}
+
+# Nilai maksimum per kompetensi (manajerial mengikuti sumbu spider chart)
+# dan ambang batas kategori (dalam persen)
+NILAI_MAKS_MANAJERIAL = 6
+NILAI_MAKS_TEKNIS = 10
+AMBANG_OPTIMAL = 85
+AMBANG_CUKUP_OPTIMAL = 70
+KATEGORI_LEVELS = ["Optimal", "Cukup Optimal", "Kurang Optimal"]
+
+# Kolom filter pada tampilan tabel dan nilai wildcard-nya
+FILTER_COLUMNS = ['Level', 'Nama Wilayah']
+KATEGORI_COLUMNS = ['cat_M', 'cat_T']
+FILTER_ALL = "Semua"
+
+def compute_kategori(persentase):
+    """Map percentage array to Optimal/Cukup Optimal/Kurang Optimal categories"""
+    persentase = np.asarray(persentase, dtype=float)
+    return np.select(
+        [persentase >= AMBANG_OPTIMAL, persentase >= AMBANG_CUKUP_OPTIMAL],
+        ["Optimal", "Cukup Optimal"],
+        default="Kurang Optimal"
+    )
+
+def kategori_categorical(labels):
+    """Wrap kategori labels as an ordered categorical (Optimal, Cukup Optimal, Kurang Optimal)"""
+    # Label sumber di luar tiga kategori baku tetap disimpan, diurutkan setelahnya
+    extra = sorted({label for label in pd.unique(labels) if pd.notna(label)} - set(KATEGORI_LEVELS))
+    return pd.Categorical(labels, categories=KATEGORI_LEVELS + extra, ordered=True)
+
+def _sum_competency_pairs(df, codes):
+    """Return (available codes, per-competency totals, grand total) in one NumPy pass"""
+    available = [code for code in codes if f'{code}_0' in df.columns and f'{code}_1' in df.columns]
+    if not available:
+        return available, None, np.zeros(len(df))
+    
+    nilai_0 = df[[f'{code}_0' for code in available]].to_numpy()
+    nilai_1 = df[[f'{code}_1' for code in available]].to_numpy()
+    # Skor int8 dijumlahkan dalam int16 agar tidak overflow
+    integer_scores = nilai_0.dtype.kind in 'iu' and nilai_1.dtype.kind in 'iu'
+    per_kompetensi = np.add(nilai_0, nilai_1, dtype=np.int16 if integer_scores else None)
+    return available, per_kompetensi, np.nansum(per_kompetensi, axis=1)
+
+def compute_competency_scores(df):
+    """Add per-competency totals, M_Total/T_Total, percentages and categories"""
+    derived = {}
+    
+    m_codes, m_values, m_total = _sum_competency_pairs(df, MANAJERIAL_CODES)
+    t_codes, t_values, t_total = _sum_competency_pairs(df, TEKNIS_CODES)
+    
+    for values, codes in ((m_values, m_codes), (t_values, t_codes)):
+        for idx, code in enumerate(codes):
+            derived[code] = values[:, idx]
+    derived['M_Total'] = m_total
+    derived['T_Total'] = t_total
+    
+    # Persentase manajerial dari data sumber bila tersedia; jika tidak, dihitung dari total
+    if 'percent_Manajerial' in df.columns:
+        persen_m = df['percent_Manajerial'].to_numpy(dtype=float)
+    else:
+        persen_m = m_total / (len(MANAJERIAL_CODES) * NILAI_MAKS_MANAJERIAL) * 100
+        derived['percent_Manajerial'] = persen_m
+    # Persentase teknis selalu dihitung dari total (total / (n * 10) * 100) dan menimpa percent_T
+    # sumber, agar tabel, filter, CLI dan tampilan per NIP sejalan dengan cat_T
+    persen_t = t_total / (len(TEKNIS_CODES) * NILAI_MAKS_TEKNIS) * 100
+    derived['percent_T'] = persen_t.astype(np.float32)
+    
+    # Kategori manajerial dari data sumber dipertahankan; hanya dihitung bila kolomnya tidak ada
+    if 'cat_M' in df.columns:
+        kategori_m = df['cat_M'].to_numpy(dtype=object)
+    else:
+        kategori_m = compute_kategori(persen_m)
+    kategori_t = compute_kategori(persen_t)
+    derived['cat_M'] = kategori_categorical(kategori_m)
+    derived['cat_T'] = kategori_categorical(kategori_t)
+    
+    # Gabungkan sekali saja agar tidak terjadi fragmentasi kolom
+    derived_df = pd.DataFrame(derived, index=df.index)
+    df_processed = df.drop(columns=[col for col in derived if col in df.columns])
+    df_processed = pd.concat([df_processed, derived_df], axis=1)
+    
+    # Kolom filter disimpan sebagai kategori agar pengelompokan murah
+    for col in FILTER_COLUMNS:
+        if col in df_processed.columns:
+            df_processed[col] = df_processed[col].astype('category')
+    return df_processed
+
+# Posisi kolom di matriks skor (urutan SCORE_COLUMNS) per jenis kompetensi:
+# (indeks nilai selevel, indeks nilai di atas level)
+SCORE_COLUMN_INDEX = {col: i for i, col in enumerate(SCORE_COLUMNS)}
+SCORE_INDEX = {
+    competency_type: (np.array([SCORE_COLUMN_INDEX[f'{code}_0'] for code in codes]),
+                      np.array([SCORE_COLUMN_INDEX[f'{code}_1'] for code in codes]))
+    for competency_type, codes in (('manajerial', MANAJERIAL_CODES), ('teknis', TEKNIS_CODES))
+}
+
+def compute_score_matrix(df):
+    """Pack all score columns into one column-major N x 30 matrix (int8, float32 if not integral)"""
+    present = [col for col in SCORE_COLUMNS if col in df.columns]
+    columns = [df[col].to_numpy() for col in present]
+    fits_int8 = all(
+        values.dtype.kind in 'iu' and (values.size == 0 or (values.min() >= -128 and values.max() <= 127))
+        for values in columns
+    )
+    
+    # Kolom skor yang tidak ada bernilai 0, sama seperti data_row.get(kolom, 0).
+    # Urutan Fortran: tiap kolom skor bersebelahan di memori sehingga frame dataset
+    # bisa memakai view kolom matriks alih-alih salinan sendiri
+    matrix = np.zeros((len(df), len(SCORE_COLUMNS)), dtype=np.int8 if fits_int8 else np.float32, order='F')
+    for col, values in zip(present, columns):
+        matrix[:, SCORE_COLUMN_INDEX[col]] = values
+    return matrix
+
+def row_scores(data_row):
+    """Return one employee's 30 scores in matrix column order from a row or dict"""
+    return np.array([data_row.get(col, 0) for col in SCORE_COLUMNS])
+
+def compute_filter_index(df_processed):
+    """Precompute dropdown options and row positions for every Level x Wilayah filter combination"""
+    all_positions = np.arange(len(df_processed))
+    available = [col for col in FILTER_COLUMNS if col in df_processed.columns]
+    
+    options = {
+        col: [FILTER_ALL] + sorted(df_processed[col].dropna().unique().tolist())
+        for col in available
+    }
+    
+    # Kunci selalu (level, wilayah); kolom yang tidak ada selalu bernilai "Semua"
+    positions = {(FILTER_ALL, FILTER_ALL): all_positions}
+    if 'Level' in available:
+        for level, rows in df_processed.groupby('Level', observed=True).indices.items():
+            positions[(level, FILTER_ALL)] = rows
+    if 'Nama Wilayah' in available:
+        for wilayah, rows in df_processed.groupby('Nama Wilayah', observed=True).indices.items():
+            positions[(FILTER_ALL, wilayah)] = rows
+    if len(available) == 2:
+        for key, rows in df_processed.groupby(FILTER_COLUMNS, observed=True).indices.items():
+            positions[key] = rows
+    
+    # Mask boolean per kategori, dipakai untuk menyaring posisi hasil filter Level x Wilayah
+    kategori_masks = {}
+    for col in KATEGORI_COLUMNS:
+        if col in df_processed.columns:
+            values = df_processed[col].to_numpy()
+            options[col] = [FILTER_ALL] + KATEGORI_LEVELS
+            kategori_masks[col] = {kategori: values == kategori for kategori in KATEGORI_LEVELS}
+    
+    return {'options': options, 'positions': positions, 'kategori_masks': kategori_masks}
+
+def filter_positions(filter_index, level=FILTER_ALL, wilayah=FILTER_ALL,
+                     kategori_m=FILTER_ALL, kategori_t=FILTER_ALL):
+    """Return row positions for the selected filter (empty when the combination has no rows)"""
+    positions = filter_index['positions'].get((level, wilayah), np.array([], dtype=np.intp))
+    for col, kategori in (('cat_M', kategori_m), ('cat_T', kategori_t)):
+        if kategori != FILTER_ALL and col in filter_index['kategori_masks']:
+            positions = positions[filter_index['kategori_masks'][col][kategori][positions]]
+    return positions
+
+# Pilihan jumlah baris per halaman tabel (paging dan pengurutan dilakukan di server)
+TABLE_PAGE_SIZES = [10, 25, 50, 100]
+TABLE_DEFAULT_ORDER = "(Urutan data)"
+# Kolom tabel data beserta nama tampilannya (dipakai juga oleh tampilan perbandingan periode)
+TABLE_DISPLAY_COLUMNS = ['Nama Pegawai', 'Nama Wilayah', 'Jabatan',
+                         'M_Total', 'percent_Manajerial', 'cat_M', 'T_Total', 'percent_T', 'cat_T']
+TABLE_COLUMN_RENAME = {
+    'Nama Pegawai': 'Nama',
+    'Nama Wilayah': 'Wilayah',
+    'Jabatan': 'Jabatan',
+    'M_Total': 'Nilai Manajerial',
+    'percent_Manajerial': 'Persentase Manajerial (%)',
+    'cat_M': 'Kategori Manajerial',
+    'T_Total': 'Nilai Teknis',
+    'percent_T': 'Persentase Teknis (%)',
+    'cat_T': 'Kategori Teknis',
+}
+
+def table_column_config(columns):
+    """Column config for the data table: float32 percentages shown with two decimals"""
+    return {
+        TABLE_COLUMN_RENAME[col]: st.column_config.NumberColumn(format="%.2f")
+        for col in ('percent_Manajerial', 'percent_T') if col in columns
+    }
+
+def sort_positions(sort_index, df_processed, positions, column, ascending=True):
+    """Order filter positions by a column using its cached global argsort"""
+    key = (column, ascending)
+    if key not in sort_index:
+        # Urutan global satu kolom dihitung sekali per data; nilai kosong selalu di akhir
+        order = df_processed[column].reset_index(drop=True).sort_values(
+            ascending=ascending, kind='stable', na_position='last'
+        ).index.to_numpy()
+        ranks = np.empty(len(order), dtype=np.intp)
+        ranks[order] = np.arange(len(order))
+        sort_index[key] = (freeze_part(order), freeze_part(ranks))
+    
+    order, ranks = sort_index[key]
+    if len(positions) == len(order):
+        # Filter "Semua": urutan global bisa dipakai langsung
+        return order
+    return positions[np.argsort(ranks[positions], kind='stable')]
+
+# Dimensi dan kolom yang diringkas dalam kubus statistik tampilan tabel
+CUBE_DIMENSIONS = FILTER_COLUMNS + KATEGORI_COLUMNS
+CUBE_VALUE_COLUMNS = ['M_Total', 'T_Total']
+
+def _finalize_cube_moments(moments):
+    """Derive mean and sample std from count/sum/sum-of-squares moments"""
+    cube = moments.copy()
+    count_columns = ['Jumlah'] + [f'{col}_count' for col in CUBE_VALUE_COLUMNS]
+    cube[count_columns] = cube[count_columns].astype('int64')
+    for col in CUBE_VALUE_COLUMNS:
+        n = cube[f'{col}_count']
+        total = cube[f'{col}_sum']
+        cube[f'{col}_mean'] = total / n.where(n > 0)
+        variance = (cube[f'{col}_sumsq'] - total * total / n.where(n > 0)) / (n - 1).where(n > 1)
+        cube[f'{col}_std'] = np.sqrt(variance.clip(lower=0))
+    return cube
+
+def compute_stats_cube(df_processed):
+    """Aggregate count/mean/min/max/std of M_Total and T_Total for every Level x Wilayah x kategori slice"""
+    work = pd.DataFrame(index=df_processed.index)
+    for col in CUBE_DIMENSIONS:
+        # Kolom filter yang tidak ada diperlakukan sebagai satu nilai "Semua"
+        work[col] = df_processed[col].astype(object) if col in df_processed.columns else FILTER_ALL
+    for col in CUBE_VALUE_COLUMNS:
+        values = df_processed[col].to_numpy(dtype=float)
+        work[col] = values
+        work[f'{col}_sq'] = values * values
+    
+    # Satu agregasi berkelompok pada sel terkecil; baris dengan dimensi kosong
+    # tetap disertakan agar ikut terhitung pada ringkasan "Semua"
+    aggregations = {'Jumlah': (CUBE_VALUE_COLUMNS[0], 'size')}
+    for col in CUBE_VALUE_COLUMNS:
+        aggregations[f'{col}_count'] = (col, 'count')
+        aggregations[f'{col}_sum'] = (col, 'sum')
+        aggregations[f'{col}_sumsq'] = (f'{col}_sq', 'sum')
+        aggregations[f'{col}_min'] = (col, 'min')
+        aggregations[f'{col}_max'] = (col, 'max')
+    cells = work.groupby(CUBE_DIMENSIONS, dropna=False).agg(**aggregations)
+    
+    return _rollup_stats_cube(cells)
+
+def _moment_rollup(columns):
+    """Return the groupby aggregation that combines moment columns (min/max, otherwise sum)"""
+    return {column: ('min' if column.endswith('_min') else 'max' if column.endswith('_max') else 'sum')
+            for column in columns}
+
+def _rollup_stats_cube(cells):
+    """Roll finest-grain moment cells up to every combination of "Semua" wildcards"""
+    rollup = _moment_rollup(cells.columns)
+    
+    slices = []
+    for kept in product([True, False], repeat=len(CUBE_DIMENSIONS)):
+        kept_dims = [dim for dim, keep in zip(CUBE_DIMENSIONS, kept) if keep]
+        if len(kept_dims) == len(CUBE_DIMENSIONS):
+            slices.append(cells)
+            continue
+        
+        if kept_dims:
+            grouped = cells.groupby(level=kept_dims, dropna=False).agg(rollup)
+            keys = grouped.index.to_frame(index=False)
+        else:
+            grouped = cells.agg(rollup).to_frame().T
+            keys = pd.DataFrame(index=range(1))
+        for dim in CUBE_DIMENSIONS:
+            if dim not in kept_dims:
+                keys[dim] = FILTER_ALL
+        grouped.index = pd.MultiIndex.from_frame(keys[CUBE_DIMENSIONS])
+        slices.append(grouped)
+    
+    moments = pd.concat(slices)
+    # Irisan dengan kunci kosong (NaN) tidak bisa dipilih di filter
+    moments = moments[moments.index.to_frame().notna().all(axis=1).to_numpy()]
+    moments = moments[~moments.index.duplicated(keep='last')]
+    return _finalize_cube_moments(moments)
+
+def merge_stats_cubes(stats_cube, delta_cube):
+    """Combine two cubes through their additive moments (count/sum/sumsq, min/max)"""
+    moment_columns = ['Jumlah'] + [f'{col}_{stat}' for col in CUBE_VALUE_COLUMNS
+                                   for stat in ('count', 'sum', 'sumsq', 'min', 'max')]
+    combined = pd.concat([stats_cube[moment_columns], delta_cube[moment_columns]])
+    merged = combined.groupby(level=list(range(len(CUBE_DIMENSIONS))), sort=False).agg(_moment_rollup(moment_columns))
+    return _finalize_cube_moments(merged)
+
+def get_cube_stats(stats_cube, level=FILTER_ALL, wilayah=FILTER_ALL,
+                   kategori_m=FILTER_ALL, kategori_t=FILTER_ALL):
+    """Return the cube row for a filter selection, or None when it has no rows"""
+    try:
+        row = stats_cube.loc[(level, wilayah, kategori_m, kategori_t)]
+    except KeyError:
+        return None
+    return row if row['Jumlah'] > 0 else None
+
+def export_stats_cube(stats_cube):
+    """Return the cube as a flat table for other dashboards"""
+    columns = ['Jumlah'] + [
+        f'{col}_{stat}' for col in CUBE_VALUE_COLUMNS
+        for stat in ('mean', 'min', 'max', 'std', 'count', 'sum', 'sumsq')
+    ]
+    return stats_cube[columns].reset_index()
+
+def export_stats_cube_csv(stats_cube):
+    """Return the exported cube as UTF-8 CSV bytes for download"""
+    return export_stats_cube(stats_cube).to_csv(index=False).encode('utf-8')
+
+def compute_nip_index(df):
+    """Build exact-match dict and sorted prefix array for NIP lookups"""
+    nips = df['NIP'].astype(str).str.strip().tolist()
+    
+    positions = {}
+    for pos, nip in enumerate(nips):
+        positions.setdefault(nip, []).append(pos)
+    
+    return {
+        'positions': positions,
+        'sorted_nips': sorted(positions),
+        'duplicates': {nip: len(rows) for nip, rows in positions.items() if len(rows) > 1}
+    }
+
+def find_nip_prefix(nip_index, prefix, limit=None):
+    """Return NIPs starting with prefix using bisect on the sorted array"""
+    sorted_nips = nip_index['sorted_nips']
+    results = []
+    i = bisect_left(sorted_nips, prefix)
+    while i < len(sorted_nips) and sorted_nips[i].startswith(prefix):
+        results.append(sorted_nips[i])
+        if limit is not None and len(results) >= limit:
+            break
+        i += 1
+    return results
+
+def lookup_nip(nip_index, nip_input):
+    """Return (matched NIP, row positions) for exact match, falling back to prefix match"""
+    nip_input = nip_input.strip()
+    positions = nip_index['positions'].get(nip_input)
+    if positions:
+        return nip_input, positions
+    
+    prefix_matches = find_nip_prefix(nip_index, nip_input, limit=1)
+    if prefix_matches:
+        return prefix_matches[0], nip_index['positions'][prefix_matches[0]]
+    return None, []
+
+# Kelompok pembanding persentil (kolom -> label tampilan) dan nilai yang diperingkat
+PEER_GROUP_COLUMNS = {'Level': 'Level', 'Nama Wilayah': 'Wilayah'}
+PEER_VALUE_COLUMNS = MANAJERIAL_CODES + TEKNIS_CODES + ['M_Total', 'T_Total']
+
+def compute_peer_index(df_processed):
+    """Sort every competency total within each Level and Wilayah cohort once for searchsorted lookups"""
+    columns = [col for col in PEER_VALUE_COLUMNS if col in df_processed.columns]
+    values = df_processed[columns].to_numpy()
+    if values.dtype.kind not in 'iu':
+        values = values.astype(np.float32)
+    
+    cohorts = {}
+    for group_col in PEER_GROUP_COLUMNS:
+        if group_col not in df_processed.columns:
+            continue
+        for group, rows in df_processed.groupby(group_col, observed=True).indices.items():
+            # Satu baris terurut per kolom nilai; NaN terurut di akhir dan tidak ikut dihitung
+            sorted_values = np.sort(values[rows].T, axis=1)
+            if sorted_values.dtype.kind == 'f':
+                counts = (~np.isnan(sorted_values)).sum(axis=1)
+            else:
+                counts = np.full(len(columns), len(rows))
+            cohorts[(group_col, group)] = (sorted_values, counts)
+    return {'columns': columns, 'cohorts': cohorts}
+
+def peer_percentiles(peer_index, data_row):
+    """Percentile rank (share below plus half the ties) of each total within the employee's cohorts"""
+    result = {}
+    for group_col in PEER_GROUP_COLUMNS:
+        cohort = peer_index['cohorts'].get((group_col, data_row.get(group_col)))
+        if cohort is None:
+            continue
+        sorted_values, counts = cohort
+        percentiles = {}
+        for i, col in enumerate(peer_index['columns']):
+            value = data_row.get(col)
+            if pd.isna(value) or not counts[i]:
+                percentiles[col] = np.nan
+                continue
+            column = sorted_values[i, :counts[i]]
+            below = np.searchsorted(column, value, side='left')
+            ties = np.searchsorted(column, value, side='right') - below
+            percentiles[col] = (below + ties / 2) / counts[i] * 100
+        result[group_col] = {'group': data_row.get(group_col), 'size': sorted_values.shape[1], 'percentiles': percentiles}
+    return result
+
+def merge_nip_index(nip_index, delta_index, offset):
+    """Add a delta's NIP index (positions shifted by offset) without rebuilding the existing one"""
+    positions = dict(nip_index['positions'])
+    duplicates = dict(nip_index['duplicates'])
+    for nip, rows in delta_index['positions'].items():
+        merged_rows = positions.get(nip, []) + [row + offset for row in rows]
+        positions[nip] = merged_rows
+        if len(merged_rows) > 1:
+            duplicates[nip] = len(merged_rows)
+    
+    # Dua daftar terurut digabung; timsort mengenali keduanya sebagai run
+    new_nips = [nip for nip in delta_index['sorted_nips'] if nip not in nip_index['positions']]
+    return {
+        'positions': positions,
+        'sorted_nips': sorted(nip_index['sorted_nips'] + new_nips),
+        'duplicates': duplicates
+    }
+
+def merge_filter_index(filter_index, delta_index, offset):
+    """Add a delta's filter index (positions shifted by offset) to an existing one"""
+    options = dict(filter_index['options'])
+    for col in FILTER_COLUMNS:
+        if col in options:
+            values = set(options[col][1:]) | set(delta_index['options'].get(col, [FILTER_ALL])[1:])
+            options[col] = [FILTER_ALL] + sorted(values)
+    
+    empty = np.array([], dtype=np.intp)
+    positions = {
+        key: np.concatenate([filter_index['positions'].get(key, empty),
+                             delta_index['positions'].get(key, empty) + offset])
+        for key in filter_index['positions'].keys() | delta_index['positions'].keys()
+    }
+    kategori_masks = {
+        col: {kategori: np.concatenate([mask, delta_index['kategori_masks'][col][kategori]])
+              for kategori, mask in masks.items()}
+        for col, masks in filter_index['kategori_masks'].items()
+    }
+    return {'options': options, 'positions': positions, 'kategori_masks': kategori_masks}
+
+# Bagian turunan dataset dibangun saat pertama dipakai; yang sudah ada digabung
+# secara inkremental saat baris baru ditambahkan (indeks urut dan persentil dibangun ulang saat dipakai)
+DATASET_PART_BUILDERS = {
+    'filter_index': lambda dataset: compute_filter_index(dataset['df_processed']),
+    'nip_index': lambda dataset: compute_nip_index(dataset['df']),
+    'stats_cube': lambda dataset: compute_stats_cube(dataset['df_processed']),
+    'sort_index': lambda dataset: {},
+    'peer_index': lambda dataset: compute_peer_index(dataset['df_processed']),
+    # CSV unduhan dibuat sekali per dataset, bukan setiap rerun halaman tabel
+    'stats_cube_csv': lambda dataset: export_stats_cube_csv(dataset_part(dataset, 'stats_cube')),
+}
+DATASET_PART_MERGERS = {
+    'filter_index': merge_filter_index,
+    'nip_index': merge_nip_index,
+    'score_matrix': lambda matrix, delta_matrix, offset: stack_score_matrices(matrix, delta_matrix),
+    'stats_cube': lambda cube, delta_cube, offset: merge_stats_cubes(cube, delta_cube),
+}
+
+def stack_score_matrices(matrix, delta_matrix):
+    """Append delta rows to a score matrix, keeping the column-major layout"""
+    stacked = np.empty((len(matrix) + len(delta_matrix), len(SCORE_COLUMNS)),
+                       dtype=np.result_type(matrix, delta_matrix), order='F')
+    return np.concatenate([matrix, delta_matrix], out=stacked)
+
+def new_dataset(df):
+    """Wrap a raw competency frame with its scored frame; other parts are built on first use"""
+    # Dataset dipakai bersama oleh semua sesi: frame dan bagian turunannya dibuat read-only.
+    # Matriks skor dibangun langsung dan menjadi satu-satunya salinan skor; kolom skor
+    # kedua frame hanyalah view kolom matriks tersebut
+    score_matrix = freeze_part(compute_score_matrix(df))
+    df = freeze_frame(df, score_matrix)
+    return {
+        'df': df,
+        'df_processed': freeze_frame(compute_competency_scores(df), score_matrix),
+        'parts': {'score_matrix': score_matrix},
+        # RLock: builder suatu bagian boleh memanggil dataset_part untuk bagian lain
+        'lock': threading.RLock(),
+    }
+
+def dataset_part(dataset, name):
+    """Return a derived part (indexes, score matrix, stats cube) of a dataset, building it once"""
+    parts = dataset['parts']
+    if name not in parts:
+        with dataset['lock']:
+            if name not in parts:
+                parts[name] = freeze_part(DATASET_PART_BUILDERS[name](dataset))
+    return parts[name]
+
+def _append_frame(base, delta):
+    """Append delta rows to base, unioning the categories of categorical columns"""
+    merged = pd.concat([base, delta], ignore_index=True)
+    for col in base.columns:
+        if isinstance(base[col].dtype, pd.CategoricalDtype) and not isinstance(merged[col].dtype, pd.CategoricalDtype):
+            merged[col] = pd.api.types.union_categoricals(
+                [base[col], delta[col].astype('category')], ignore_order=True
+            )
+    return merged
+
+def merge_dataset(dataset, delta_df):
+    """Return a new dataset with delta rows appended and already-built parts merged"""
+    delta = new_dataset(delta_df)
+    offset = len(dataset['df'])
+    parts = {
+        name: freeze_part(DATASET_PART_MERGERS[name](part, dataset_part(delta, name), offset))
+        for name, part in list(dataset['parts'].items()) if name in DATASET_PART_MERGERS
+    }
+    # Salinan skor hasil concat dilepas; frame gabungan kembali memakai view matriks gabungan
+    score_matrix = parts['score_matrix']
+    return {
+        'df': freeze_frame(_append_frame(dataset['df'], delta['df']), score_matrix),
+        'df_processed': freeze_frame(_append_frame(dataset['df_processed'], delta['df_processed']), score_matrix),
+        'parts': parts,
+        'lock': threading.RLock(),
+    }
+
+# Ukuran blok baca saat menghitung hash berkas sumber
+HASH_CHUNK_SIZE = 1 << 20
+
+def _hash_file(path, boundary=None):
+    """Return (SHA-1 of the first boundary bytes or None, SHA-1 of the whole file, size read)"""
+    hasher = hashlib.sha1()
+    prefix_digest = None
+    size = 0
+    with open(path, 'rb') as f:
+        if boundary is not None:
+            while size < boundary:
+                chunk = f.read(min(HASH_CHUNK_SIZE, boundary - size))
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                size += len(chunk)
+            prefix_digest = hasher.hexdigest()
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+            size += len(chunk)
+    return prefix_digest, hasher.hexdigest(), size
+
+def _appended_rows_csv(path, start, end):
+    """Return the header line plus the bytes appended between start and end as CSV content"""
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(start)
+        tail = f.read(end - start)
+        f.seek(start - 1)
+        boundary_is_newline = f.read(1) == b'\n'
+    return header + tail if boundary_is_newline else None
+
+def new_source_store():
+    """Create a holder for one source file's dataset and content signature"""
+    return {'lock': threading.Lock(), 'current': (None, None), 'last_refresh': None}
+
+@st.cache_resource
+def get_competency_store():
+    """Process-wide holder of the default competency dataset, shared by all sessions"""
+    return new_source_store()
+
+def refresh_competency_dataset(store, path=COMPETENCY_CSV_PATH):
+    """Return the dataset for path, ingesting only appended rows when the file just grew"""
+    stat = os.stat(path)
+    source, dataset = store['current']
+    if source is not None and (stat.st_mtime_ns, stat.st_size) == (source['mtime_ns'], source['size']):
+        return dataset
+    
+    with store['lock']:
+        # Sesi lain mungkin sudah memuat ulang selama menunggu lock
+        source, dataset = store['current']
+        if source is not None and (stat.st_mtime_ns, stat.st_size) == (source['mtime_ns'], source['size']):
+            return dataset
+        
+        start = time.perf_counter()
+        boundary = source['size'] if source is not None and stat.st_size > source['size'] else None
+        prefix_sha1, sha1, size = _hash_file(path, boundary)
+        delta_csv = None
+        if boundary is not None and prefix_sha1 == source['sha1']:
+            # Isi lama tidak berubah: cukup parsing baris yang ditambahkan di akhir berkas
+            delta_csv = _appended_rows_csv(path, boundary, size)
+        
+        if source is not None and sha1 == source['sha1']:
+            mode, rows = "tidak berubah", 0
+        elif delta_csv is not None:
+            delta_df = _read_competency_csv(delta_csv)
+            dataset = merge_dataset(dataset, delta_df)
+            mode, rows = "delta", len(delta_df)
+            try:
+                # Perbarui sidecar agar proses baru tidak perlu parsing penuh
+                _write_columnar_sidecar(dataset['df'], path)
+            except Exception:
+                pass
+        else:
+            dataset = new_dataset(read_with_columnar_cache(path, _read_competency_csv))
+            mode, rows = "penuh", len(dataset['df'])
+        
+        store['current'] = ({'mtime_ns': stat.st_mtime_ns, 'size': size, 'sha1': sha1}, dataset)
+        store['last_refresh'] = {
+            'mode': mode, 'rows': rows, 'seconds': time.perf_counter() - start,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        return dataset
+
+def load_competency_dataset():
+    """Load the default competency dataset, refreshing it when the CSV changed"""
+    try:
+        return refresh_competency_dataset(get_competency_store())
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return None
+
+# Penyimpanan hasil asesmen multi-periode, satu berkas Feather per periode dan Nama Wilayah:
+#   data_kompetensi/periode=2024/wilayah=Bandar%20Lampung/part.feather
+PARTITION_STORE_DIR = "data_kompetensi"
+PARTITION_FILE_NAME = "part.feather"
+# Nilai partisi untuk baris tanpa Nama Wilayah
+PARTITION_EMPTY_VALUE = "__kosong__"
+PERIOD_CACHE_MAX_ENTRIES = 4
+
+def _partition_dir_name(key, value):
+    """Return a hive-style key=value directory name with the value percent-encoded"""
+    return f"{key}={urllib.parse.quote(str(value), safe='')}"
+
+def _parse_partition_dir_name(name, key):
+    """Return the decoded value of a key=value directory name, or None for other entries"""
+    prefix = f"{key}="
+    if not name.startswith(prefix):
+        return None
+    return urllib.parse.unquote(name[len(prefix):])
+
+def write_period_partitions(df, periode, store_dir=PARTITION_STORE_DIR):
+    """Store one period's competency data as one Feather file per Nama Wilayah, replacing that period"""
+    periode = str(periode).strip()
+    if not periode:
+        raise ValueError("Periode tidak boleh kosong")
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Penyimpanan multi-periode membutuhkan paket pyarrow")
+    feather = lazy_import('pyarrow.feather')
+    
+    if 'Nama Wilayah' in df.columns:
+        wilayah = df['Nama Wilayah'].astype(object).fillna(PARTITION_EMPTY_VALUE).to_numpy()
+    else:
+        wilayah = np.full(len(df), PARTITION_EMPTY_VALUE, dtype=object)
+    
+    # Partisi ditulis ke direktori sementara lalu ditukar sekaligus agar pembaca
+    # tidak pernah melihat periode yang setengah tertulis
+    os.makedirs(store_dir, exist_ok=True)
+    period_dir = os.path.join(store_dir, _partition_dir_name('periode', periode))
+    staging_dir = os.path.join(store_dir, f".baru-{uuid.uuid4().hex}")
+    old_dir = os.path.join(store_dir, f".lama-{uuid.uuid4().hex}")
+    try:
+        for value, rows in df.groupby(wilayah, sort=True).indices.items():
+            partition_dir = os.path.join(staging_dir, _partition_dir_name('wilayah', value))
+            os.makedirs(partition_dir)
+            feather.write_feather(df.take(rows).reset_index(drop=True),
+                                  os.path.join(partition_dir, PARTITION_FILE_NAME), compression='uncompressed')
+        os.makedirs(staging_dir, exist_ok=True)
+        if os.path.exists(period_dir):
+            os.replace(period_dir, old_dir)
+        os.replace(staging_dir, period_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    return len(set(wilayah))
+
+def list_partitions(store_dir=PARTITION_STORE_DIR):
+    """Return sorted (periode, wilayah, path, mtime_ns, size) tuples for every stored partition"""
+    partitions = []
+    if not os.path.isdir(store_dir):
+        return partitions
+    for period_name in os.listdir(store_dir):
+        periode = _parse_partition_dir_name(period_name, 'periode')
+        if periode is None:
+            continue
+        try:
+            wilayah_names = os.listdir(os.path.join(store_dir, period_name))
+        except OSError:
+            # Periode sedang ditulis ulang oleh proses lain
+            continue
+        for wilayah_name in wilayah_names:
+            wilayah = _parse_partition_dir_name(wilayah_name, 'wilayah')
+            path = os.path.join(store_dir, period_name, wilayah_name, PARTITION_FILE_NAME)
+            signature = source_signature(path)
+            if wilayah is not None and signature is not None:
+                partitions.append((periode, wilayah, path) + signature)
+    return sorted(partitions)
+
+def prune_partitions(partitions, periods=None, wilayah=FILTER_ALL):
+    """Keep only the partitions that can hold rows for the selected periods and wilayah"""
+    return tuple(
+        partition for partition in partitions
+        if (periods is None or partition[0] in periods) and wilayah in (FILTER_ALL, partition[1])
+    )
+
+def read_partitions(partitions, level=FILTER_ALL, columns=None):
+    """Read partitions memory-mapped, filtering Level in Arrow before converting once to pandas"""
+    pa = lazy_import('pyarrow')
+    pc = lazy_import('pyarrow.compute')
+    feather = lazy_import('pyarrow.feather')
+    
+    tables = []
+    for partition in partitions:
+        table = feather.read_table(partition[2], columns=columns, memory_map=True)
+        if level != FILTER_ALL and 'Level' in table.column_names:
+            table = table.filter(pc.equal(table['Level'].cast(pa.string()), level))
+        tables.append(table)
+    if not tables:
+        return pd.DataFrame({'Periode': pd.Categorical([])})
+    
+    # Partisi dari CSV berbeda bisa berbeda tipe (mis. skor int8 vs float32); tipe diseragamkan
+    df = pa.concat_tables(tables, promote_options='permissive').to_pandas()
+    periods = [partition[0] for partition in partitions]
+    df['Periode'] = pd.Categorical(np.repeat(periods, [table.num_rows for table in tables]),
+                                   categories=sorted(set(periods)))
+    return df
+
+@st.cache_resource(max_entries=PERIOD_CACHE_MAX_ENTRIES, show_spinner="Membaca partisi periode...")
+def load_period_data(partitions, level=FILTER_ALL):
+    """Read and score the selected partitions; their signatures in the key invalidate re-stored periods"""
+    return freeze_frame(compute_competency_scores(read_partitions(partitions, level)))
+
+@st.cache_data(max_entries=PERIOD_CACHE_MAX_ENTRIES)
+def period_level_options(partitions):
+    """Return the Level dropdown options of the selected partitions, reading only that column"""
+    levels = read_partitions(partitions, columns=['Level'])['Level'] if partitions else pd.Series([], dtype=object)
+    return [FILTER_ALL] + sorted(levels.dropna().unique().tolist())
+
+def compare_periods(df_processed):
+    """Summarise every period: row count, mean totals and percentages, and share of Optimal"""
+    grouped = df_processed.groupby('Periode', observed=True)
+    summary = grouped.agg(
+        Jumlah=('M_Total', 'size'),
+        rata_manajerial=('M_Total', 'mean'),
+        rata_persen_manajerial=('percent_Manajerial', 'mean'),
+        rata_teknis=('T_Total', 'mean'),
+        rata_persen_teknis=('percent_T', 'mean'),
+    ).rename(columns={
+        'rata_manajerial': 'Rata-rata Manajerial',
+        'rata_persen_manajerial': 'Rata-rata Persentase Manajerial (%)',
+        'rata_teknis': 'Rata-rata Teknis',
+        'rata_persen_teknis': 'Rata-rata Persentase Teknis (%)',
+    })
+    for col, label in (('cat_M', 'Optimal Manajerial (%)'), ('cat_T', 'Optimal Teknis (%)')):
+        summary[label] = (df_processed[col] == KATEGORI_LEVELS[0]).groupby(
+            df_processed['Periode'], observed=True).mean() * 100
+    return summary.reset_index()
+
+def clean_text_for_wordcloud(text, stopword_tokens=None):
     """Clean and process text for wordcloud"""
     if pd.isna(text) or text == '':
         return ""
     
-    # Convert to lowercase
-    text = str(text).lower()
+    # Convert to lowercase, remove special characters and numbers
+    text = _NON_ALPHA_PATTERN.sub('', str(text).lower())
     
-    # Remove special characters and numbers
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    # Remove stopwords (sekaligus merapikan spasi berlebih)
+    if stopword_tokens is None:
+        stopword_tokens = get_stopword_tokens()
+    return ' '.join([word for word in text.split() if word not in stopword_tokens])
+
+def clean_text_series(texts):
+    """Clean a whole Series of answers with vectorized string kernels"""
+    texts = pd.Series(texts)
+    
+    # Jawaban identik cukup dibersihkan sekali (NaN mendapat kode -1)
+    codes, uniques = pd.factorize(texts)
+    if len(uniques) == 0:
+        return pd.Series('', index=texts.index, dtype=object)
+    if not PYARROW_AVAILABLE:
+        stopword_tokens = get_stopword_tokens()
+        cleaned_uniques = [clean_text_for_wordcloud(text, stopword_tokens) for text in uniques]
+        return pd.Series(np.array(cleaned_uniques + [''], dtype=object)[codes], index=texts.index)
+    
+    pa = lazy_import('pyarrow')
+    pc = lazy_import('pyarrow.compute')
+    lines = pd.Series(uniques).astype(str).astype(pd.ArrowDtype(pa.string()))
+    lines = lines.str.lower().str.replace(_NON_ALPHA_LOWER_PATTERN, '', regex=True)
+    
+    # Indeks token: semua kata dalam satu array datar plus posisi jawaban asalnya
+    words = pc.utf8_split_whitespace(pa.array(lines))
+    tokens = words.flatten()
+    keep = pc.and_(
+        pc.greater(pc.utf8_length(tokens), 0),
+        pc.invert(pc.is_in(tokens, value_set=pa.array(list(get_stopword_tokens()), type=pa.string())))
+    )
+    parents = pc.list_parent_indices(words).to_numpy()
+    counts = np.bincount(parents[keep.to_numpy(zero_copy_only=False)], minlength=len(uniques))
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+    
+    # Token tersisa digabung kembali per jawaban; slot terakhir berisi '' untuk jawaban kosong (kode -1)
+    cleaned = pc.binary_join(pa.ListArray.from_arrays(offsets, tokens.filter(keep)), ' ')
+    cleaned_uniques = np.append(cleaned.to_numpy(zero_copy_only=False), '')
+    return pd.Series(cleaned_uniques[codes], index=texts.index)
+
+# Parameter render wordcloud (ikut menjadi bagian kunci cache)
+WORDCLOUD_PARAMS = {
+    'width': 800,
+    'height': 400,
+    'background_color': 'white',
+    'colormap': 'viridis',
+    'max_words': 100,
+    'relative_scaling': 0.5
+}
+WORDCLOUD_FIGSIZE = (12, 6)
+WORDCLOUD_CACHE_SIZE = 64
+
+def _plot_wordcloud(wordcloud, title):
+    """Draw a generated WordCloud into a matplotlib figure"""
+    plt = lazy_import('matplotlib.pyplot')
+    fig, ax = plt.subplots(figsize=WORDCLOUD_FIGSIZE)
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+    return fig
+
+def create_wordcloud_from_frequencies(frequencies, title="WordCloud"):
+    """Create wordcloud from precomputed token frequencies"""
+    if not frequencies:
+        return None
     
-    # Remove extra whitespace
-    text = ' '.join(text.split())
+    WordCloud = lazy_import('wordcloud').WordCloud
+    wordcloud = WordCloud(**WORDCLOUD_PARAMS).generate_from_frequencies(frequencies)
+    return _plot_wordcloud(wordcloud, title)
+
+class LRUCache:
+    """Thread-safe bounded cache with least-recently-used eviction and hit/miss counters"""
+    
+    _MISSING = object()
+    
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_create(self, key, factory):
+        """Return cached value for key, calling factory() and storing the result on a miss"""
+        with self._lock:
+            value = self._data.get(key, self._MISSING)
+            if value is not self._MISSING:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        
+        # Render di luar lock agar sesi lain tidak ikut menunggu
+        value = factory()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+    
+    def info(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._data), 'maxsize': self.maxsize}
+    
+    def clear(self):
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+@st.cache_resource
+def get_wordcloud_cache():
+    """Process-wide LRU cache of rendered wordcloud PNG bytes"""
+    return LRUCache(WORDCLOUD_CACHE_SIZE)
+
+def _fingerprint_frequencies(frequencies):
+    """Hash token frequencies independent of insertion order"""
+    digest = hashlib.sha1()
+    for token, count in sorted(frequencies.items()):
+        digest.update(f"{token}\x1f{count}\x1e".encode('utf-8'))
+    return digest.hexdigest()
+
+def render_wordcloud_image(frequencies, title, group):
+    """Return wordcloud PNG bytes (or None when there are no tokens), cached per group and frequencies"""
+    render_key = (tuple(sorted(WORDCLOUD_PARAMS.items())), WORDCLOUD_FIGSIZE, title)
+    key = (group, _fingerprint_frequencies(frequencies), render_key)
+    
+    def render():
+        fig = create_wordcloud_from_frequencies(frequencies, title)
+        if fig is None:
+            return None
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight')
+        lazy_import('matplotlib.pyplot').close(fig)
+        return buffer.getvalue()
     
-    # Remove stopwords
-    if SASTRAWI_AVAILABLE:
-        text = stopword_remover.remove(text)
+    return get_wordcloud_cache().get_or_create(key, render)
+
+def display_wordcloud(frequencies, title, group):
+    """Display cached wordcloud image or a warning when text is insufficient"""
+    with timing_span('wordcloud'):
+        image = render_wordcloud_image(frequencies, title, group)
+    if image:
+        with timing_span('st.image'):
+            st.image(image, use_container_width=True)
     else:
-        words = text.split()
-        text = ' '.join([word for word in words if word not in INDONESIAN_STOPWORDS])
-    
-    return text
+        st.warning("⚠️ Tidak ada teks yang cukup untuk membuat wordcloud")
 
-def create_wordcloud(text_data, title="WordCloud"):
-    """Create wordcloud from text data"""
-    # Combine all text
-    all_text = ' '.join([clean_text_for_wordcloud(text) for text in text_data if pd.notna(text)])
+# Kolom teks alasan yang dianalisis untuk setiap kolom pengelompokan
+WORDCLOUD_TEXT_GROUPS = {
+    'Q01_JALUR PENGEMBANGAN KARIR': 'Alasan Pilihan Jalur Karir',
+    'Q03_Pilih 3 Satuan Kerja Tujuan': 'Q06_Alasan Pilihan Jalur Karir',
+    'Q04_Pilih 3 Satuan Kerja Tujuan': 'Q06_Alasan Pilihan Jalur Karir',
+    'Q05_Pilih 3 Satuan Kerja Tujuan': 'Q06_Alasan Pilihan Jalur Karir',
+}
+
+def token_frequencies(token_index, text_col, positions):
+    """Sum token counts of the given rows into a token -> frequency Counter"""
+    row_tokens = token_index['token_ids'][text_col]
+    arrays = [row_tokens[pos] for pos in positions]
+    if not arrays:
+        return Counter()
+    
+    counts = np.bincount(np.concatenate(arrays), minlength=len(token_index['vocab']))
+    vocab = token_index['vocab']
+    return Counter({vocab[token_id]: int(counts[token_id]) for token_id in np.flatnonzero(counts)})
+
+# Frame pemetaan bersama tidak di-hash setiap rerun; signature sumbernya menjadi kunci cache
+@st.cache_resource(max_entries=2)
+def build_pemetaan_token_index(_df_pemetaan, signature):
+    """Tokenize free-text answers once and precompute token frequencies per group value"""
+    df_pemetaan = _df_pemetaan
+    vocab = []
+    token_to_id = {}
+    token_ids = {}
+    
+    text_cols = sorted({col for col in WORDCLOUD_TEXT_GROUPS.values() if col in df_pemetaan.columns})
+    for text_col in text_cols:
+        rows = []
+        for cleaned in clean_text_series(df_pemetaan[text_col]).tolist():
+            ids = []
+            for token in cleaned.split():
+                if token not in token_to_id:
+                    token_to_id[token] = len(vocab)
+                    vocab.append(token)
+                ids.append(token_to_id[token])
+            rows.append(np.array(ids, dtype=np.int32))
+        token_ids[text_col] = rows
+    
+    token_index = {'vocab': vocab, 'token_ids': token_ids, 'groups': {}}
+    for group_col, text_col in WORDCLOUD_TEXT_GROUPS.items():
+        if group_col not in df_pemetaan.columns or text_col not in token_ids:
+            continue
+        
+        has_text = df_pemetaan[text_col].notna().to_numpy()
+        groups = {}
+        # Urutan nilai mengikuti kemunculan pertama, sama seperti unique()
+        for value, positions in df_pemetaan.groupby(group_col, sort=False).indices.items():
+            groups[value] = {
+                'n_texts': int(has_text[positions].sum()),
+                'frequencies': token_frequencies(token_index, text_col, positions)
+            }
+        token_index['groups'][group_col] = groups
     
-    if not all_text.strip():
+    return token_index
+
+# Backend SQL opsional: tabel kompetensi dan pemetaan dalam satu berkas SQLite yang dibangun
+# dengan `python main.py build-sql` lalu diaktifkan lewat variabel lingkungan
+SQL_BACKEND_ENV = "ASESMEN_SQL_BACKEND"
+SQL_COMPETENCY_TABLE = "kompetensi"
+SQL_PEMETAAN_TABLE = "pemetaan"
+# Kolom NIP yang sudah di-strip sebagai kunci lookup (padanan compute_nip_index)
+SQL_NIP_KEY = "nip_key"
+SQL_INDEXES = {
+    SQL_COMPETENCY_TABLE: [('Level', 'Nama Wilayah'), ('Nama Wilayah',), ('cat_M',), ('cat_T',), (SQL_NIP_KEY,)],
+    SQL_PEMETAAN_TABLE: [(col,) for col in WORDCLOUD_TEXT_GROUPS],
+}
+# Berkas di-memory-map sehingga banyak proses worker berbagi page cache OS yang sama
+SQL_MMAP_SIZE = 1 << 30
+_sql_local = threading.local()
+
+def _sql_name(name):
+    """Quote an identifier for SQLite"""
+    return '"' + name.replace('"', '""') + '"'
+
+def build_sql_backend(df_processed, df_pemetaan, path):
+    """Write the scored competency and pemetaan tables with filter/lookup indexes to a SQLite file"""
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    
+    competency = df_processed.copy()
+    competency[SQL_NIP_KEY] = competency['NIP'].astype(str).str.strip()
+    tables = {SQL_COMPETENCY_TABLE: competency}
+    if df_pemetaan is not None:
+        tables[SQL_PEMETAAN_TABLE] = df_pemetaan
+    
+    conn = sqlite3.connect(tmp_path)
+    try:
+        for table, frame in tables.items():
+            # Kolom kategori ditulis sebagai teks; urutan rowid mengikuti urutan baris sumber
+            frame.astype({col: object for col in frame.columns
+                          if isinstance(frame[col].dtype, pd.CategoricalDtype)}).to_sql(
+                table, conn, index=False, chunksize=50_000)
+            for i, columns in enumerate(SQL_INDEXES[table]):
+                if all(col in frame.columns for col in columns):
+                    conn.execute(f"CREATE INDEX {_sql_name(f'idx_{table}_{i}')} ON {_sql_name(table)} "
+                                 f"({', '.join(_sql_name(col) for col in columns)})")
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    # Penggantian atomik: koneksi lama tetap membaca berkas lama sampai dibuka ulang
+    os.replace(tmp_path, path)
+
+def open_sql_backend(path=None):
+    """Return the SQLite backend named by ASESMEN_SQL_BACKEND as {'path', 'signature'}, or None"""
+    path = path or os.environ.get(SQL_BACKEND_ENV)
+    if not path:
         return None
-    
-    # Create wordcloud
-    wordcloud = WordCloud(
-        width=800, 
-        height=400, 
-        background_color='white',
-        colormap='viridis',
-        max_words=100,
-        relative_scaling=0.5
-    ).generate(all_text)
-    
-    # Create matplotlib figure
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.imshow(wordcloud, interpolation='bilinear')
-    ax.axis('off')
-    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-    
-    return fig
+    signature = source_signature(path)
+    if signature is None:
+        raise FileNotFoundError(f"Berkas backend SQL tidak ditemukan: {path}")
+    return {'path': path, 'signature': signature}
+
+def sql_connection(backend):
+    """Return this thread's read-only connection, reopened when the database file was replaced"""
+    key = (os.path.abspath(backend['path']), backend['signature'])
+    if getattr(_sql_local, 'key', None) != key:
+        if getattr(_sql_local, 'conn', None) is not None:
+            _sql_local.conn.close()
+        conn = sqlite3.connect(f"file:{urllib.parse.quote(key[0])}?mode=ro", uri=True)
+        conn.execute(f"PRAGMA mmap_size={SQL_MMAP_SIZE}")
+        _sql_local.key, _sql_local.conn = key, conn
+    return _sql_local.conn
+
+def sql_query(backend, query, params=()):
+    """Run a read query on the backend and return the result as a DataFrame"""
+    return pd.read_sql_query(query, sql_connection(backend), params=list(params))
+
+def sql_columns(backend, table=SQL_COMPETENCY_TABLE):
+    """Return the column names of a backend table"""
+    return [row[1] for row in sql_connection(backend).execute(f"PRAGMA table_info({_sql_name(table)})")]
+
+def _sql_filter_clause(level=FILTER_ALL, wilayah=FILTER_ALL, kategori_m=FILTER_ALL, kategori_t=FILTER_ALL):
+    """Return the WHERE clause and parameters for a table-view filter selection"""
+    conditions, params = [], []
+    for col, value in (('Level', level), ('Nama Wilayah', wilayah), ('cat_M', kategori_m), ('cat_T', kategori_t)):
+        if value != FILTER_ALL:
+            conditions.append(f"{_sql_name(col)} = ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+@st.cache_data(max_entries=2)
+def sql_filter_options(backend):
+    """Dropdown options of the table view, read from the indexed filter columns"""
+    columns = sql_columns(backend)
+    options = {}
+    for col in FILTER_COLUMNS:
+        if col in columns:
+            values = sql_query(backend, f"SELECT DISTINCT {_sql_name(col)} AS v FROM {SQL_COMPETENCY_TABLE} "
+                                        f"WHERE {_sql_name(col)} IS NOT NULL ORDER BY v")['v']
+            options[col] = [FILTER_ALL] + values.tolist()
+    for col in KATEGORI_COLUMNS:
+        options[col] = [FILTER_ALL] + KATEGORI_LEVELS
+    return options
+
+def sql_count(backend, *selection):
+    """Number of rows matching a filter selection"""
+    where, params = _sql_filter_clause(*selection)
+    return int(sql_connection(backend).execute(
+        f"SELECT COUNT(*) FROM {SQL_COMPETENCY_TABLE}{where}", params).fetchone()[0])
+
+@st.cache_data(max_entries=2)
+def sql_stats_cube(backend):
+    """Aggregate the finest cube cells in SQL and roll them up the same way as compute_stats_cube"""
+    columns = sql_columns(backend)
+    dimensions = [_sql_name(col) if col in columns else f"'{FILTER_ALL}' AS {_sql_name(col)}"
+                  for col in CUBE_DIMENSIONS]
+    aggregations = ['COUNT(*) AS "Jumlah"']
+    for col in CUBE_VALUE_COLUMNS:
+        value = f"CAST({_sql_name(col)} AS REAL)"
+        aggregations += [f"COUNT({value}) AS {col}_count", f"SUM({value}) AS {col}_sum",
+                         f"SUM({value} * {value}) AS {col}_sumsq",
+                         f"MIN({value}) AS {col}_min", f"MAX({value}) AS {col}_max"]
+    cells = sql_query(backend, f"SELECT {', '.join(dimensions)}, {', '.join(aggregations)} "
+                               f"FROM {SQL_COMPETENCY_TABLE} GROUP BY {', '.join(map(str, range(1, len(dimensions) + 1)))}")
+    return _rollup_stats_cube(cells.set_index(CUBE_DIMENSIONS))
+
 
-def create_jalur_jabatan_chart(df_pemetaan):
+@st.cache_data(max_entries=2)
+def sql_stats_cube_csv(backend):
+    """Return the SQL stats cube as download CSV bytes, built once per backend"""
+    return export_stats_cube_csv(sql_stats_cube(backend))
+
+def sql_table_page(backend, selection, columns, order_column=None, ascending=True, limit=25, offset=0):
+    """Return one sorted page of the filtered table; rows without a value sort last like sort_positions"""
+    where, params = _sql_filter_clause(*selection)
+    order = "rowid"
+    if order_column is not None:
+        key = _sql_name(order_column)
+        if order_column in KATEGORI_COLUMNS:
+            # Urutan kategori mengikuti KATEGORI_LEVELS, bukan urutan abjad
+            key = "CASE " + key + " " + " ".join(
+                f"WHEN '{kategori}' THEN {i}" for i, kategori in enumerate(KATEGORI_LEVELS)) + " END"
+        order = f"{key} IS NULL, {key} {'ASC' if ascending else 'DESC'}, rowid"
+    return sql_query(
+        backend,
+        f"SELECT {', '.join(map(_sql_name, columns))} FROM {SQL_COMPETENCY_TABLE}{where} "
+        f"ORDER BY {order} LIMIT ? OFFSET ?",
+        params + [limit, offset]
+    )
+
+def sql_select_rows(backend, *selection):
+    """Return every column of the rows matching a filter selection, in source order"""
+    where, params = _sql_filter_clause(*selection)
+    return sql_query(backend, f"SELECT * FROM {SQL_COMPETENCY_TABLE}{where} ORDER BY rowid", params)
+
+def sql_find_nip_prefix(backend, prefix, limit=None):
+    """Return distinct NIPs starting with prefix, in sorted order, from the NIP index"""
+    key = _sql_name(SQL_NIP_KEY)
+    # Rentang [prefix, prefix + U+10FFFF) memakai indeks, tidak seperti LIKE
+    rows = sql_connection(backend).execute(
+        f"SELECT DISTINCT {key} FROM {SQL_COMPETENCY_TABLE} WHERE {key} >= ? AND {key} < ? ORDER BY {key}"
+        + ("" if limit is None else f" LIMIT {int(limit)}"),
+        [prefix, prefix + '\U0010ffff']).fetchall()
+    return [row[0] for row in rows]
+
+def sql_lookup_nip(backend, nip_input):
+    """Return (matched NIP, matching rows) for exact match, falling back to the first prefix match"""
+    nip_input = nip_input.strip()
+    key = _sql_name(SQL_NIP_KEY)
+    matched_nip = nip_input
+    rows = sql_query(backend, f"SELECT * FROM {SQL_COMPETENCY_TABLE} WHERE {key} = ? ORDER BY rowid", [nip_input])
+    if rows.empty:
+        prefix_matches = sql_find_nip_prefix(backend, nip_input, limit=1)
+        if not prefix_matches:
+            return None, rows.drop(columns=SQL_NIP_KEY)
+        matched_nip = prefix_matches[0]
+        rows = sql_query(backend, f"SELECT * FROM {SQL_COMPETENCY_TABLE} WHERE {key} = ? ORDER BY rowid", [matched_nip])
+    return matched_nip, rows.drop(columns=SQL_NIP_KEY)
+
+@st.cache_data(max_entries=2)
+def sql_duplicate_nip_count(backend):
+    """Number of NIPs that occur more than once"""
+    key = _sql_name(SQL_NIP_KEY)
+    return int(sql_connection(backend).execute(
+        f"SELECT COUNT(*) FROM (SELECT {key} FROM {SQL_COMPETENCY_TABLE} GROUP BY {key} HAVING COUNT(*) > 1)"
+    ).fetchone()[0])
+
+def sql_peer_percentiles(backend, data_row):
+    """Same result as peer_percentiles, counted in SQL over the employee's cohort rows"""
+    columns = [col for col in PEER_VALUE_COLUMNS if col in sql_columns(backend)]
+    result = {}
+    for group_col in PEER_GROUP_COLUMNS:
+        group = data_row.get(group_col)
+        if group is None or pd.isna(group) or group_col not in sql_columns(backend):
+            continue
+        aggregates, params = ["COUNT(*)"], []
+        for col in columns:
+            value = data_row.get(col)
+            value = None if pd.isna(value) else float(value)
+            aggregates += [f"SUM({_sql_name(col)} < ?)", f"SUM({_sql_name(col)} = ?)", f"COUNT({_sql_name(col)})"]
+            params += [value, value]
+        row = sql_connection(backend).execute(
+            f"SELECT {', '.join(aggregates)} FROM {SQL_COMPETENCY_TABLE} WHERE {_sql_name(group_col)} = ?",
+            params + [group]).fetchone()
+        percentiles = {}
+        for i, col in enumerate(columns):
+            below, ties, count = row[1 + 3 * i:4 + 3 * i]
+            percentiles[col] = np.nan if below is None or not count else (below + ties / 2) / count * 100
+        result[group_col] = {'group': group, 'size': row[0], 'percentiles': percentiles}
+    return result
+
+def sql_value_counts(backend, column, table=SQL_PEMETAAN_TABLE, limit=None):
+    """value_counts() of one column computed in SQL, most frequent first"""
+    col = _sql_name(column)
+    counts = sql_query(
+        backend,
+        f"SELECT {col} AS value, COUNT(*) AS n FROM {_sql_name(table)} WHERE {col} IS NOT NULL "
+        f"GROUP BY {col} ORDER BY n DESC" + ("" if limit is None else f" LIMIT {int(limit)}")
+    )
+    return pd.Series(counts['n'].to_numpy(), index=counts['value'].to_numpy(), name='count')
+
+@st.cache_resource(max_entries=2)
+def sql_pemetaan_frame(backend):
+    """Process-wide frame of only the pemetaan columns the token index needs, read from the backend"""
+    tables = {row[0] for row in sql_connection(backend).execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if SQL_PEMETAAN_TABLE not in tables:
+        return None
+    columns = [col for col in sql_columns(backend, SQL_PEMETAAN_TABLE)
+               if col in WORDCLOUD_TEXT_GROUPS or col in WORDCLOUD_TEXT_GROUPS.values()]
+    return freeze_frame(sql_query(
+        backend, f"SELECT {', '.join(map(_sql_name, columns))} FROM {SQL_PEMETAAN_TABLE} ORDER BY rowid"))
+
+def create_jalur_jabatan_chart(df_pemetaan, jalur_counts=None):
     """Create bar chart for jalur jabatan comparison"""
-    # Count jalur jabatan
-    jalur_counts = df_pemetaan['Q01_JALUR PENGEMBANGAN KARIR'].value_counts()
+    # Count jalur jabatan (bisa sudah dihitung oleh backend SQL)
+    if jalur_counts is None:
+        jalur_counts = df_pemetaan['Q01_JALUR PENGEMBANGAN KARIR'].value_counts()
     
     # Create bar chart
+    px = lazy_import('plotly.express')
     fig = px.bar(
         x=jalur_counts.index,
         y=jalur_counts.values,
@@ -325,12 +1805,15 @@ def create_jalur_jabatan_chart(df_pemetaan):
     
     return fig
 
-def create_satuan_kerja_chart(df_pemetaan, pilihan_col):
+def create_satuan_kerja_chart(df_pemetaan, pilihan_col, satuan_counts=None):
     """Create bar chart for satuan kerja tujuan"""
-    # Count satuan kerja for selected pilihan
-    satuan_counts = df_pemetaan[pilihan_col].value_counts().head(14)  # Top 14
+    # Count satuan kerja for selected pilihan (bisa sudah dihitung oleh backend SQL)
+    if satuan_counts is None:
+        satuan_counts = df_pemetaan[pilihan_col].value_counts()
+    satuan_counts = satuan_counts.head(14)  # Top 14
     
     # Create bar chart
+    px = lazy_import('plotly.express')
     fig = px.bar(
         x=satuan_counts.values,
         y=satuan_counts.index,
@@ -351,33 +1834,25 @@ def create_satuan_kerja_chart(df_pemetaan, pilihan_col):
     return fig
 
 # [Semua fungsi yang sudah ada sebelumnya tetap sama...]
-def create_spider_chart(data_row):
-    """Create separate stacked spider charts for managerial and technical competencies"""
-    
-    # Definisi kompetensi manajerial dan teknis
-    manajerial_labels = ['Integritas', 'Kerjasama', 'Komunikasi', 'Mengelola Perubahan', 
-                        'Orientasi pada Hasil', 'Pelayanan Publik', 'Pengambilan Keputusan', 
-                        'Pengembangan Diri', 'Perekat Bangsa']
-    
-    teknis_labels = ['Distribusi', 'IPDS', 'Neraca', 'Produksi', 'Sosial', 'Umum']
-    
-    # Kolom untuk level sekarang (biru - dalam)
-    manajerial_sekarang = ['M1_0', 'M2_0', 'M3_0', 'M4_0', 'M5_0', 'M6_0', 'M7_0', 'M8_0', 'M9_0']
-    teknis_sekarang = ['T1_0', 'T2_0', 'T3_0', 'T4_0', 'T5_0', 'T6_0']
-    
-    # Kolom untuk level atasnya (merah - luar)
-    manajerial_atas = ['M1_1', 'M2_1', 'M3_1', 'M4_1', 'M5_1', 'M6_1', 'M7_1', 'M8_1', 'M9_1']
-    teknis_atas = ['T1_1', 'T2_1', 'T3_1', 'T4_1', 'T5_1', 'T6_1']
-    
-    # Ambil nilai dari data
-    manajerial_values_sekarang = [data_row[col] if col in data_row else 0 for col in manajerial_sekarang]
-    manajerial_values_atas = [data_row[col] if col in data_row else 0 for col in manajerial_atas]
-    teknis_values_sekarang = [data_row[col] if col in data_row else 0 for col in teknis_sekarang]
-    teknis_values_atas = [data_row[col] if col in data_row else 0 for col in teknis_atas]
+# Label sumbu spider chart
+SPIDER_MANAJERIAL_LABELS = COMPETENCY_LABELS['manajerial']
+SPIDER_TEKNIS_LABELS = COMPETENCY_LABELS['teknis']
+
+# Urutan trace pada template: data manajerial, ambang manajerial, data teknis, ambang teknis
+SPIDER_TRACE_MANAJERIAL_SEKARANG = 0
+SPIDER_TRACE_MANAJERIAL_TOTAL = 1
+SPIDER_TRACE_TEKNIS_SEKARANG = 3
+SPIDER_TRACE_TEKNIS_TOTAL = 4
+SPIDER_CHART_CACHE_SIZE = 256
+
+@st.cache_resource
+def _spider_chart_template():
+    """Build the static two-polar spider chart layout once; data traces hold placeholder values"""
+    go = lazy_import('plotly.graph_objects')
+    make_subplots = lazy_import('plotly.subplots').make_subplots
     
-    # Hitung total untuk stacking (level sekarang + level atas)
-    manajerial_total = [s + a for s, a in zip(manajerial_values_sekarang, manajerial_values_atas)]
-    teknis_total = [s + a for s, a in zip(teknis_values_sekarang, teknis_values_atas)]
+    manajerial_labels = SPIDER_MANAJERIAL_LABELS
+    teknis_labels = SPIDER_TEKNIS_LABELS
     
     # Buat subplot dengan 2 spider chart
     fig = make_subplots(
@@ -398,7 +1873,7 @@ def create_spider_chart(data_row):
     # Spider Chart 1: Manajerial
     # Layer 1 (dalam): Level Sekarang (gradient biru)
     fig.add_trace(go.Scatterpolar(
-        r=manajerial_values_sekarang,
+        r=[0] * len(manajerial_labels),
         theta=manajerial_labels,
         fill='toself',
         name='Manajerial - Level Sekarang',
@@ -409,7 +1884,7 @@ def create_spider_chart(data_row):
     
     # Layer 2 (luar): Total (Level Sekarang + Level Atas) (gradient ungu)
     fig.add_trace(go.Scatterpolar(
-        r=manajerial_total,
+        r=[0] * len(manajerial_labels),
         theta=manajerial_labels,
         fill='tonext',
         name='Manajerial - Level Atas',
@@ -435,7 +1910,7 @@ def create_spider_chart(data_row):
     # Spider Chart 2: Teknis
     # Layer 1 (dalam): Level Sekarang (gradient biru)
     fig.add_trace(go.Scatterpolar(
-        r=teknis_values_sekarang,
+        r=[0] * len(teknis_labels),
         theta=teknis_labels,
         fill='toself',
         name='Teknis - Level Sekarang',
@@ -446,7 +1921,7 @@ def create_spider_chart(data_row):
     
     # Layer 2 (luar): Total (Level Sekarang + Level Atas) (gradient ungu)
     fig.add_trace(go.Scatterpolar(
-        r=teknis_total,
+        r=[0] * len(teknis_labels),
         theta=teknis_labels,
         fill='tonext',
         name='Teknis - Level Atas',
@@ -487,7 +1962,7 @@ def create_spider_chart(data_row):
         polar2=dict(
             radialaxis=dict(
                 visible=True,
-                range=[0, max(max(teknis_total) if teknis_total else [0], 10)],  # Dynamic untuk teknis
+                range=[0, 10],  # Dinamis untuk teknis, diisi per pegawai
                 tickmode='linear',
                 tick0=0,
                 dtick=1,
@@ -506,41 +1981,76 @@ def create_spider_chart(data_row):
     
     return fig
 
-def create_competency_table(data_row, competency_type):
-    """Create competency table for either managerial or technical competencies"""
-    
-    if competency_type == "manajerial":
-        labels = {
-            'M1': 'Integritas', 'M2': 'Kerjasama', 'M3': 'Komunikasi',
-            'M4': 'Mengelola Perubahan', 'M5': 'Orientasi pada Hasil',
-            'M6': 'Pelayanan Publik', 'M7': 'Pengambilan Keputusan',
-            'M8': 'Pengembangan Diri', 'M9': 'Perekat Bangsa'
-        }
-        codes = ['M1', 'M2', 'M3', 'M4', 'M5', 'M6', 'M7', 'M8', 'M9']
-    else:  # teknis
-        labels = {
-            'T1': 'Distribusi', 'T2': 'IPDS', 'T3': 'Neraca',
-            'T4': 'Produksi', 'T5': 'Sosial', 'T6': 'Umum'
-        }
-        codes = ['T1', 'T2', 'T3', 'T4', 'T5', 'T6']
-    
-    # Buat DataFrame untuk tabel
-    table_data = []
-    for code in codes:
-        kompetensi = labels.get(code, code)
-        nilai_selevel = data_row.get(f'{code}_0', 0)
-        nilai_atas_level = data_row.get(f'{code}_1', 0)
-        
-        table_data.append({
-            'Kompetensi': kompetensi,
-            'Nilai Selevel': nilai_selevel,
-            'Nilai di Atas Level': nilai_atas_level,
-            'Total': nilai_selevel + nilai_atas_level
-            
-        })
+def spider_chart_values(scores):
+    """Extract (manajerial sekarang, manajerial atas, teknis sekarang, teknis atas) tuples from a score vector"""
+    # Kolom untuk level sekarang (biru - dalam) dan level atasnya (merah - luar)
+    return tuple(
+        tuple(scores[index].tolist())
+        for index in (*SCORE_INDEX['manajerial'], *SCORE_INDEX['teknis'])
+    )
+
+def create_spider_chart_from_values(manajerial_sekarang, manajerial_atas, teknis_sekarang, teknis_atas):
+    """Copy the spider chart template and patch in one employee's scores"""
+    go = lazy_import('plotly.graph_objects')
     
-    df_table = pd.DataFrame(table_data)
-    return df_table
+    # Hitung total untuk stacking (level sekarang + level atas)
+    manajerial_total = [s + a for s, a in zip(manajerial_sekarang, manajerial_atas)]
+    teknis_total = [s + a for s, a in zip(teknis_sekarang, teknis_atas)]
+    
+    fig = go.Figure(_spider_chart_template())
+    with fig.batch_update():
+        fig.data[SPIDER_TRACE_MANAJERIAL_SEKARANG].r = list(manajerial_sekarang)
+        fig.data[SPIDER_TRACE_MANAJERIAL_TOTAL].r = manajerial_total
+        fig.data[SPIDER_TRACE_TEKNIS_SEKARANG].r = list(teknis_sekarang)
+        fig.data[SPIDER_TRACE_TEKNIS_TOTAL].r = teknis_total
+        fig.layout.polar2.radialaxis.range = [0, max(max(teknis_total) if teknis_total else 0, 10)]
+    return fig
+
+def create_spider_chart(data_row, scores=None):
+    """Create separate stacked spider charts for managerial and technical competencies"""
+    if scores is None:
+        scores = row_scores(data_row)
+    return create_spider_chart_from_values(*spider_chart_values(scores))
+
+@st.cache_resource
+def get_spider_chart_cache():
+    """Process-wide LRU cache of finished spider chart figures keyed by NIP and scores"""
+    return LRUCache(SPIDER_CHART_CACHE_SIZE)
+
+def get_spider_chart(nip, scores):
+    """Return the cached spider chart for an employee's score vector, building it on a miss"""
+    values = spider_chart_values(scores)
+    # Nilai ikut menjadi kunci sehingga data yang diperbarui tidak memakai figure lama
+    key = (str(nip), values)
+    return get_spider_chart_cache().get_or_create(key, lambda: create_spider_chart_from_values(*values))
+
+def create_competency_table(data_row, competency_type, scores=None):
+    """Create competency table for either managerial or technical competencies"""
+    if scores is None:
+        scores = row_scores(data_row)
+    
+    # Satu irisan baris matriks skor per jenis kompetensi
+    index_selevel, index_atas_level = SCORE_INDEX[competency_type]
+    nilai_selevel = scores[index_selevel]
+    nilai_atas_level = scores[index_atas_level]
+    
+    return pd.DataFrame({
+        'Kompetensi': COMPETENCY_LABELS[competency_type],
+        'Nilai Selevel': nilai_selevel,
+        'Nilai di Atas Level': nilai_atas_level,
+        'Total': np.add(nilai_selevel, nilai_atas_level, dtype=np.int16 if scores.dtype.kind in 'iu' else None),
+    })
+
+def create_peer_percentile_table(percentiles, competency_type):
+    """Percentile table for one competency type against each cohort, with the total as last row"""
+    codes = MANAJERIAL_CODES if competency_type == 'manajerial' else TEKNIS_CODES
+    total_col = 'M_Total' if competency_type == 'manajerial' else 'T_Total'
+    table = {'Kompetensi': COMPETENCY_LABELS[competency_type] + ['Total']}
+    for group_col, label in PEER_GROUP_COLUMNS.items():
+        if group_col in percentiles:
+            cohort = percentiles[group_col]['percentiles']
+            table[f'Persentil {label}'] = [cohort.get(col, np.nan) for col in codes + [total_col]]
+    return pd.DataFrame(table)
 
 def display_metric_cards(col1, col2, col3, value1, label1, value2, label2, value3, label3):
     """Display beautiful metric cards"""
@@ -588,7 +2098,169 @@ def display_info_card(title, content, icon="ℹ️"):
     </div>
     """, unsafe_allow_html=True)
 
+# Ekspor laporan individu: jumlah pegawai per tugas worker dan format berkas
+REPORT_CHUNK_SIZE = 25
+# plotly.js disertakan sekali per ZIP dan dirujuk relatif oleh setiap laporan agar bisa dibuka offline
+REPORT_PLOTLYJS_NAME = "plotly.min.js"
+KALEIDO_AVAILABLE = _module_available('kaleido')
+
+def competency_summary(data_row, competency_table, competency_type):
+    """Return (total, percentage, category) for one employee's competency table"""
+    total = competency_table['Total'].sum()
+    if competency_type == "manajerial":
+        return total, data_row.get('percent_Manajerial', 0), data_row.get('cat_M', 'N/A')
+    
+    # Persentase teknis selalu dari total tabel, sama dengan kolom percent_T hasil olahan
+    persentase = total / (len(competency_table) * NILAI_MAKS_TEKNIS) * 100
+    return total, persentase, str(compute_kategori(persentase))
+
+def render_employee_report(data_row, include_png=False):
+    """Render one employee's standalone HTML report (and optional spider chart PNG)"""
+    scores = row_scores(data_row)
+    spider_chart = create_spider_chart(data_row, scores)
+    
+    sections = []
+    for competency_type, judul in (("manajerial", "🏢 Kompetensi Manajerial"), ("teknis", "⚙️ Kompetensi Teknis")):
+        table = create_competency_table(data_row, competency_type, scores)
+        total, persentase, kategori = competency_summary(data_row, table, competency_type)
+        sections.append(f"""
+        <h2>{judul}</h2>
+        {table.to_html(index=False, classes='competency-table', border=0)}
+        <div class="cards">
+            <div class="metric-card"><div class="metric-value">{int(total)}</div><div class="metric-label">Total Nilai</div></div>
+            <div class="metric-card"><div class="metric-value">{persentase:.1f}%</div><div class="metric-label">Persentase Nilai</div></div>
+            <div class="metric-card"><div class="metric-value">{html.escape(str(kategori))}</div><div class="metric-label">Kategori</div></div>
+        </div>""")
+    
+    info = ''.join(
+        f"<p><strong>{label}:</strong> {html.escape(str(data_row.get(col, 'N/A')))}</p>"
+        for label, col in (("👤 Nama", 'Nama Pegawai'), ("🔢 NIP", 'NIP'), ("💼 Jabatan", 'Jabatan'),
+                           ("🌍 Wilayah", 'Nama Wilayah'), ("🏢 Level", 'Level'))
+    )
+    report_html = f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>Laporan Kompetensi - {html.escape(str(data_row.get('Nama Pegawai', '')))}</title>
+<style>
+body {{ font-family: 'Inter', sans-serif; margin: 2rem; color: #333; }}
+h1, h2 {{ color: #667eea; }}
+.competency-table {{ border-collapse: collapse; width: 100%; }}
+.competency-table th, .competency-table td {{ padding: 0.4rem 0.8rem; border-bottom: 1px solid #ddd; text-align: left; }}
+.cards {{ display: flex; gap: 1rem; margin: 1rem 0 2rem; }}
+.metric-card {{ flex: 1; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 15px; padding: 1rem; text-align: center; }}
+.metric-value {{ font-size: 1.8rem; font-weight: 700; }}
+</style>
+</head>
+<body>
+<h1>📊 Laporan Kompetensi Pegawai</h1>
+{info}
+{spider_chart.to_html(full_html=False, include_plotlyjs=REPORT_PLOTLYJS_NAME)}
+{''.join(sections)}
+</body>
+</html>
+"""
+    files = {'html': report_html.encode('utf-8')}
+    if include_png and KALEIDO_AVAILABLE:
+        files['png'] = spider_chart.to_image(format='png', width=1400, height=700)
+    return files
+
+def _render_report_batch(records, include_png=False):
+    """Process-pool worker: render a chunk of (file stem, row dict) records"""
+    results = []
+    for stem, record in records:
+        for extension, content in render_employee_report(record, include_png).items():
+            results.append((f"{stem}.{extension}", content))
+    return results
+
+def _importable_module():
+    """Return this file as an importable module so process-pool workers can pickle its functions"""
+    # Saat dijalankan lewat `streamlit run`/`python main.py` modul ini bernama __main__
+    # dan fungsinya tidak bisa di-pickle; worker perlu referensi ke modul `main`
+    if __name__ != '__main__':
+        return sys.modules[__name__]
+    return importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+
+def _report_records(df_processed, positions, chunk_size=REPORT_CHUNK_SIZE):
+    """Yield (file stem, row dict) with NIP-based names, suffixed when a NIP is duplicated"""
+    seen = set()
+    if positions is None:
+        positions = np.arange(len(df_processed))
+    # Baris diubah menjadi dict per potongan agar seluruh data terpilih tidak pernah disalin sekaligus
+    for start in range(0, len(positions), chunk_size):
+        chunk = df_processed.take(positions[start:start + chunk_size]).to_dict('records')
+        for position, record in enumerate(chunk, start):
+            nip = re.sub(r'[^0-9A-Za-z_-]', '', str(record.get('NIP', ''))) or f'baris{position}'
+            stem = f"laporan_{nip}" if nip not in seen else f"laporan_{nip}_{position}"
+            seen.add(nip)
+            yield stem, record
+
+def export_reports_zip(df_processed, output, positions=None, include_png=False,
+                       max_workers=None, chunk_size=REPORT_CHUNK_SIZE, progress=None):
+    """Render employee reports across a process pool and stream them into a zip file (path or file object)"""
+    total = len(df_processed) if positions is None else len(positions)
+    records = _report_records(df_processed, positions, chunk_size)
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    max_workers = max_workers or os.cpu_count() or 1
+    done = 0
+    
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(REPORT_PLOTLYJS_NAME, lazy_import('plotly.offline').get_plotlyjs())
+        
+        def write_results(results, n_records):
+            nonlocal done
+            for name, content in results:
+                archive.writestr(name, content)
+            done += n_records
+            if progress is not None:
+                progress(done, total)
+        
+        # Data kecil tidak sebanding dengan biaya menyalakan proses worker
+        if max_workers == 1 or total <= chunk_size:
+            for chunk in chunks:
+                write_results(_render_report_batch(chunk, include_png), len(chunk))
+            return done
+        
+        worker = _importable_module()._render_report_batch
+        # spawn: aman dipakai dari server Streamlit yang multi-thread
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            # Batasi jumlah tugas yang berjalan agar hasil tidak menumpuk di memori
+            pending = {}
+            for chunk in chunks:
+                pending[executor.submit(worker, chunk, include_png)] = len(chunk)
+                if len(pending) >= max_workers * 2:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        write_results(future.result(), pending.pop(future))
+            for future in as_completed(pending):
+                write_results(future.result(), pending[future])
+    return done
+
+def remove_file(path):
+    """Delete a file if it still exists"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def read_and_remove_file(path):
+    """Return a file's bytes and delete it, so a one-off download leaves nothing on disk"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        remove_file(path)
+
 def main():
+    # Konfigurasi halaman (dipanggil di sini agar modul bisa di-import tanpa efek samping UI)
+    st.set_page_config(
+        page_title="Aplikasi Pengolahan Data Kompetensi",
+        page_icon="📊",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
     # Load custom CSS
     load_css()
     
@@ -603,11 +2275,27 @@ def main():
     # Section divider
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
     
-    # Load data
-    df = load_data()
-    df_pemetaan = load_pemetaan_data()
+    # Load data; dengan backend SQL filter, statistik, dan lookup dijalankan sebagai kueri
+    # sehingga worker tidak memuat seluruh data ke memori
+    try:
+        sql_backend = open_sql_backend()
+    except FileNotFoundError as e:
+        st.error(f"🚨 {e}")
+        sql_backend = None
+    dataset = df = None
+    if sql_backend is None:
+        with timing_span('load_data'):
+            dataset = load_competency_dataset()
+        df = None if dataset is None else dataset['df']
+        pemetaan_signature = source_signature(PEMETAAN_XLSX_PATH)
+        with timing_span('load_pemetaan_data'):
+            df_pemetaan = load_pemetaan_data(pemetaan_signature)
+    else:
+        pemetaan_signature = (sql_backend['path'], sql_backend['signature'])
+        with timing_span('load_pemetaan_data'):
+            df_pemetaan = sql_pemetaan_frame(sql_backend)
     
-    if df is None:
+    if df is None and sql_backend is None:
         st.error("🚨 Gagal memuat data. Pastikan file CSV tersedia.")
         
         # Beautiful file upload section
@@ -621,18 +2309,19 @@ def main():
         uploaded_file = st.file_uploader("Choose a CSV file", type=['csv'])
         if uploaded_file is not None:
             try:
-                # Coba baca dengan encoding utf-8 terlebih dahulu
-                df = pd.read_csv(uploaded_file, encoding='utf-8')
-                st.success("✅ File berhasil diupload!")
-            except UnicodeDecodeError:
-                # Jika gagal, coba dengan latin-1
-                df = pd.read_csv(uploaded_file, encoding='latin-1')
+                # Diparsing sekali per isi file (skema bertipe, UTF-8 lalu latin-1) dan di-cache
+                with timing_span('load_uploaded_data'):
+                    dataset = load_uploaded_dataset(uploaded_content_hash(uploaded_file), uploaded_file.getvalue())
+                df = dataset['df']
                 st.success("✅ File berhasil diupload!")
             except Exception as e:
                 st.error(f"❌ Error reading uploaded file: {e}")
                 df = None
     
-    if df is not None:
+    if df is not None or sql_backend is not None:
+        # Kolom turunan (total per kompetensi, total, persentase, kategori) dihitung sekali per dataset
+        df_processed = None if dataset is None else dataset['df_processed']
+        
         # Sidebar dengan styling yang lebih menarik
         with st.sidebar:
             st.markdown("""
@@ -643,9 +2332,20 @@ def main():
             
             menu = st.selectbox(
                 "🔍 Pilih Menu:",
-                ["📋 Tampilkan Tabel", "🔍 Pencarian berdasarkan NIP", "🗺️ Pemetaan Pegawai"],
-                index=0
+                ["📋 Tampilkan Tabel", "🔍 Pencarian berdasarkan NIP", "🗺️ Pemetaan Pegawai",
+                 "📅 Perbandingan Periode"],
+                index=0,
+                key="menu"
             )
+
+            last_refresh = get_competency_store()['last_refresh']
+            if sql_backend is not None:
+                st.caption(f"🗄️ Backend SQL: {sql_backend['path']}")
+            elif last_refresh is not None and dataset is get_competency_store()['current'][1]:
+                st.caption(
+                    f"🔄 Data dimuat {last_refresh['timestamp']} ({last_refresh['mode']}, "
+                    f"{last_refresh['rows']:,} baris, {last_refresh['seconds']:.2f} s)"
+                )
         
         if menu == "📋 Tampilkan Tabel":
             st.markdown("""
@@ -655,37 +2355,6 @@ def main():
             </div>
             """, unsafe_allow_html=True)
             
-            # Hitung M_Total dan T_Total untuk semua data
-            df_processed = df.copy()
-            
-            # Hitung M_Total (M1 sampai M9)
-            m_columns = []
-            for i in range(1, 10):
-                col_0 = f'M{i}_0'
-                col_1 = f'M{i}_1'
-                if col_0 in df.columns and col_1 in df.columns:
-                    df_processed[f'M{i}'] = df_processed[col_0] + df_processed[col_1]
-                    m_columns.append(f'M{i}')
-            
-            if m_columns:
-                df_processed['M_Total'] = df_processed[m_columns].sum(axis=1)
-            else:
-                df_processed['M_Total'] = 0
-            
-            # Hitung T_Total (T1 sampai T6)
-            t_columns = []
-            for i in range(1, 7):
-                col_0 = f'T{i}_0'
-                col_1 = f'T{i}_1'
-                if col_0 in df.columns and col_1 in df.columns:
-                    df_processed[f'T{i}'] = df_processed[col_0] + df_processed[col_1]
-                    t_columns.append(f'T{i}')
-            
-            if t_columns:
-                df_processed['T_Total'] = df_processed[t_columns].sum(axis=1)
-            else:
-                df_processed['T_Total'] = 0
-            
             # Filter controls dengan styling yang lebih menarik
             st.markdown("""
             <div class="info-card">
@@ -694,60 +2363,56 @@ def main():
             </div>
             """, unsafe_allow_html=True)
             
-            col1, col2 = st.columns(2)
+            # Opsi dropdown dan posisi baris per kombinasi filter dihitung sekali per data
+            with timing_span('build_filter_index'):
+                if sql_backend is None:
+                    filter_index = dataset_part(dataset, 'filter_index')
+                else:
+                    filter_index = {'options': sql_filter_options(sql_backend)}
+            
+            col1, col2, col3, col4 = st.columns(4)
             
             with col1:
                 # Filter berdasarkan Level (assumsi ada kolom Level)
-                if 'Level' in df_processed.columns:
-                    unique_levels = ['Semua'] + sorted(df_processed['Level'].dropna().unique().tolist())
-                    selected_level = st.selectbox("🏢 Filter Level:", unique_levels)
+                if 'Level' in filter_index['options']:
+                    selected_level = st.selectbox("🏢 Filter Level:", filter_index['options']['Level'])
                 else:
                     st.warning("⚠️ Kolom 'Level' tidak ditemukan")
                     selected_level = "Semua"
             
             with col2:
                 # Filter berdasarkan Nama Wilayah
-                if 'Nama Wilayah' in df_processed.columns:
-                    unique_wilayah = ['Semua'] + sorted(df_processed['Nama Wilayah'].dropna().unique().tolist())
-                    selected_wilayah = st.selectbox("🌍 Filter Nama Wilayah:", unique_wilayah)
+                if 'Nama Wilayah' in filter_index['options']:
+                    selected_wilayah = st.selectbox("🌍 Filter Nama Wilayah:", filter_index['options']['Nama Wilayah'])
                 else:
                     st.warning("⚠️ Kolom 'Nama Wilayah' tidak ditemukan")
                     selected_wilayah = "Semua"
             
-            # Apply filters
-            filtered_df = df_processed.copy()
+            with col3:
+                # Filter berdasarkan kategori yang sudah dihitung untuk semua baris
+                selected_kategori_m = st.selectbox("🏢 Kategori Manajerial:", filter_index['options']['cat_M'])
             
-            # Filter berdasarkan level
-            if selected_level != "Semua" and 'Level' in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df['Level'] == selected_level]
+            with col4:
+                selected_kategori_t = st.selectbox("⚙️ Kategori Teknis:", filter_index['options']['cat_T'])
             
-            # Filter berdasarkan wilayah
-            if selected_wilayah != "Semua" and 'Nama Wilayah' in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df['Nama Wilayah'] == selected_wilayah]
+            # Apply filters: posisi baris diambil dari indeks; baris baru disalin per halaman tabel
+            selection = (selected_level, selected_wilayah, selected_kategori_m, selected_kategori_t)
+            with timing_span('filter'):
+                if sql_backend is None:
+                    selected_positions = filter_positions(filter_index, *selection)
+                    n_filtered = len(selected_positions)
+                else:
+                    n_filtered = sql_count(sql_backend, *selection)
             
             # Pilih kolom untuk ditampilkan
-            display_columns = ['Nama Pegawai', 'Nama Wilayah', 'Jabatan', 'percent_Manajerial', 'percent_T']
-            available_columns = [col for col in display_columns if col in filtered_df.columns]
-            display_df = filtered_df[available_columns].copy()
-            
-            # Rename kolom untuk tampilan yang lebih baik
-            column_rename = {
-                'Nama Pegawai': 'Nama',
-                'Nama Wilayah': 'Wilayah',
-                'Jabatan': 'Jabatan',
-                'M_Total': 'Nilai Manajerial',
-                'percent_Manajerial': 'Persentase Manajerial (%)',
-                'cat_M': 'Kategori Manajerial',
-                'T_Total': 'Nilai Teknis',
-                'percent_T': 'Persentase Teknis (%)',
-                'cat_T': 'Kategori Teknis',
-            }
-            display_df = display_df.rename(columns=column_rename)
+            source_columns = df_processed.columns if sql_backend is None else sql_columns(sql_backend)
+            available_columns = [col for col in TABLE_DISPLAY_COLUMNS if col in source_columns]
+            column_rename = TABLE_COLUMN_RENAME
             
             st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
             
             # Tampilkan statistik
-            if not filtered_df.empty:
+            if n_filtered:
                 st.markdown("""
                 <div style="text-align: center; padding: 1rem 0;">
                     <h3 style="color: #667eea; font-weight: 600;">📊 Statistik Data Terfilter</h3>
@@ -755,10 +2420,16 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                # Hitung statistik
-                m_total_avg = filtered_df['M_Total'].mean()
-                t_total_avg = filtered_df['T_Total'].mean()
-                total_data = len(filtered_df)
+                # Statistik dibaca dari kubus yang sudah diagregasi sekali per data
+                with timing_span('stats_cube'):
+                    if sql_backend is None:
+                        stats_cube = dataset_part(dataset, 'stats_cube')
+                    else:
+                        stats_cube = sql_stats_cube(sql_backend)
+                    cube_stats = get_cube_stats(stats_cube, *selection)
+                m_total_avg = cube_stats['M_Total_mean']
+                t_total_avg = cube_stats['T_Total_mean']
+                total_data = int(cube_stats['Jumlah'])
                 
                 # Tampilkan dalam metric cards
                 col1, col2, col3 = st.columns(3)
@@ -780,10 +2451,10 @@ def main():
                 
                 with stats_col1:
                     # Manajerial stats
-                    avg_manajerial = filtered_df['M_Total'].mean()
-                    min_manajerial = filtered_df['M_Total'].min()
-                    max_manajerial = filtered_df['M_Total'].max()
-                    std_manajerial = filtered_df['M_Total'].std()
+                    avg_manajerial = cube_stats['M_Total_mean']
+                    min_manajerial = cube_stats['M_Total_min']
+                    max_manajerial = cube_stats['M_Total_max']
+                    std_manajerial = cube_stats['M_Total_std']
                     
                     st.markdown(f"""
                     <div class="info-card">
@@ -811,10 +2482,10 @@ def main():
 
                 with stats_col2:
                     # Teknis stats
-                    avg_teknis = filtered_df['T_Total'].mean()
-                    min_teknis = filtered_df['T_Total'].min()
-                    max_teknis = filtered_df['T_Total'].max()
-                    std_teknis = filtered_df['T_Total'].std()
+                    avg_teknis = cube_stats['T_Total_mean']
+                    min_teknis = cube_stats['T_Total_min']
+                    max_teknis = cube_stats['T_Total_max']
+                    std_teknis = cube_stats['T_Total_std']
                     
                     st.markdown(f"""
                     <div class="info-card">
@@ -840,6 +2511,16 @@ def main():
                     </div>
                     """, unsafe_allow_html=True)
                 
+                # Kubus statistik lengkap bisa diunduh untuk dashboard lain
+                st.download_button(
+                    "⬇️ Unduh Kubus Statistik (CSV)",
+                    data=(dataset_part(dataset, 'stats_cube_csv') if sql_backend is None
+                          else sql_stats_cube_csv(sql_backend)),
+                    file_name="kubus-statistik-kompetensi.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
+                
                 st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
                 
                 # Tampilkan tabel dengan styling yang lebih baik
@@ -850,20 +2531,107 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                st.dataframe(
-                    display_df, 
-                    use_container_width=True, 
-                    height=400,
-                    hide_index=True
-                )
+                # Kontrol pengurutan dan halaman; hanya baris halaman aktif yang dikirim ke browser
+                sort_columns = {column_rename.get(col, col): col for col in available_columns}
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    sort_label = st.selectbox("↕️ Urutkan berdasarkan:", [TABLE_DEFAULT_ORDER] + list(sort_columns))
+                with col2:
+                    sort_direction = st.selectbox(
+                        "Arah urutan:", ["Naik", "Turun"], disabled=sort_label == TABLE_DEFAULT_ORDER
+                    )
+                with col3:
+                    page_size = st.selectbox("Baris per halaman:", TABLE_PAGE_SIZES, index=1)
+                n_pages = -(-n_filtered // page_size)
+                with col4:
+                    page = st.number_input(
+                        f"Halaman (dari {n_pages:,}):", min_value=1, max_value=n_pages, value=1, step=1
+                    )
+                
+                with timing_span('sort_page'):
+                    page_start = (page - 1) * page_size
+                    if sql_backend is None:
+                        ordered_positions = selected_positions
+                        if sort_label != TABLE_DEFAULT_ORDER:
+                            ordered_positions = sort_positions(
+                                dataset_part(dataset, 'sort_index'), df_processed, selected_positions,
+                                sort_columns[sort_label], ascending=sort_direction == "Naik"
+                            )
+                        page_positions = ordered_positions[page_start:page_start + page_size]
+                        display_df = df_processed.take(page_positions)[available_columns]
+                    else:
+                        display_df = sql_table_page(
+                            sql_backend, selection, available_columns,
+                            order_column=None if sort_label == TABLE_DEFAULT_ORDER else sort_columns[sort_label],
+                            ascending=sort_direction == "Naik", limit=page_size, offset=page_start
+                        )
+                    display_df = display_df.rename(columns=column_rename)
+                
+                with timing_span('st.dataframe'):
+                    st.dataframe(
+                        display_df, 
+                        use_container_width=True, 
+                        height=400,
+                        hide_index=True,
+                        # Persentase disimpan float32; tampilkan dua desimal
+                        column_config=table_column_config(available_columns)
+                    )
                 
                 # Info jumlah data dengan styling
+                n_total = len(df) if sql_backend is None else sql_count(sql_backend)
                 st.markdown(f"""
                 <div class="success-card">
-                    ✅ Menampilkan {len(display_df)} dari {len(df)} data total
+                    ✅ Menampilkan baris {page_start + 1:,}–{page_start + len(display_df):,} dari {n_filtered:,} data terfilter ({n_total:,} data total)
                 </div>
                 """, unsafe_allow_html=True)
                 
+                # Ekspor laporan individu untuk seluruh pegawai pada filter terpilih
+                with st.expander("📦 Ekspor Laporan Individu (ZIP)"):
+                    st.markdown(f"Membuat laporan HTML (spider chart, tabel kompetensi, dan kategori) untuk **{n_filtered:,}** pegawai pada filter ini.")
+                    include_png = st.checkbox(
+                        "Sertakan gambar PNG spider chart",
+                        value=False,
+                        disabled=not KALEIDO_AVAILABLE,
+                        help=None if KALEIDO_AVAILABLE else "Membutuhkan paket kaleido"
+                    )
+                    
+                    if st.button("🚀 Buat Laporan", use_container_width=True):
+                        progress_bar = st.progress(0.0, text="Menyiapkan laporan...")
+                        # ZIP ditulis ke file sementara; session_state hanya menyimpan path-nya
+                        if 'report_zip_path' in st.session_state:
+                            remove_file(st.session_state.pop('report_zip_path'))
+                        fd, zip_path = tempfile.mkstemp(prefix='laporan-kompetensi-', suffix='.zip')
+                        os.close(fd)
+                        if sql_backend is None:
+                            report_df, report_positions = df_processed, selected_positions
+                        else:
+                            report_df, report_positions = sql_select_rows(sql_backend, *selection), None
+                        try:
+                            export_reports_zip(
+                                report_df,
+                                zip_path,
+                                positions=report_positions,
+                                include_png=include_png,
+                                progress=lambda done, total: progress_bar.progress(
+                                    done / total, text=f"{done:,} dari {total:,} laporan selesai"
+                                )
+                            )
+                        except BaseException:
+                            remove_file(zip_path)
+                            raise
+                        st.session_state.report_zip_path = zip_path
+                    
+                    # File dibaca saat tombol diklik lalu langsung dihapus
+                    zip_path = st.session_state.get('report_zip_path')
+                    if zip_path is not None and os.path.exists(zip_path):
+                        st.download_button(
+                            "⬇️ Unduh Laporan (ZIP)",
+                            data=lambda path=zip_path: read_and_remove_file(path),
+                            file_name="laporan-kompetensi.zip",
+                            mime="application/zip",
+                            use_container_width=True
+                        )
+                
             else:
                 st.markdown("""
                 <div class="info-card" style="border-left-color: #f39c12;">
@@ -894,13 +2662,40 @@ def main():
                 help="Masukkan NIP lengkap untuk hasil yang akurat"
             )
             
+            with timing_span('build_nip_index'):
+                if sql_backend is None:
+                    nip_index = dataset_part(dataset, 'nip_index')
+                    n_duplicates = len(nip_index['duplicates'])
+                else:
+                    n_duplicates = sql_duplicate_nip_count(sql_backend)
+            if n_duplicates:
+                st.caption(f"ℹ️ Terdeteksi {n_duplicates} NIP duplikat dalam data.")
+            
             if nip_input:
-                # Cari data berdasarkan NIP
-                matching_data = df[df['NIP'].astype(str).str.contains(nip_input, na=False)]
+                # Cari data berdasarkan NIP melalui indeks (exact O(1), prefix O(log n));
+                # backend SQL memakai indeks kolom NIP
+                with timing_span('lookup_nip'):
+                    if sql_backend is None:
+                        matched_nip, matched_positions = lookup_nip(nip_index, nip_input)
+                    else:
+                        matched_nip, matched_rows = sql_lookup_nip(sql_backend, nip_input)
+                        matched_positions = list(range(len(matched_rows)))
                 
-                if not matching_data.empty:
+                if matched_positions:
                     # Ambil data pertama jika ada lebih dari satu
-                    data_row = matching_data.iloc[0]
+                    if sql_backend is None:
+                        data_row = df_processed.iloc[matched_positions[0]]
+                        # Skor pegawai diambil sebagai satu irisan baris matriks int8
+                        scores = dataset_part(dataset, 'score_matrix')[matched_positions[0]]
+                    else:
+                        data_row = matched_rows.iloc[0]
+                        scores = row_scores(data_row)
+                    
+                    if len(matched_positions) > 1:
+                        st.warning(
+                            f"⚠️ NIP {matched_nip} tercatat {len(matched_positions)} kali dalam data. "
+                            "Menampilkan data pertama."
+                        )
                     
                     # Tampilkan informasi dasar dengan card yang menarik
                     st.markdown("""
@@ -947,8 +2742,10 @@ def main():
                     </div>
                     """, unsafe_allow_html=True)
                     
-                    spider_chart = create_spider_chart(data_row)
-                    st.plotly_chart(spider_chart, use_container_width=True)
+                    with timing_span('create_spider_chart'):
+                        spider_chart = get_spider_chart(matched_nip, scores)
+                    with timing_span('st.plotly_chart'):
+                        st.plotly_chart(spider_chart, use_container_width=True)
                     
                     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
                     
@@ -960,6 +2757,24 @@ def main():
                     </div>
                     """, unsafe_allow_html=True)
                     
+                    # Persentil terhadap rekan se-Level dan se-Wilayah dari array nilai yang sudah
+                    # diurutkan per kelompok (searchsorted, tanpa pengurutan ulang per pencarian)
+                    with timing_span('peer_percentiles'):
+                        if sql_backend is None:
+                            percentiles = peer_percentiles(dataset_part(dataset, 'peer_index'), data_row)
+                        else:
+                            percentiles = sql_peer_percentiles(sql_backend, data_row)
+                    percentile_config = {
+                        f'Persentil {label}': st.column_config.ProgressColumn(
+                            f'Persentil {label}', min_value=0, max_value=100, format="%.0f"
+                        )
+                        for label in PEER_GROUP_COLUMNS.values()
+                    }
+                    percentile_caption = "📊 Persentil dibandingkan dengan " + " dan ".join(
+                        f"{cohort['size']:,} pegawai {PEER_GROUP_COLUMNS[group_col]} {cohort['group']}"
+                        for group_col, cohort in percentiles.items()
+                    ) + " (50 = tengah kelompok)."
+                    
                     # Menggunakan tabs untuk tampilan yang lebih modern
                     tab1, tab2 = st.tabs(["🏢 Kompetensi Manajerial", "⚙️ Kompetensi Teknis"])
                     
@@ -967,21 +2782,33 @@ def main():
                         st.markdown("### 🏢 Detail Kompetensi Manajerial")
                         
                         # Buat tabel manajerial
-                        manajerial_table = create_competency_table(data_row, 'manajerial')
+                        manajerial_table = create_competency_table(data_row, 'manajerial', scores)
                         
-                        # Tampilkan tabel dengan styling
-                        st.dataframe(
-                            manajerial_table, 
-                            use_container_width=True, 
-                            height=400,
-                            hide_index=True
-                        )
+                        # Tampilkan tabel dengan styling, persentil rekan di sampingnya
+                        table_col, percentile_col = st.columns([3, 2])
+                        with table_col, timing_span('st.dataframe'):
+                            st.dataframe(
+                                manajerial_table, 
+                                use_container_width=True, 
+                                height=400,
+                                hide_index=True
+                            )
+                        if percentiles:
+                            with percentile_col:
+                                st.dataframe(
+                                    create_peer_percentile_table(percentiles, 'manajerial'),
+                                    use_container_width=True,
+                                    height=400,
+                                    hide_index=True,
+                                    column_config=percentile_config
+                                )
+                                st.caption(percentile_caption)
                         
                         # Tampilkan total dalam metric cards
                         # Total Nilai Manajerial
-                        total_manajerial = manajerial_table['Total'].sum()
-                        persentase_manajerial = data_row.get('percent_Manajerial', 0)
-                        kategori_manajerial = data_row.get('cat_M', 'N/A')
+                        total_manajerial, persentase_manajerial, kategori_manajerial = competency_summary(
+                            data_row, manajerial_table, 'manajerial'
+                        )
                         
                         col1, col2, col3 = st.columns(3)
                         display_metric_cards(
@@ -997,21 +2824,33 @@ def main():
                         st.markdown("### ⚙️ Detail Kompetensi Teknis")
                         
                         # Buat tabel teknis
-                        teknis_table = create_competency_table(data_row, 'teknis')
+                        teknis_table = create_competency_table(data_row, 'teknis', scores)
                         
-                        # Tampilkan tabel dengan styling
-                        st.dataframe(
-                            teknis_table, 
-                            use_container_width=True, 
-                            height=300,
-                            hide_index=True
-                        )
+                        # Tampilkan tabel dengan styling, persentil rekan di sampingnya
+                        table_col, percentile_col = st.columns([3, 2])
+                        with table_col, timing_span('st.dataframe'):
+                            st.dataframe(
+                                teknis_table, 
+                                use_container_width=True, 
+                                height=300,
+                                hide_index=True
+                            )
+                        if percentiles:
+                            with percentile_col:
+                                st.dataframe(
+                                    create_peer_percentile_table(percentiles, 'teknis'),
+                                    use_container_width=True,
+                                    height=300,
+                                    hide_index=True,
+                                    column_config=percentile_config
+                                )
+                                st.caption(percentile_caption)
                         
                         # Tampilkan total dalam metric cards
                         # Total Nilai teknis
-                        total_teknis = teknis_table['Total'].sum()
-                        persentase_teknis = total_teknis / (len(teknis_table) * 10) * 100
-                        kategori_teknis = "Optimal" if persentase_teknis >= 85 else "Cukup Optimal" if persentase_teknis >= 70 else "Kurang Optimal"
+                        total_teknis, persentase_teknis, kategori_teknis = competency_summary(
+                            data_row, teknis_table, 'teknis'
+                        )
                         
                         col1, col2, col3 = st.columns(3)
                         display_metric_cards(
@@ -1031,8 +2870,12 @@ def main():
                     """, unsafe_allow_html=True)
                     
                     # Suggest similar NIPs
-                    similar_nips = df[df['NIP'].astype(str).str.contains(nip_input[:8] if len(nip_input) > 8 else nip_input, na=False)]['NIP'].head(5)
-                    if not similar_nips.empty:
+                    similar_prefix = nip_input.strip()[:8]
+                    if sql_backend is None:
+                        similar_nips = find_nip_prefix(nip_index, similar_prefix, limit=5)
+                    else:
+                        similar_nips = sql_find_nip_prefix(sql_backend, similar_prefix, limit=5)
+                    if similar_nips:
                         st.markdown("""
                         <div class="info-card" style="border-left-color: #f39c12;">
                             <h3 style="color: #f39c12;">💡 Saran NIP yang Mirip</h3>
@@ -1047,6 +2890,10 @@ def main():
             if df_pemetaan is None:
                 st.error("🚨 Data pemetaan tidak tersedia. Pastikan file pemetaan.xlsx ada.")
                 return
+            
+            # Indeks token dibangun sekali per data pemetaan
+            with timing_span('build_pemetaan_token_index'):
+                token_index = build_pemetaan_token_index(df_pemetaan, pemetaan_signature)
                 
             st.markdown("""
             <div style="text-align: center; padding: 1rem 0;">
@@ -1066,8 +2913,13 @@ def main():
                     st.markdown("#### Perbandingan Jalur Pengembangan Karir")
                     
                     # Create and display bar chart
-                    jalur_chart = create_jalur_jabatan_chart(df_pemetaan)
-                    st.plotly_chart(jalur_chart, use_container_width=True)
+                    with timing_span('create_jalur_jabatan_chart'):
+                        jalur_chart = create_jalur_jabatan_chart(
+                            df_pemetaan,
+                            None if sql_backend is None else sql_value_counts(sql_backend, 'Q01_JALUR PENGEMBANGAN KARIR')
+                        )
+                    with timing_span('st.plotly_chart'):
+                        st.plotly_chart(jalur_chart, use_container_width=True)
                     
                     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
                     
@@ -1088,27 +2940,18 @@ def main():
                     if hasattr(st.session_state, 'jalur_selected'):
                         selected_jalur = st.session_state.jalur_selected
                         
-                        # Filter data berdasarkan jalur yang dipilih
-                        filtered_pemetaan = df_pemetaan[
-                            df_pemetaan['Q01_JALUR PENGEMBANGAN KARIR'] == selected_jalur
-                        ]
+                        # Frekuensi token per jalur sudah dihitung di indeks token
+                        jalur_group = token_index['groups'].get('Q01_JALUR PENGEMBANGAN KARIR', {}).get(selected_jalur)
                         
-                        if not filtered_pemetaan.empty and 'Alasan Pilihan Jalur Karir' in df_pemetaan.columns:
+                        if jalur_group is not None and 'Alasan Pilihan Jalur Karir' in df_pemetaan.columns:
                             st.markdown(f"#### WordCloud Alasan Memilih {selected_jalur}")
                             
-                            # Get text data for wordcloud
-                            text_data = filtered_pemetaan['Alasan Pilihan Jalur Karir'].dropna().tolist()
-                            
-                            if text_data:
-                                wordcloud_fig = create_wordcloud(
-                                    text_data, 
-                                    f"Alasan Memilih {selected_jalur}"
+                            if jalur_group['n_texts']:
+                                display_wordcloud(
+                                    jalur_group['frequencies'],
+                                    f"Alasan Memilih {selected_jalur}",
+                                    group=('Q01_JALUR PENGEMBANGAN KARIR', selected_jalur)
                                 )
-                                
-                                if wordcloud_fig:
-                                    st.pyplot(wordcloud_fig)
-                                else:
-                                    st.warning("⚠️ Tidak ada teks yang cukup untuk membuat wordcloud")
                             else:
                                 st.warning("⚠️ Tidak ada data alasan untuk jalur yang dipilih")
                         else:
@@ -1136,128 +2979,178 @@ def main():
                 
                 if pilihan_col in df_pemetaan.columns:
                     # Create bar chart untuk satuan kerja tujuan
-                    satuan_chart = create_satuan_kerja_chart(df_pemetaan, pilihan_col)
-                    st.plotly_chart(satuan_chart, use_container_width=True)
+                    with timing_span('create_satuan_kerja_chart'):
+                        satuan_chart = create_satuan_kerja_chart(
+                            df_pemetaan, pilihan_col,
+                            None if sql_backend is None else sql_value_counts(sql_backend, pilihan_col, limit=14)
+                        )
+                    with timing_span('st.plotly_chart'):
+                        st.plotly_chart(satuan_chart, use_container_width=True)
                     
                     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
                     
-                    # WordCloud untuk alasan memilih pilihan 1
-                    if selected_pilihan == "Pilihan 1" and 'Q06_Alasan Pilihan Jalur Karir' in df_pemetaan.columns:
-                        st.markdown("#### Analisis Alasan Memilih Pilihan 1")
+                    # WordCloud untuk alasan memilih satuan kerja pada pilihan terpilih
+                    if 'Q06_Alasan Pilihan Jalur Karir' in df_pemetaan.columns:
+                        st.markdown(f"#### Analisis Alasan Memilih {selected_pilihan}")
                         
-                        # Filter berdasarkan nilai dari pilihan 1
-                        unique_pilihan1 = df_pemetaan[pilihan_col].dropna().unique()
+                        # Nilai unik dan frekuensi token per satuan kerja dari indeks token
+                        satuan_groups = token_index['groups'].get(pilihan_col, {})
                         
-                        if len(unique_pilihan1) > 0:
+                        if len(satuan_groups) > 0:
                             selected_satuan = st.selectbox(
                                 "🏢 Pilih Satuan Kerja untuk Analisis Alasan:",
-                                unique_pilihan1
+                                list(satuan_groups.keys())
                             )
                             
-                            # Filter data berdasarkan satuan kerja yang dipilih
-                            filtered_data = df_pemetaan[
-                                df_pemetaan[pilihan_col] == selected_satuan
-                            ]
-                            
-                            if not filtered_data.empty:
-                                # Get text data for wordcloud
-                                text_data = filtered_data['Q06_Alasan Pilihan Jalur Karir'].dropna().tolist()
+                            satuan_group = satuan_groups[selected_satuan]
+                            if satuan_group['n_texts']:
+                                st.markdown(f"#### WordCloud Alasan Memilih: {selected_satuan}")
                                 
-                                if text_data:
-                                    st.markdown(f"#### WordCloud Alasan Memilih: {selected_satuan}")
-                                    
-                                    wordcloud_fig = create_wordcloud(
-                                        text_data,
-                                        f"Alasan Memilih {selected_satuan}"
-                                    )
-                                    
-                                    if wordcloud_fig:
-                                        st.pyplot(wordcloud_fig)
-                                    else:
-                                        st.warning("⚠️ Tidak ada teks yang cukup untuk membuat wordcloud")
-                                else:
-                                    st.warning("⚠️ Tidak ada data alasan untuk satuan kerja yang dipilih")
-                            else:
-                                st.warning("⚠️ Data tidak tersedia untuk satuan kerja yang dipilih")
-                                
-                    elif selected_pilihan == "Pilihan 2" and 'Q06_Alasan Pilihan Jalur Karir' in df_pemetaan.columns:
-                        st.markdown("#### Analisis Alasan Memilih Pilihan 2")
-                        
-                        # Filter berdasarkan nilai dari pilihan 1
-                        unique_pilihan1 = df_pemetaan[pilihan_col].dropna().unique()
-                        
-                        if len(unique_pilihan1) > 0:
-                            selected_satuan = st.selectbox(
-                                "🏢 Pilih Satuan Kerja untuk Analisis Alasan:",
-                                unique_pilihan1
-                            )
-                            
-                            # Filter data berdasarkan satuan kerja yang dipilih
-                            filtered_data = df_pemetaan[
-                                df_pemetaan[pilihan_col] == selected_satuan
-                            ]
-                            
-                            if not filtered_data.empty:
-                                # Get text data for wordcloud
-                                text_data = filtered_data['Q06_Alasan Pilihan Jalur Karir'].dropna().tolist()
-                                
-                                if text_data:
-                                    st.markdown(f"#### WordCloud Alasan Memilih: {selected_satuan}")
-                                    
-                                    wordcloud_fig = create_wordcloud(
-                                        text_data,
-                                        f"Alasan Memilih {selected_satuan}"
-                                    )
-                                    
-                                    if wordcloud_fig:
-                                        st.pyplot(wordcloud_fig)
-                                    else:
-                                        st.warning("⚠️ Tidak ada teks yang cukup untuk membuat wordcloud")
-                                else:
-                                    st.warning("⚠️ Tidak ada data alasan untuk satuan kerja yang dipilih")
-                            else:
-                                st.warning("⚠️ Data tidak tersedia untuk satuan kerja yang dipilih")
-                                
-                    elif selected_pilihan == "Pilihan 3" and 'Q06_Alasan Pilihan Jalur Karir' in df_pemetaan.columns:
-                        st.markdown("#### Analisis Alasan Memilih Pilihan 3")
-                        
-                        # Filter berdasarkan nilai dari pilihan 1
-                        unique_pilihan1 = df_pemetaan[pilihan_col].dropna().unique()
-                        
-                        if len(unique_pilihan1) > 0:
-                            selected_satuan = st.selectbox(
-                                "🏢 Pilih Satuan Kerja untuk Analisis Alasan:",
-                                unique_pilihan1
-                            )
-                            
-                            # Filter data berdasarkan satuan kerja yang dipilih
-                            filtered_data = df_pemetaan[
-                                df_pemetaan[pilihan_col] == selected_satuan
-                            ]
-                            
-                            if not filtered_data.empty:
-                                # Get text data for wordcloud
-                                text_data = filtered_data['Q06_Alasan Pilihan Jalur Karir'].dropna().tolist()
-                                
-                                if text_data:
-                                    st.markdown(f"#### WordCloud Alasan Memilih: {selected_satuan}")
-                                    
-                                    wordcloud_fig = create_wordcloud(
-                                        text_data,
-                                        f"Alasan Memilih {selected_satuan}"
-                                    )
-                                    
-                                    if wordcloud_fig:
-                                        st.pyplot(wordcloud_fig)
-                                    else:
-                                        st.warning("⚠️ Tidak ada teks yang cukup untuk membuat wordcloud")
-                                else:
-                                    st.warning("⚠️ Tidak ada data alasan untuk satuan kerja yang dipilih")
+                                display_wordcloud(
+                                    satuan_group['frequencies'],
+                                    f"Alasan Memilih {selected_satuan}",
+                                    group=(pilihan_col, selected_satuan)
+                                )
                             else:
-                                st.warning("⚠️ Data tidak tersedia untuk satuan kerja yang dipilih")
+                                st.warning("⚠️ Tidak ada data alasan untuk satuan kerja yang dipilih")
                                             
                 else:
                     st.error(f"❌ Kolom '{pilihan_col}' tidak ditemukan dalam data")
+        
+        elif menu == "📅 Perbandingan Periode":
+            st.markdown("""
+            <div style="text-align: center; padding: 1rem 0;">
+                <h2 style="color: #667eea; font-weight: 600;">📅 Perbandingan Periode</h2>
+                <p style="color: #666; font-size: 1.1rem;">Bandingkan hasil asesmen antar periode per Level dan Wilayah</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if not PYARROW_AVAILABLE:
+                st.error("🚨 Penyimpanan multi-periode membutuhkan paket pyarrow.")
+                return
+            
+            with timing_span('list_partitions'):
+                partitions = list_partitions()
+            
+            # Dengan backend SQL data tidak dimuat ke memori; periode disimpan lewat CLI
+            if df is not None:
+                with st.expander("💾 Simpan Data Saat Ini sebagai Periode", expanded=not partitions):
+                    st.markdown(
+                        f"Data yang sedang dimuat (**{len(df):,}** pegawai) disimpan per Nama Wilayah. "
+                        "Periode yang sudah ada akan ditimpa. Dari baris perintah: "
+                        "`python main.py ingest --input hasil.csv --periode 2024`."
+                    )
+                    new_periode = st.text_input("Periode:", placeholder="Contoh: 2024")
+                    if st.button("💾 Simpan Periode", use_container_width=True, disabled=not new_periode.strip()):
+                        n_partitions = write_period_partitions(df, new_periode)
+                        st.success(f"✅ Periode {new_periode.strip()} disimpan dalam {n_partitions:,} partisi wilayah")
+                        partitions = list_partitions()
+            
+            if not partitions:
+                st.markdown("""
+                <div class="info-card" style="border-left-color: #f39c12;">
+                    <h3 style="color: #f39c12;">⚠️ Belum Ada Data Periode</h3>
+                    <p>Simpan data asesmen minimal satu periode untuk mulai membandingkan.</p>
+                </div>
+                """, unsafe_allow_html=True)
+                return
+            
+            # Filter periode dan wilayah memangkas partisi yang dibaca; Level disaring di Arrow
+            available_periods = sorted({partition[0] for partition in partitions})
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                selected_periods = st.multiselect(
+                    "📅 Periode:", available_periods, default=available_periods[-2:]
+                )
+            with col2:
+                wilayah_options = [FILTER_ALL] + sorted(
+                    {partition[1] for partition in prune_partitions(partitions, selected_periods)}
+                    - {PARTITION_EMPTY_VALUE}
+                )
+                selected_wilayah = st.selectbox("🌍 Filter Nama Wilayah:", wilayah_options, key="periode_wilayah")
+            selected_partitions = prune_partitions(partitions, selected_periods, selected_wilayah)
+            with col3:
+                selected_level = st.selectbox(
+                    "🏢 Filter Level:", period_level_options(selected_partitions), key="periode_level"
+                )
+            
+            if not selected_partitions:
+                st.info("ℹ️ Pilih minimal satu periode.")
+                return
+            
+            with timing_span('load_period_data'):
+                df_periode = load_period_data(selected_partitions, selected_level)
+            st.caption(f"📂 {len(selected_partitions):,} dari {len(partitions):,} partisi dibaca")
+            
+            if df_periode.empty:
+                st.warning("⚠️ Tidak ada data yang sesuai dengan filter yang dipilih")
+                return
+            
+            # Ringkasan per periode
+            summary = compare_periods(df_periode)
+            st.dataframe(
+                summary, use_container_width=True, hide_index=True,
+                column_config={
+                    col: st.column_config.NumberColumn(format="%.2f")
+                    for col in summary.columns if col not in ('Periode', 'Jumlah')
+                }
+            )
+            
+            go = lazy_import('plotly.graph_objects')
+            fig = go.Figure([
+                go.Bar(name=label, x=summary['Periode'].astype(str), y=summary[label])
+                for label in ('Rata-rata Persentase Manajerial (%)', 'Rata-rata Persentase Teknis (%)')
+            ])
+            fig.update_layout(barmode='group', title="Rata-rata Persentase per Periode", height=400)
+            with timing_span('st.plotly_chart'):
+                st.plotly_chart(fig, use_container_width=True)
+            
+            st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
+            
+            # Perkembangan individu: spider chart per periode untuk satu NIP
+            st.markdown("### 🔍 Perkembangan Pegawai antar Periode")
+            periode_nip = st.text_input("NIP:", placeholder="Contoh: 199702220701110024", key="periode_nip")
+            if periode_nip.strip():
+                employee_rows = df_periode[df_periode['NIP'].astype(str).str.strip() == periode_nip.strip()]
+                if employee_rows.empty:
+                    st.warning(f"⚠️ NIP {periode_nip.strip()} tidak ditemukan pada periode dan filter terpilih")
+                else:
+                    st.dataframe(
+                        employee_rows[['Periode'] + [col for col in TABLE_DISPLAY_COLUMNS if col in employee_rows.columns]]
+                        .rename(columns=TABLE_COLUMN_RENAME),
+                        use_container_width=True, hide_index=True,
+                        column_config=table_column_config(employee_rows.columns)
+                    )
+                    tabs = st.tabs([f"📅 {periode}" for periode in employee_rows['Periode'].astype(str)])
+                    # NIP bisa muncul lebih dari sekali dalam satu periode: kunci memakai posisi baris
+                    for i, (tab, (_, data_row)) in enumerate(zip(tabs, employee_rows.iterrows())):
+                        with tab:
+                            with timing_span('create_spider_chart'):
+                                fig = create_spider_chart(data_row)
+                            st.plotly_chart(fig, use_container_width=True,
+                                            key=f"periode_spider_{data_row['Periode']}_{i}")
+            
+            st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
+            
+            # Tabel data gabungan semua periode terpilih, dipaging seperti tabel utama
+            st.markdown("### 📋 Tabel Data per Periode")
+            period_columns = ['Periode'] + [col for col in TABLE_DISPLAY_COLUMNS if col in df_periode.columns]
+            col1, col2 = st.columns(2)
+            with col1:
+                page_size = st.selectbox("Baris per halaman:", TABLE_PAGE_SIZES, index=1, key="periode_page_size")
+            n_pages = -(-len(df_periode) // page_size)
+            with col2:
+                page = st.number_input(
+                    f"Halaman (dari {n_pages:,}):", min_value=1, max_value=n_pages, value=1, step=1,
+                    key="periode_page"
+                )
+            page_start = (page - 1) * page_size
+            with timing_span('st.dataframe'):
+                st.dataframe(
+                    df_periode.iloc[page_start:page_start + page_size][period_columns].rename(columns=TABLE_COLUMN_RENAME),
+                    use_container_width=True, height=400, hide_index=True,
+                    column_config=table_column_config(period_columns)
+                )
 
     # Footer
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
@@ -1269,5 +3162,121 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+# Kolom hasil mode batch (`python main.py score`)
+SCORE_OUTPUT_COLUMNS = (
+    ['NIP', 'Nama Pegawai', 'Nama Wilayah', 'Level', 'Jabatan']
+    + MANAJERIAL_CODES + ['M_Total', 'percent_Manajerial', 'cat_M']
+    + TEKNIS_CODES + ['T_Total', 'percent_T', 'cat_T']
+)
+CLI_COMMANDS = ('score', 'export', 'memory', 'ingest', 'build-sql')
+
+def write_table(df, path):
+    """Write a frame as CSV or Parquet depending on the file extension"""
+    if path.lower().endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+def run_cli(argv):
+    """Headless batch mode: score a competency CSV or export reports without Streamlit"""
+    parser = argparse.ArgumentParser(
+        prog="python main.py",
+        description="Mode batch pengolahan data kompetensi tanpa Streamlit"
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    score_parser = subparsers.add_parser('score', help="Hitung total, persentase, dan kategori untuk seluruh pegawai")
+    score_parser.add_argument('--input', default=COMPETENCY_CSV_PATH, help="CSV hasil asesmen")
+    score_parser.add_argument('--output', required=True, help="Berkas hasil (.csv atau .parquet)")
+    score_parser.add_argument('--all-columns', action='store_true', help="Sertakan semua kolom masukan")
+    score_parser.add_argument('--stats-cube', help="Tulis juga kubus statistik (.csv atau .parquet)")
+    
+    export_parser = subparsers.add_parser('export', help="Ekspor laporan individu ke ZIP")
+    export_parser.add_argument('--input', default=COMPETENCY_CSV_PATH, help="CSV hasil asesmen")
+    export_parser.add_argument('--output', required=True, help="Berkas ZIP tujuan")
+    export_parser.add_argument('--level', default=FILTER_ALL)
+    export_parser.add_argument('--wilayah', default=FILTER_ALL)
+    export_parser.add_argument('--kategori-manajerial', default=FILTER_ALL, choices=[FILTER_ALL] + KATEGORI_LEVELS)
+    export_parser.add_argument('--kategori-teknis', default=FILTER_ALL, choices=[FILTER_ALL] + KATEGORI_LEVELS)
+    export_parser.add_argument('--png', action='store_true', help="Sertakan PNG spider chart (butuh kaleido)")
+    export_parser.add_argument('--workers', type=int, default=None)
+    
+    memory_parser = subparsers.add_parser('memory', help="Laporan memori per kolom: tipe hasil inferensi vs skema ingest")
+    memory_parser.add_argument('--input', default=COMPETENCY_CSV_PATH, help="CSV hasil asesmen")
+    
+    ingest_parser = subparsers.add_parser('ingest', help="Simpan hasil asesmen satu periode ke penyimpanan terpartisi")
+    ingest_parser.add_argument('--input', default=COMPETENCY_CSV_PATH, help="CSV hasil asesmen")
+    ingest_parser.add_argument('--periode', required=True, help="Nama periode, mis. 2024")
+    ingest_parser.add_argument('--store-dir', default=PARTITION_STORE_DIR)
+    
+    sql_parser = subparsers.add_parser('build-sql', help=f"Bangun berkas SQLite untuk backend SQL ({SQL_BACKEND_ENV})")
+    sql_parser.add_argument('--input', default=COMPETENCY_CSV_PATH, help="CSV hasil asesmen")
+    sql_parser.add_argument('--pemetaan', default=PEMETAAN_XLSX_PATH, help="Excel pemetaan (dilewati bila tidak ada)")
+    sql_parser.add_argument('--output', required=True, help="Berkas SQLite tujuan")
+    
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    
+    if args.command == 'build-sql':
+        df_processed = compute_competency_scores(_read_competency_csv(args.input))
+        df_pemetaan = pd.read_excel(args.pemetaan) if os.path.exists(args.pemetaan) else None
+        build_sql_backend(df_processed, df_pemetaan, args.output)
+        print(f"{len(df_processed):,} pegawai" + ("" if df_pemetaan is None else f" dan {len(df_pemetaan):,} baris pemetaan")
+              + f" ditulis dalam {time.perf_counter() - start:.2f} s -> {args.output}")
+        print(f"Aktifkan dengan {SQL_BACKEND_ENV}={args.output} streamlit run main.py")
+        return 0
+    
+    if args.command == 'ingest':
+        df = _read_competency_csv(args.input)
+        n_partitions = write_period_partitions(df, args.periode, args.store_dir)
+        print(f"{len(df):,} pegawai periode {args.periode} disimpan dalam {n_partitions:,} partisi "
+              f"dalam {time.perf_counter() - start:.2f} s -> {args.store_dir}")
+        return 0
+    
+    if args.command == 'memory':
+        for judul, frame in (("Tipe hasil inferensi (pd.read_csv)", pd.read_csv(args.input, encoding_errors='replace')),
+                             ("Skema ingest", _read_competency_csv(args.input))):
+            report = memory_report(frame)
+            print(f"{judul}: {len(frame.columns)} kolom, {report['Memori (KB)'].sum() / 1024:,.2f} MB")
+            print(report.to_string(index=False))
+            print()
+        return 0
+    
+    df_processed = compute_competency_scores(_read_competency_csv(args.input))
+    
+    if args.command == 'score':
+        if args.all_columns:
+            result = df_processed
+        else:
+            result = df_processed[[col for col in SCORE_OUTPUT_COLUMNS if col in df_processed.columns]]
+        write_table(result, args.output)
+        if args.stats_cube:
+            write_table(export_stats_cube(compute_stats_cube(df_processed)), args.stats_cube)
+        
+        print(f"{len(result):,} pegawai dinilai dalam {time.perf_counter() - start:.2f} s -> {args.output}")
+        for col in ('cat_M', 'cat_T'):
+            if col in result.columns:
+                print(f"  {col}: " + ", ".join(f"{k}={v:,}" for k, v in result[col].value_counts().items()))
+    
+    elif args.command == 'export':
+        mask = np.ones(len(df_processed), dtype=bool)
+        for col, value in (('Level', args.level), ('Nama Wilayah', args.wilayah),
+                           ('cat_M', args.kategori_manajerial), ('cat_T', args.kategori_teknis)):
+            if value != FILTER_ALL and col in df_processed.columns:
+                mask &= (df_processed[col] == value).to_numpy()
+        
+        n_reports = export_reports_zip(
+            df_processed, args.output,
+            positions=np.flatnonzero(mask),
+            include_png=args.png,
+            max_workers=args.workers
+        )
+        print(f"{n_reports:,} laporan diekspor dalam {time.perf_counter() - start:.2f} s -> {args.output}")
+    
+    return 0
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        sys.exit(run_cli(sys.argv[1:]))
+    with timing_session():
+        main()
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""Generator data sintetis berskema hasil-manajerial-teknis.csv dan pemetaan.xlsx.
+
+Dipakai untuk uji beban tanpa data pegawai asli. Semua kolom dibangkitkan secara
+vektor dengan numpy sehingga 1 juta baris selesai dalam hitungan detik.
+
+Contoh:
+    python synthetic_data.py --rows 1000000 --pemetaan-rows 100000 --output-dir data_sintetis
+    python synthetic_data.py --rows 5000 --skew 2.0 --seed 7
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import main
+
+WILAYAH = [
+    'Provinsi Lampung', 'Bandar Lampung', 'Lampung Tengah', 'Lampung Selatan', 'Lampung Timur',
+    'Lampung Utara', 'Tanggamus', 'Metro', 'Pringsewu', 'Pesawaran', 'Lampung Barat',
+    'Way Kanan', 'Tulang Bawang', 'Tulang Bawang Barat', 'Mesuji', 'Pesisir Barat',
+]
+LEVEL = ['Ahli Pertama', 'Ahli Muda', 'Terampil', 'Mahir', 'Ahli Madya', 'Penyelia']
+JABATAN = ['Statistisi', 'Pranata Komputer', 'Analis Kepegawaian', 'Pengelola Pengadaan', 'Arsiparis']
+NAMA_DEPAN = [
+    'Andi', 'Budi', 'Citra', 'Dewi', 'Eko', 'Fitri', 'Gita', 'Hendra', 'Indah', 'Joko',
+    'Kartika', 'Lestari', 'Made', 'Nur', 'Putri', 'Rizki', 'Sari', 'Tri', 'Wahyu', 'Yuni',
+]
+NAMA_BELAKANG = [
+    'Pratama', 'Saputra', 'Wijaya', 'Hidayat', 'Lestari', 'Kurniawan', 'Siregar', 'Nasution',
+    'Setiawan', 'Rahmawati', 'Permana', 'Susanti', 'Gunawan', 'Utami', 'Santoso', 'Hasibuan',
+]
+JALUR = ['2 : Jalur Jabatan Fungsional', '1 : Jalur Jabatan Struktural']
+SATUAN_KERJA = ['BPS Provinsi Lampung'] + [
+    f"BPS {'Kota' if wilayah in ('Bandar Lampung', 'Metro') else 'Kabupaten'} {wilayah}"
+    for wilayah in WILAYAH[1:]
+]
+
+# Kosakata jawaban alasan (campuran kata bermakna, stopword, dan istilah BPS)
+ANSWER_VOCABULARY = [
+    'saya', 'ingin', 'mengembangkan', 'karir', 'kompetensi', 'di', 'bidang', 'statistik',
+    'yang', 'lebih', 'sesuai', 'dengan', 'minat', 'dan', 'keahlian', 'manajemen', 'tim',
+    'dekat', 'keluarga', 'suasana', 'baru', 'tantangan', 'belajar', 'analisis', 'data',
+    'pengolahan', 'survei', 'sensus', 'bps', 'provinsi', 'kabupaten', 'kota', 'lampung',
+    'pelayanan', 'publik', 'kepemimpinan', 'fungsional', 'struktural', 'jabatan', 'untuk',
+    'karena', 'ayo', 'yuk', 'dong', 'pengalaman', 'integritas', 'kerjasama', 'komunikasi',
+]
+ANSWER_PUNCTUATION = ['', '', '', ',', '.', '!', ' 2024', ' (1)']
+# Jumlah jawaban berbeda default per kelompok; jawaban survei banyak yang berulang
+ANSWER_POOL_SIZE = 5_000
+
+
+def zipf_weights(n_values, skew):
+    """Return normalized Zipf weights 1/rank**skew (skew=0 gives a uniform distribution)"""
+    weights = 1.0 / np.arange(1, n_values + 1) ** skew
+    return weights / weights.sum()
+
+
+def skewed_choice(rng, values, size, skew):
+    """Draw values with Zipf-skewed probabilities (earlier values are more frequent)"""
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=zipf_weights(len(values), skew))]
+
+
+def skewed_choice_distinct(rng, values, size, k, skew):
+    """Draw k distinct values per row with Zipf-skewed probabilities (Gumbel top-k)"""
+    keys = np.log(zipf_weights(len(values), skew)) + rng.gumbel(size=(size, len(values)))
+    top_k = np.argsort(-keys, axis=1)[:, :k]
+    return np.asarray(values, dtype=object)[top_k]
+
+
+def synthetic_nips(rng, n_rows):
+    """Generate unique 18-digit NIPs: birth date, appointment month, gender and sequence"""
+    def draw(size):
+        birth_year = rng.integers(1965, 2001, size)
+        birth = birth_year * 10_000 + rng.integers(1, 13, size) * 100 + rng.integers(1, 29, size)
+        appointment = (birth_year + rng.integers(22, 30, size)) * 100 + rng.integers(1, 13, size)
+        return birth * 10**10 + appointment * 10**4 + rng.integers(1, 3, size) * 1_000 + rng.integers(1, 1_000, size)
+
+    nips = draw(n_rows)
+    # Bangkitkan ulang NIP yang bertabrakan sampai semuanya unik
+    while True:
+        duplicated = pd.Series(nips).duplicated().to_numpy()
+        if not duplicated.any():
+            return pd.Series(nips).astype(str)
+        nips[duplicated] = draw(int(duplicated.sum()))
+
+
+def synthetic_answers(n_rows, seed=0, missing_rate=0.05, distinct=None, skew=0.0):
+    """Generate free-text answers with punctuation, digits and missing values"""
+    rng = np.random.default_rng(seed)
+    if distinct is not None:
+        # Jawaban diambil dari kumpulan jawaban berbeda; hanya kumpulan ini yang dirakit per baris
+        pool = synthetic_answers(distinct, seed=seed, missing_rate=0, skew=skew).to_numpy()
+        series = pd.Series(pool[rng.choice(distinct, size=n_rows, p=zipf_weights(distinct, skew))], dtype=object)
+        series[rng.random(n_rows) < missing_rate] = None
+        return series
+
+    lengths = rng.integers(5, 25, size=n_rows)
+    # Kosakata diacak per seed agar kelompok berbeda punya kata dominan berbeda
+    vocabulary = rng.permutation(ANSWER_VOCABULARY)
+    words = skewed_choice(rng, vocabulary, int(lengths.sum()), skew)
+    suffixes = rng.choice(ANSWER_PUNCTUATION, size=n_rows)
+
+    answers = []
+    start = 0
+    for length, suffix in zip(lengths, suffixes):
+        answers.append(' '.join(words[start:start + length]).capitalize() + suffix)
+        start += length
+
+    series = pd.Series(answers, dtype=object)
+    series[rng.random(n_rows) < missing_rate] = None
+    return series
+
+
+def generate_competency_data(n_rows, seed=0, skew=1.0):
+    """Generate hasil-manajerial-teknis.csv-shaped data for n_rows employees"""
+    rng = np.random.default_rng(seed)
+    # Semua kombinasi nama dirakit sekali, lalu diambil per baris lewat indeks
+    full_names = np.array([f'{depan} {belakang}' for depan in NAMA_DEPAN for belakang in NAMA_BELAKANG], dtype=object)
+    data = {
+        'NIP': synthetic_nips(rng, n_rows),
+        'Nama Pegawai': full_names[rng.integers(0, len(full_names), n_rows)],
+        'Nama Wilayah': skewed_choice(rng, WILAYAH, n_rows, skew),
+        'Level': skewed_choice(rng, LEVEL, n_rows, skew),
+        'Jabatan': skewed_choice(rng, JABATAN, n_rows, skew),
+    }
+
+    # Kemampuan laten per pegawai membuat nilai antar kompetensi berkorelasi;
+    # total per kompetensi dibagi ke kolom _0 dan _1
+    ability = rng.beta(5, 3, n_rows)
+    for codes, nilai_maks in ((main.MANAJERIAL_CODES, main.NILAI_MAKS_MANAJERIAL),
+                              (main.TEKNIS_CODES, main.NILAI_MAKS_TEKNIS)):
+        noise = rng.standard_normal((n_rows, len(codes)), dtype=np.float32)
+        totals = np.clip(np.rint(ability[:, None] * nilai_maks + noise), 0, nilai_maks)
+        first_part = np.floor(totals * rng.uniform(0.4, 0.8, size=totals.shape))
+        for i, code in enumerate(codes):
+            data[f'{code}_0'] = first_part[:, i].astype(np.int64)
+            data[f'{code}_1'] = (totals[:, i] - first_part[:, i]).astype(np.int64)
+    df = pd.DataFrame(data)
+
+    for col, codes, nilai_maks in (('percent_Manajerial', main.MANAJERIAL_CODES, main.NILAI_MAKS_MANAJERIAL),
+                                   ('percent_T', main.TEKNIS_CODES, main.NILAI_MAKS_TEKNIS)):
+        total = sum(df[f'{code}_0'] + df[f'{code}_1'] for code in codes)
+        df[col] = (total / (len(codes) * nilai_maks) * 100).round(2)
+        if col == 'percent_Manajerial':
+            df['cat_M'] = main.compute_kategori(df[col].to_numpy())
+
+    # Urutan kolom mengikuti berkas sumber (cat_M sebelum percent_T)
+    return df[['NIP', 'Nama Pegawai', 'Nama Wilayah', 'Level', 'Jabatan']
+              + [f'{code}_{i}' for code in main.MANAJERIAL_CODES + main.TEKNIS_CODES for i in (0, 1)]
+              + ['percent_Manajerial', 'cat_M', 'percent_T']]
+
+
+def generate_pemetaan_data(n_rows, seed=0, skew=1.0, missing_rate=0.05, pool_size=ANSWER_POOL_SIZE):
+    """Generate pemetaan.xlsx-shaped survey answers for n_rows employees"""
+    rng = np.random.default_rng(seed)
+    jalur = skewed_choice(rng, JALUR, n_rows, skew)
+    satuan_kerja = skewed_choice_distinct(rng, SATUAN_KERJA, n_rows, 3, skew)
+    pool_size = max(1, min(n_rows, pool_size))
+
+    # Alasan jalur dibangkitkan per jalur agar wordcloud tiap jalur berbeda
+    alasan_jalur = pd.Series(index=range(n_rows), dtype=object)
+    for i, value in enumerate(JALUR):
+        rows = np.flatnonzero(jalur == value)
+        alasan_jalur.iloc[rows] = synthetic_answers(
+            len(rows), seed=seed + 10 + i, missing_rate=missing_rate, distinct=pool_size, skew=skew
+        ).to_numpy()
+
+    return pd.DataFrame({
+        'Q01_JALUR PENGEMBANGAN KARIR': jalur,
+        'Alasan Pilihan Jalur Karir': alasan_jalur,
+        'Q03_Pilih 3 Satuan Kerja Tujuan': satuan_kerja[:, 0],
+        'Q04_Pilih 3 Satuan Kerja Tujuan': satuan_kerja[:, 1],
+        'Q05_Pilih 3 Satuan Kerja Tujuan': satuan_kerja[:, 2],
+        'Q06_Alasan Pilihan Jalur Karir': synthetic_answers(
+            n_rows, seed=seed + 20, missing_rate=missing_rate, distinct=pool_size, skew=skew
+        ),
+    })
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000, help="Jumlah pegawai pada data kompetensi")
+    parser.add_argument('--pemetaan-rows', type=int, default=None, help="Jumlah baris pemetaan (default: sama dengan --rows)")
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skew', type=float, default=1.0,
+                        help="Eksponen Zipf untuk kolom kategori dan kata jawaban (0 = seragam)")
+    parser.add_argument('--missing-rate', type=float, default=0.05, help="Proporsi jawaban alasan yang kosong")
+    parser.add_argument('--pool-size', type=int, default=ANSWER_POOL_SIZE, help="Jumlah jawaban alasan berbeda per kelompok")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    pemetaan_rows = args.rows if args.pemetaan_rows is None else args.pemetaan_rows
+
+    start = time.perf_counter()
+    competency = generate_competency_data(args.rows, seed=args.seed, skew=args.skew)
+    pemetaan = generate_pemetaan_data(pemetaan_rows, seed=args.seed, skew=args.skew,
+                                      missing_rate=args.missing_rate, pool_size=args.pool_size)
+    print(f"Data dibangkitkan dalam {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    competency_path = os.path.join(args.output_dir, main.COMPETENCY_CSV_PATH)
+    pemetaan_path = os.path.join(args.output_dir, main.PEMETAAN_XLSX_PATH)
+    competency.to_csv(competency_path, index=False)
+    pemetaan.to_excel(pemetaan_path, index=False)
+    print(f"{len(competency):,} baris -> {competency_path}")
+    print(f"{len(pemetaan):,} baris -> {pemetaan_path} ({time.perf_counter() - start:.2f} s menulis berkas)")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+# main.py dan synthetic_data.py berada di root repo, bukan paket terpasang
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import main
+from synthetic_data import generate_competency_data
+
+
+def competency_csv_bytes(n_rows, seed=0):
+    """Synthetic hasil-manajerial-teknis.csv content"""
+    return generate_competency_data(n_rows, seed=seed).to_csv(index=False).encode('utf-8')
+
+
+@pytest.fixture
+def competency_df():
+    return main._read_competency_csv(competency_csv_bytes(500))
+
+
+@pytest.fixture
+def dataset(competency_df):
+    return main.new_dataset(competency_df)
@@ -0,0 +1,27 @@
+import os
+
+import pandas as pd
+
+import main
+
+
+def _read(path):
+    return pd.read_csv(path)
+
+
+def test_sidecar_cleanup_only_touches_same_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'COLUMNAR_CACHE_DIR', str(tmp_path / 'cache'))
+    first, second = tmp_path / 'a' / 'data.csv', tmp_path / 'b' / 'data.csv'
+    for path in (first, second):
+        path.parent.mkdir()
+        path.write_text("x\n1\n")
+        main.read_with_columnar_cache(str(path), _read)
+    assert len(os.listdir(main.COLUMNAR_CACHE_DIR)) == 2
+    
+    # Sumber pertama berubah: hanya sidecar lamanya yang dihapus
+    first.write_text("x\n1\n2\n")
+    os.utime(first, ns=(1, 1))
+    assert main.read_with_columnar_cache(str(first), _read)['x'].tolist() == [1, 2]
+    names = sorted(os.listdir(main.COLUMNAR_CACHE_DIR))
+    assert names == sorted(os.path.basename(main._columnar_sidecar_path(str(p))) for p in (first, second))
+    assert main.read_with_columnar_cache(str(second), _read)['x'].tolist() == [1]
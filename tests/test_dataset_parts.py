@@ -0,0 +1,29 @@
+import numpy as np
+
+import main
+
+
+def test_stats_cube_csv_is_built_once_per_dataset(dataset):
+    csv_bytes = main.dataset_part(dataset, 'stats_cube_csv')
+    assert main.dataset_part(dataset, 'stats_cube_csv') is csv_bytes
+    assert csv_bytes == main.export_stats_cube_csv(main.dataset_part(dataset, 'stats_cube'))
+
+
+def _assert_scores_are_matrix_views(dataset):
+    matrix = dataset['parts']['score_matrix']
+    for frame in (dataset['df'], dataset['df_processed']):
+        for col in main.SCORE_COLUMNS:
+            values = frame[col].to_numpy()
+            assert np.shares_memory(values, matrix)
+            np.testing.assert_array_equal(values, matrix[:, main.SCORE_COLUMN_INDEX[col]])
+
+
+def test_score_columns_are_views_of_the_score_matrix(dataset):
+    _assert_scores_are_matrix_views(dataset)
+
+
+def test_merged_dataset_keeps_one_copy_of_scores(competency_df):
+    base, delta = competency_df.iloc[:400], competency_df.iloc[400:].reset_index(drop=True)
+    merged = main.merge_dataset(main.new_dataset(base), delta)
+    _assert_scores_are_matrix_views(merged)
+    np.testing.assert_array_equal(merged['parts']['score_matrix'], main.compute_score_matrix(competency_df))
@@ -0,0 +1,40 @@
+import os
+
+import main
+from synthetic_data import generate_competency_data
+
+
+def _period_frame(seed, wilayah):
+    df = generate_competency_data(60, seed=seed)
+    df['Nama Wilayah'] = [wilayah[i % len(wilayah)] for i in range(len(df))]
+    return df
+
+
+def test_reingesting_a_period_replaces_its_partitions(tmp_path):
+    store_dir = str(tmp_path / 'store')
+    main.write_period_partitions(_period_frame(1, ['Metro']), '2023', store_dir)
+    main.write_period_partitions(_period_frame(2, ['Metro', 'Mesuji', 'Tanggamus']), '2024', store_dir)
+    
+    replacement = _period_frame(3, ['Metro', 'Way Kanan'])
+    assert main.write_period_partitions(replacement, '2024', store_dir) == 2
+    
+    partitions = main.list_partitions(store_dir)
+    assert [(periode, wilayah) for periode, wilayah, *_ in partitions] == [
+        ('2023', 'Metro'), ('2024', 'Metro'), ('2024', 'Way Kanan')]
+    # Tidak ada direktori staging/lama yang tertinggal
+    assert sorted(os.listdir(store_dir)) == sorted(
+        main._partition_dir_name('periode', periode) for periode in ('2023', '2024'))
+    
+    stored = main.read_partitions(main.prune_partitions(tuple(partitions), periods={'2024'}))
+    assert sorted(stored['NIP'].astype(str)) == sorted(replacement['NIP'].astype(str))
+    assert len(main.read_partitions(main.prune_partitions(tuple(partitions), periods={'2023'}))) == 60
+
+
+def test_level_filter_is_pushed_into_partition_reads(tmp_path):
+    store_dir = str(tmp_path / 'store')
+    df = _period_frame(4, ['Metro', 'Mesuji'])
+    main.write_period_partitions(df, '2024', store_dir)
+    level = df['Level'].iloc[0]
+    stored = main.read_partitions(tuple(main.list_partitions(store_dir)), level=level)
+    assert len(stored) == (df['Level'] == level).sum()
+    assert set(stored['Level'].astype(str)) == {level}
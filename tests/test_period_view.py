@@ -0,0 +1,26 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+import main
+from conftest import competency_csv_bytes
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+
+
+def test_period_view_with_nip_duplicated_within_a_period(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / main.COMPETENCY_CSV_PATH).write_bytes(competency_csv_bytes(40))
+    df = main._read_competency_csv(str(tmp_path / main.COMPETENCY_CSV_PATH))
+    nip = df['NIP'].iloc[0]
+    duplicated = df.copy()
+    duplicated.loc[1, 'NIP'] = nip
+    main.write_period_partitions(duplicated, '2024', main.PARTITION_STORE_DIR)
+    
+    at = AppTest.from_file(MAIN_PATH, default_timeout=120)
+    at.run()
+    at.sidebar.selectbox(key="menu").select("📅 Perbandingan Periode").run()
+    assert not at.exception, at.exception
+    at.text_input(key="periode_nip").input(nip).run()
+    assert not at.exception, at.exception
+    assert len(at.tabs) == 2
@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from synthetic_data import generate_competency_data
+
+
+@pytest.fixture
+def source_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'COLUMNAR_CACHE_DIR', str(tmp_path / 'cache'))
+    path = str(tmp_path / main.COMPETENCY_CSV_PATH)
+    generate_competency_data(600).to_csv(path, index=False)
+    return path
+
+
+def _assert_same_dataset(merged, full):
+    pd.testing.assert_frame_equal(merged['df'].astype(object), full['df'].astype(object))
+    pd.testing.assert_frame_equal(merged['df_processed'].astype(object), full['df_processed'].astype(object))
+    
+    merged_index = main.dataset_part(merged, 'filter_index')
+    full_index = main.dataset_part(full, 'filter_index')
+    assert merged_index['options'] == full_index['options']
+    assert merged_index['positions'].keys() == full_index['positions'].keys()
+    for key, positions in full_index['positions'].items():
+        np.testing.assert_array_equal(np.sort(merged_index['positions'][key]), positions)
+    for col, masks in full_index['kategori_masks'].items():
+        for kategori, mask in masks.items():
+            np.testing.assert_array_equal(merged_index['kategori_masks'][col][kategori], mask)
+    
+    assert main.dataset_part(merged, 'nip_index') == main.dataset_part(full, 'nip_index')
+    np.testing.assert_array_equal(main.dataset_part(merged, 'score_matrix'), main.dataset_part(full, 'score_matrix'))
+    cubes = [main.export_stats_cube(main.dataset_part(dataset, 'stats_cube')).set_index(main.CUBE_DIMENSIONS).sort_index()
+             for dataset in (merged, full)]
+    pd.testing.assert_frame_equal(*cubes, check_exact=False, rtol=1e-9)
+
+
+def test_delta_refresh_matches_full_rebuild(source_csv):
+    store = main.new_source_store()
+    dataset = main.refresh_competency_dataset(store, source_csv)
+    assert store['last_refresh']['mode'] == "penuh"
+    # Bagian yang sudah dibangun harus digabung, bukan dibangun ulang
+    for name in main.DATASET_PART_MERGERS:
+        main.dataset_part(dataset, name)
+    
+    os.utime(source_csv)
+    assert main.refresh_competency_dataset(store, source_csv) is dataset
+    assert store['last_refresh']['mode'] == "tidak berubah"
+    
+    # Baris tambahan dengan wilayah/level baru dan NIP yang sudah ada
+    extra = generate_competency_data(80, seed=7)
+    extra.loc[0, 'Nama Wilayah'] = 'Wilayah Baru'
+    extra.loc[1, 'Level'] = 'Level Baru'
+    extra.loc[2, 'NIP'] = dataset['df']['NIP'].iloc[5]
+    extra.to_csv(source_csv, mode='a', header=False, index=False)
+    merged = main.refresh_competency_dataset(store, source_csv)
+    assert store['last_refresh']['mode'] == "delta"
+    assert store['last_refresh']['rows'] == 80
+    
+    _assert_same_dataset(merged, main.new_dataset(main._read_competency_csv(source_csv)))
+
+
+def test_rewritten_source_triggers_full_rebuild(source_csv):
+    store = main.new_source_store()
+    main.refresh_competency_dataset(store, source_csv)
+    generate_competency_data(50, seed=3).to_csv(source_csv, index=False)
+    assert len(main.refresh_competency_dataset(store, source_csv)['df']) == 50
+    assert store['last_refresh']['mode'] == "penuh"
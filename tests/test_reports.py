@@ -0,0 +1,37 @@
+import io
+import zipfile
+
+import main
+
+
+def test_report_zip_is_self_contained(dataset):
+    output = io.BytesIO()
+    main.export_reports_zip(dataset['df_processed'], output, positions=[0, 1, 2], max_workers=1)
+    
+    with zipfile.ZipFile(io.BytesIO(output.getvalue())) as archive:
+        names = archive.namelist()
+        assert names.count(main.REPORT_PLOTLYJS_NAME) == 1
+        reports = [name for name in names if name.endswith('.html')]
+        assert len(reports) == 3
+        for name in reports:
+            report = archive.read(name).decode('utf-8')
+            assert f'src="{main.REPORT_PLOTLYJS_NAME}"' in report
+            assert 'cdn.plot.ly' not in report
+
+
+def test_report_records_span_chunks_with_unique_names(dataset):
+    df = dataset['df_processed']
+    positions = [0, 1, 2, 0, 3]
+    records = list(main._report_records(df, positions, chunk_size=2))
+    
+    stems = [stem for stem, _ in records]
+    assert len(set(stems)) == len(positions)
+    assert [record['NIP'] for _, record in records] == df['NIP'].take(positions).tolist()
+
+
+def test_read_and_remove_file(tmp_path):
+    path = tmp_path / 'laporan.zip'
+    path.write_bytes(b'isi')
+    
+    assert main.read_and_remove_file(str(path)) == b'isi'
+    assert not path.exists()
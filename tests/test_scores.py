@@ -0,0 +1,74 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import main
+from conftest import competency_csv_bytes
+
+
+def _baseline_kategori(persentase):
+    # Rumus tampilan per NIP pada kode awal
+    return "Optimal" if persentase >= 85 else "Cukup Optimal" if persentase >= 70 else "Kurang Optimal"
+
+
+def test_scores_match_baseline_formula():
+    content = competency_csv_bytes(300, seed=3)
+    raw = pd.read_csv(io.BytesIO(content), dtype={'NIP': str})
+    # Kategori sumber yang berbeda dari hasil ambang batas harus tetap dipakai apa adanya
+    raw.loc[::7, 'cat_M'] = 'Optimal'
+    content = raw.to_csv(index=False).encode('utf-8')
+    df_processed = main.compute_competency_scores(main._read_competency_csv(content))
+    
+    total_teknis = sum(raw[f'T{i}_0'] + raw[f'T{i}_1'] for i in range(1, 7))
+    total_manajerial = sum(raw[f'M{i}_0'] + raw[f'M{i}_1'] for i in range(1, 10))
+    expected_t = [_baseline_kategori(total / (6 * 10) * 100) for total in total_teknis]
+    assert df_processed['cat_T'].astype(str).tolist() == expected_t
+    assert df_processed['cat_M'].astype(str).tolist() == raw['cat_M'].tolist()
+    np.testing.assert_array_equal(df_processed['T_Total'], total_teknis)
+    np.testing.assert_array_equal(df_processed['M_Total'], total_manajerial)
+    np.testing.assert_allclose(df_processed['percent_T'], total_teknis / (6 * 10) * 100, rtol=1e-6)
+    for col in main.KATEGORI_COLUMNS:
+        assert df_processed[col].cat.ordered
+        assert list(df_processed[col].cat.categories[:3]) == main.KATEGORI_LEVELS
+
+
+def test_percent_t_follows_totals_when_source_diverges(competency_df):
+    df = competency_df.head(1).copy()
+    for i in range(1, 7):
+        df[f'T{i}_0'], df[f'T{i}_1'] = np.int8(4), np.int8(3)
+    df['percent_T'] = np.float32(99.0)
+    df_processed = main.compute_competency_scores(df)
+    
+    assert df_processed['T_Total'].iloc[0] == 42
+    assert df_processed['percent_T'].iloc[0] == 70.0
+    assert df_processed['cat_T'].iloc[0] == "Cukup Optimal"
+    table = main.create_competency_table(df_processed.iloc[0].to_dict(), "teknis")
+    _, persentase, _ = main.competency_summary(df_processed.iloc[0].to_dict(), table, "teknis")
+    assert persentase == df_processed['percent_T'].iloc[0]
+
+
+def test_cat_m_computed_only_when_missing(competency_df):
+    df_processed = main.compute_competency_scores(competency_df.drop(columns=['cat_M']))
+    expected = main.compute_kategori(competency_df['percent_Manajerial'].to_numpy())
+    assert df_processed['cat_M'].astype(str).tolist() == expected.tolist()
+
+
+def test_nip_view_teknis_percentage_uses_totals(dataset):
+    data_row = dataset['df_processed'].iloc[0].to_dict()
+    data_row['percent_T'] = 0.0
+    table = main.create_competency_table(data_row, "teknis")
+    total, persentase, kategori = main.competency_summary(data_row, table, "teknis")
+    assert persentase == total / (len(main.TEKNIS_CODES) * main.NILAI_MAKS_TEKNIS) * 100
+    assert kategori == _baseline_kategori(persentase) == data_row['cat_T']
+
+
+def test_out_of_range_scores_are_not_wrapped():
+    raw = pd.read_csv(io.BytesIO(competency_csv_bytes(20, seed=5)), dtype={'NIP': str})
+    assert main._read_competency_csv(raw.to_csv(index=False).encode('utf-8'))['M1_0'].dtype == np.int8
+    
+    raw.loc[0, 'M1_0'] = 200
+    df = main._read_competency_csv(raw.to_csv(index=False).encode('utf-8'))
+    assert df['M1_0'].dtype == np.float32
+    assert df['M1_0'].iloc[0] == 200
+    np.testing.assert_array_equal(df['M1_1'], raw['M1_1'])
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+
+def _shared_frame():
+    df = pd.DataFrame({
+        'skor': np.arange(4, dtype=np.int8),
+        'persen': np.linspace(0, 1, 4, dtype=np.float32),
+        'level': pd.Categorical(['a', 'b', 'a', 'b']),
+        'nip': pd.Series(['1', '2', '3', '4'], dtype='str'),
+        'jawaban': pd.Series(['x', None, 'y', 'z'], dtype=object),
+    })
+    return df.copy(), main.freeze_frame(df)
+
+
+WRITES = {
+    'setitem': lambda df, col: df.__setitem__(col, df[col].iloc[::-1].to_numpy()),
+    'loc': lambda df, col: df.loc.__setitem__((0, col), df[col].iloc[1]),
+    'loc_slice': lambda df, col: df.loc.__setitem__((slice(None), col), df[col].iloc[1]),
+    'loc_axis': lambda df, col: df.loc(axis=1).__setitem__(col, df[col].iloc[1]),
+    'iloc': lambda df, col: df.iloc.__setitem__((0, df.columns.get_loc(col)), df[col].iloc[1]),
+    'at': lambda df, col: df.at.__setitem__((0, col), df[col].iloc[1]),
+    'iat': lambda df, col: df.iat.__setitem__((0, df.columns.get_loc(col)), df[col].iloc[1]),
+    'update': lambda df, col: df.update(df[[col]].iloc[::-1].reset_index(drop=True)),
+    'fillna_inplace': lambda df, col: df.fillna({col: df[col].iloc[1]}, inplace=True),
+    'delitem': lambda df, col: df.__delitem__(col),
+    'pop': lambda df, col: df.pop(col),
+}
+
+
+@pytest.mark.parametrize('col', ['skor', 'persen', 'level', 'nip', 'jawaban'])
+@pytest.mark.parametrize('write', sorted(WRITES))
+def test_writes_to_every_column_type_raise(col, write):
+    original, shared = _shared_frame()
+    with pytest.raises((TypeError, ValueError)):
+        WRITES[write](shared, col)
+    pd.testing.assert_frame_equal(pd.DataFrame(shared), original)
+
+
+def test_axis_assignment_and_insert_raise():
+    original, shared = _shared_frame()
+    with pytest.raises(TypeError):
+        shared.columns = [f'k{i}' for i in range(shared.shape[1])]
+    with pytest.raises(TypeError):
+        shared.index = range(1, len(shared) + 1)
+    with pytest.raises(TypeError):
+        shared.insert(0, 'baru', 1)
+    with pytest.raises(TypeError):
+        shared.rename(columns={'nip': 'NIP'}, inplace=True)
+    pd.testing.assert_frame_equal(pd.DataFrame(shared), original)
+
+
+def test_numeric_buffers_are_read_only():
+    _, shared = _shared_frame()
+    for col in ('skor', 'persen'):
+        with pytest.raises(ValueError):
+            shared[col].to_numpy()[0] = 1
+
+
+def test_categorical_codes_are_shared_read_only_views():
+    original = pd.Categorical(['a', 'b', 'a', 'b'])
+    frozen = main._read_only_array(original)
+    assert np.shares_memory(frozen.codes, original.codes)
+    assert not frozen.codes.flags.writeable
+
+
+def test_copies_and_derived_frames_stay_writable():
+    original, shared = _shared_frame()
+    # Series hasil seleksi dan frame turunan adalah salinan (copy-on-write) yang boleh diubah
+    column = shared['nip']
+    column.iloc[0] = '000'
+    subset = shared[shared['skor'] > 0]
+    subset.loc[subset.index[0], 'nip'] = '999'
+    copy = shared.copy()
+    copy.loc[0, 'nip'] = '111'
+    copy.columns = [f'k{i}' for i in range(copy.shape[1])]
+    assert type(subset) is pd.DataFrame and type(copy) is pd.DataFrame
+    pd.testing.assert_frame_equal(pd.DataFrame(shared), original)
+
+
+def test_reads_through_indexers(dataset):
+    df = dataset['df_processed']
+    assert isinstance(df, main.SharedFrame)
+    row = df.iloc[3]
+    assert df.loc[3, 'NIP'] == df.at[3, 'NIP'] == row['NIP']
+    assert df.iat[3, df.columns.get_loc('M_Total')] == row['M_Total']
+    assert df.loc[df['M_Total'] > 0, ['NIP']].shape[1] == 1
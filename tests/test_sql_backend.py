@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+import main
+from synthetic_data import generate_pemetaan_data
+
+
+@pytest.fixture
+def backends(tmp_path, dataset):
+    df_pemetaan = generate_pemetaan_data(200)
+    path = str(tmp_path / 'asesmen.sqlite')
+    main.build_sql_backend(dataset['df_processed'], df_pemetaan, path)
+    return main.open_sql_backend(path), dataset, df_pemetaan
+
+
+def _selections(filter_index):
+    options = filter_index['options']
+    level, wilayah = options['Level'][1], options['Nama Wilayah'][1]
+    return [
+        (main.FILTER_ALL, main.FILTER_ALL, main.FILTER_ALL, main.FILTER_ALL),
+        (level, main.FILTER_ALL, main.FILTER_ALL, main.FILTER_ALL),
+        (main.FILTER_ALL, wilayah, main.FILTER_ALL, main.FILTER_ALL),
+        (level, wilayah, main.FILTER_ALL, main.FILTER_ALL),
+        (main.FILTER_ALL, main.FILTER_ALL, 'Kurang Optimal', main.FILTER_ALL),
+        (level, main.FILTER_ALL, main.FILTER_ALL, 'Cukup Optimal'),
+    ]
+
+
+def test_sql_filters_match_pandas(backends):
+    backend, dataset, _ = backends
+    filter_index = main.dataset_part(dataset, 'filter_index')
+    assert main.sql_filter_options(backend) == filter_index['options']
+    
+    df_processed = dataset['df_processed']
+    for selection in _selections(filter_index):
+        positions = main.filter_positions(filter_index, *selection)
+        assert main.sql_count(backend, *selection) == len(positions), selection
+        rows = main.sql_select_rows(backend, *selection)
+        assert rows['NIP'].tolist() == df_processed['NIP'].take(positions).tolist(), selection
+
+
+def test_sql_table_page_matches_sorted_positions(backends):
+    backend, dataset, _ = backends
+    filter_index = main.dataset_part(dataset, 'filter_index')
+    df_processed = dataset['df_processed']
+    selection = _selections(filter_index)[1]
+    positions = main.filter_positions(filter_index, *selection)
+    for column, ascending in (('M_Total', False), ('cat_T', True), ('Nama Pegawai', True)):
+        order = main.sort_positions({}, df_processed, positions, column, ascending)
+        page = main.sql_table_page(backend, selection, ['NIP', column], column, ascending, limit=25, offset=10)
+        assert page['NIP'].tolist() == df_processed['NIP'].take(order[10:35]).tolist(), column
+
+
+def test_sql_stats_cube_matches_pandas(backends):
+    backend, dataset, _ = backends
+    cubes = [main.export_stats_cube(cube).set_index(main.CUBE_DIMENSIONS).sort_index()
+             for cube in (main.sql_stats_cube(backend), main.dataset_part(dataset, 'stats_cube'))]
+    pd.testing.assert_frame_equal(*cubes, check_exact=False, rtol=1e-9, check_dtype=False)
+
+
+def test_sql_lookups_match_pandas(backends):
+    backend, dataset, df_pemetaan = backends
+    df_processed = dataset['df_processed']
+    nip = df_processed['NIP'].iloc[7]
+    matched, rows = main.sql_lookup_nip(backend, f" {nip} ")
+    assert matched == nip and rows['NIP'].tolist() == [nip]
+    matched, _ = main.sql_lookup_nip(backend, nip[:12])
+    assert matched == min(candidate for candidate in df_processed['NIP'] if candidate.startswith(nip[:12]))
+    assert main.sql_lookup_nip(backend, 'tidak-ada')[0] is None
+    
+    data_row = df_processed.iloc[7].to_dict()
+    expected = main.peer_percentiles(main.dataset_part(dataset, 'peer_index'), data_row)
+    actual = main.sql_peer_percentiles(backend, data_row)
+    assert actual.keys() == expected.keys()
+    for group_col in expected:
+        assert actual[group_col]['size'] == expected[group_col]['size']
+        pd.testing.assert_series_equal(pd.Series(actual[group_col]['percentiles']),
+                                       pd.Series(expected[group_col]['percentiles']))
+    
+    column = 'Q01_JALUR PENGEMBANGAN KARIR'
+    counts = main.sql_value_counts(backend, column)
+    assert counts.to_dict() == df_pemetaan[column].value_counts().to_dict()
@@ -0,0 +1,22 @@
+import pandas as pd
+
+import main
+from synthetic_data import synthetic_answers
+
+
+def _per_row(texts):
+    stopword_tokens = main.get_stopword_tokens()
+    return texts.map(lambda text: main.clean_text_for_wordcloud(text, stopword_tokens))
+
+
+def test_clean_text_series_matches_per_row_cleaner():
+    answers = synthetic_answers(2_000, distinct=300)
+    assert main.clean_text_series(answers).equals(_per_row(answers))
+
+
+def test_clean_text_series_edge_cases():
+    # Spasi non-ASCII, angka, tanda baca, huruf non-ASCII dan nilai kosong
+    texts = pd.Series(['A\xa0b-c  DAN x', None, '', 'Yang 12 34', 'a\x1cb\x85c', 3.5,
+                       'Ünïcode ßtraße　kota', float('nan'), '  untuk  '])
+    assert main.clean_text_series(texts).tolist() == _per_row(texts).tolist()
+    assert main.clean_text_series(pd.Series([], dtype=object)).empty